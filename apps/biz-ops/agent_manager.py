@@ -31,6 +31,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
+from memory.segmented_log import SegmentedLog
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -56,8 +58,7 @@ def log_dispatch(agent: str, action: str, payload: dict) -> None:
         "payload": payload,
         "source": "biz-ops/agent_manager.py",
     }
-    with open(DISPATCH_LOG, "a", encoding="utf-8") as f:
-        f.write(json.dumps(entry) + "\n")
+    SegmentedLog(DISPATCH_LOG).append(entry)
     logger.info(f"Dispatched: {agent}::{action}")
 
 
@@ -217,22 +218,27 @@ def run_vault(action: str = "rehydrate", payload: Optional[dict] = None) -> dict
     }
 
     if action == "rehydrate":
-        # Read recent dispatch log entries for context
-        context = []
-        if DISPATCH_LOG.exists():
-            with open(DISPATCH_LOG, encoding="utf-8") as f:
-                lines = f.readlines()
-                for line in lines[-20:]:  # Last 20 entries
-                    try:
-                        context.append(json.loads(line.strip()))
-                    except json.JSONDecodeError:
-                        pass
-        memory_state["recent_dispatches"] = context
+        # Recent dispatch log entries for context (only the tail is read)
+        memory_state["recent_dispatches"] = SegmentedLog(DISPATCH_LOG).tail(
+            int(payload.get("limit", 20)),
+            since=payload.get("since"),
+            until=payload.get("until"),
+            keys=payload.get("agents"),
+            key_field="agent",
+        )
 
     elif action == "archive":
-        archive_dir = DATA_DIR / "dispatch-log" / "archive"
-        archive_dir.mkdir(parents=True, exist_ok=True)
-        memory_state["archive_dir"] = str(archive_dir)
+        # Seal the active segment of the dispatch log and every Vault namespace
+        archived = {}
+        for path in [DISPATCH_LOG, *sorted((DATA_DIR / "memory").glob("*/index.jsonl"))]:
+            log = SegmentedLog(path)
+            sealed = log.roll()
+            archived[str(path.relative_to(REPO_ROOT))] = {
+                "sealed_segment": sealed.id if sealed else None,
+                **log.stats(),
+            }
+        memory_state["archive_dir"] = str(DATA_DIR / "dispatch-log" / "archive")
+        memory_state["archived"] = archived
 
     return {"status": "success", **memory_state}
 
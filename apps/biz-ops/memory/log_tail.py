@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+JSONL TAIL READER
+=================
+Helpers that read the newest entries of an append-only JSONL log without
+reading the rest of it (SegmentedLog uses them for its active file).
+
+The file is memory-mapped and scanned backwards one newline at a time, so
+returning the last k entries costs O(k) lines no matter how large the log
+has grown. Optional filters keep only entries inside a time range or with
+given keys; because logs are appended in time order, `until` is located by
+binary search and the scan stops at the first entry older than `since`.
+"""
+
+import json
+import mmap
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, Optional, Union
+
+TimeBound = Union[datetime, str, None]
+
+
+def parse_timestamp(value: TimeBound) -> Optional[datetime]:
+    """
+    Timestamp as an aware UTC datetime. Accepts datetimes, ISO 8601
+    strings and the "YYYY-MM-DD HH:MM:SS UTC" form used by the dispatch
+    log; None when missing or unparseable.
+    """
+    if value is None or isinstance(value, datetime):
+        parsed = value
+    else:
+        text = str(value).strip()
+        if text.endswith(" UTC"):
+            text = text[:-4] + "+00:00"
+        try:
+            parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed is not None and parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def reverse_lines(mm: mmap.mmap, end: Optional[int] = None) -> Iterator[bytes]:
+    """Non-empty lines before byte `end` (default: the whole map), last line first"""
+    end = len(mm) if end is None else end
+    while end > 0:
+        start = mm.rfind(b"\n", 0, end) + 1  # 0 when no newline is left
+        line = mm[start:end].strip()
+        if line:
+            yield line
+        end = start - 1
+
+
+def first_after(mm: mmap.mmap, until: datetime, time_field: str) -> int:
+    """
+    Byte offset of the first line stamped after `until`, by binary search
+    over line starts. Stops narrowing at a line it can't date; the caller
+    still checks every entry it reads.
+    """
+    lo, hi = 0, len(mm)
+    while lo < hi:
+        start = mm.rfind(b"\n", 0, (lo + hi) // 2) + 1
+        if start < lo:
+            start = lo
+        end = mm.find(b"\n", start)
+        end = len(mm) if end < 0 else end
+        try:
+            stamp = parse_timestamp(json.loads(mm[start:end]).get(time_field))
+        except (json.JSONDecodeError, AttributeError):
+            stamp = None
+        if stamp is None:
+            break
+        if stamp > until:
+            hi = start
+        else:
+            lo = end + 1
+    return hi
+
+
+def newest_entries(
+    lines: Iterable[bytes],
+    limit: int,
+    since: TimeBound = None,
+    until: TimeBound = None,
+    keys: Optional[Iterable[str]] = None,
+    key_field: str = "key",
+    time_field: str = "timestamp",
+) -> list[dict]:
+    """
+    Up to `limit` matching entries from raw JSON lines given newest first;
+    returned oldest first. Stops reading at the first entry older than `since`.
+    """
+    since, until = parse_timestamp(since), parse_timestamp(until)
+    wanted = set(keys) if keys is not None else None
+    entries: list[dict] = []
+    if limit <= 0:
+        return entries
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if not isinstance(entry, dict):
+            continue
+        if since or until:
+            stamp = parse_timestamp(entry.get(time_field))
+            if stamp is None:
+                continue
+            if since and stamp < since:
+                break  # Everything further back is older still
+            if until and stamp > until:
+                continue
+        if wanted is not None and entry.get(key_field) not in wanted:
+            continue
+        entries.append(entry)
+        if len(entries) == limit:
+            break
+
+    entries.reverse()
+    return entries
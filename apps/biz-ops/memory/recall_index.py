@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""
+VAULT RECALL INDEX
+==================
+Inverted index over a Vault namespace's append-only index.jsonl.
+
+The log stays the source of truth and is never modified: this index is
+derived from it, lives in a sidecar directory (recall-index/) and can be
+rebuilt from the log at any time.
+
+- Entries are numbered in log order; each one keeps its position in the
+  segmented log (segment id and byte offset, packed into one integer)
+  and its token count. Positions survive the active segment being sealed.
+- Each token maps to a posting list of (entry number, term frequency),
+  split into blocks of 128. Two bounds cap the score of any entry in a
+  block: its highest term frequency paired with its shortest entry, and
+  its highest BM25 term weight as computed when the entries were added
+  (a weight can only grow by the factor the average entry length grew
+  since). The first is exact for uniform blocks, the second for skewed
+  ones; the smaller one is used.
+- Queries are ranked with BM25 and the top-k kept in a heap. Large posting
+  lists are read block by block, best bound first, and scoring stops once
+  the k-th best score beats everything the remaining blocks could add.
+- The index remembers the log position it has read up to; new log lines
+  are indexed on the next query, and a snapshot is written every
+  SNAPSHOT_INTERVAL new entries so a fresh process only reads the tail.
+"""
+
+import bisect
+import hashlib
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Iterator, Optional, Union
+
+from memory.segmented_log import SegmentedLog
+
+logger = logging.getLogger("VaultRecall")
+
+TOKEN = re.compile(r"[a-z0-9]+")
+
+BLOCK = 128             # Postings per block
+SUPERBLOCK = 64         # Blocks per coarse bound when a list is first opened
+EXHAUSTIVE_LIMIT = 4096  # Score short posting lists outright
+SNAPSHOT_INTERVAL = 1000
+HEAD_BYTES = 4096       # Active segment prefix fingerprint: detects a replaced log
+OFFSET_BITS = 40        # Position = segment id << OFFSET_BITS | byte offset
+MAX_TF = 0xFFFF
+FLOAT32_SLACK = 1 + 1e-6  # Stored weights are rounded to float32
+
+K1 = 1.2
+B = 0.75
+
+
+def impact(tf: int, length: int, avgdl: float) -> float:
+    """BM25 term weight without idf"""
+    return tf * (K1 + 1) / (tf + K1 * (1 - B) + K1 * B * length / avgdl)
+
+
+def pack(segment_id: int, offset: int) -> int:
+    return segment_id << OFFSET_BITS | offset
+
+
+def unpack(position: int) -> tuple[int, int]:
+    return position >> OFFSET_BITS, position & ((1 << OFFSET_BITS) - 1)
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN.findall(text.lower())
+
+
+def entry_tokens(entry: dict) -> list[str]:
+    """Searchable tokens of a memory entry: its key, tags and value (keys and leaves)"""
+    parts: list[str] = [str(entry.get("key", ""))]
+    parts.extend(str(tag) for tag in entry.get("tags") or [])
+    stack = [entry.get("value")]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            parts.extend(str(key) for key in item)
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+        elif item is not None:
+            parts.append(str(item))
+    return tokenize(" ".join(parts))
+
+
+class _Postings:
+    """Posting list of one token, with per-block score bounds"""
+
+    __slots__ = ("docs", "tfs", "block_tf", "block_dl", "block_impact", "block_avgdl")
+
+    def __init__(self, docs=None, tfs=None, block_tf=None, block_dl=None, block_impact=None, block_avgdl=None):
+        self.docs = docs if docs is not None else array("I")
+        self.tfs = tfs if tfs is not None else array("H")
+        self.block_tf = block_tf if block_tf is not None else array("H")
+        self.block_dl = block_dl if block_dl is not None else array("I")
+        self.block_impact = block_impact if block_impact is not None else array("f")
+        self.block_avgdl = block_avgdl if block_avgdl is not None else array("f")
+
+    def add(self, doc: int, tf: int, length: int, avgdl: float):
+        weight = impact(tf, length, avgdl)
+        if len(self.docs) % BLOCK == 0:
+            self.block_tf.append(tf)
+            self.block_dl.append(length)
+            self.block_impact.append(weight)
+            self.block_avgdl.append(avgdl)
+        else:
+            if tf > self.block_tf[-1]:
+                self.block_tf[-1] = tf
+            if length < self.block_dl[-1]:
+                self.block_dl[-1] = length
+            if weight > self.block_impact[-1]:
+                self.block_impact[-1] = weight
+            if avgdl < self.block_avgdl[-1]:
+                self.block_avgdl[-1] = avgdl
+        self.docs.append(doc)
+        self.tfs.append(tf)
+
+    def tf(self, doc: int) -> int:
+        """Term frequency of `doc` in this list (0 when absent)"""
+        i = bisect.bisect_left(self.docs, doc)
+        return self.tfs[i] if i < len(self.docs) and self.docs[i] == doc else 0
+
+
+class RecallIndex:
+    """
+    BM25 index over one append-only, segmented JSONL log.
+
+    Usage:
+        index = RecallIndex(SegmentedLog(store_dir / "index.jsonl"))
+        for score, position in index.search("lake nona", 10):
+            ...
+    """
+
+    VERSION = 2
+    COLUMNS = (("positions", "Q"), ("lengths", "I"), ("docs", "I"), ("tfs", "H"),
+               ("block_tf", "H"), ("block_dl", "I"), ("block_impact", "f"), ("block_avgdl", "f"))
+
+    def __init__(self, log: Union[SegmentedLog, Path], snapshot_dir: Optional[Path] = None):
+        self.log = log if isinstance(log, SegmentedLog) else SegmentedLog(log)
+        self.snapshot_dir = Path(snapshot_dir) if snapshot_dir else self.log.path.parent / "recall-index"
+        self.positions = array("Q")  # Entry number -> packed log position
+        self.lengths = array("I")    # Entry number -> token count
+        self.postings: dict[str, _Postings] = {}
+        self.total_length = 0
+        self.segment = 0             # Segment being read and bytes of it covered
+        self.indexed_bytes = 0       # (always ends on a line boundary)
+        self.head = ""               # Hash of the first head_bytes of the active segment
+        self.head_bytes = 0
+        self._unsaved = 0
+        self._generation = 0
+        self._load_snapshot()
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    # ─── Maintenance ─────────────────────────────────────────────────────────
+
+    def add(self, position: int, entry: dict):
+        """Index one log entry found at a packed `position`"""
+        doc = len(self.positions)
+        tokens = entry_tokens(entry)
+        counts: dict[str, int] = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        length = len(tokens)
+        self.positions.append(position)
+        self.lengths.append(length)
+        self.total_length += length
+        avgdl = self.total_length / len(self.positions) or 1.0
+        for token, tf in counts.items():
+            postings = self.postings.get(token)
+            if postings is None:
+                postings = self.postings[token] = _Postings()
+            postings.add(doc, min(tf, MAX_TF), length, avgdl)
+        self._unsaved += 1
+
+    def refresh(self) -> int:
+        """Index log lines appended since the last call; returns how many entries were added"""
+        if self.log.sealing():
+            return 0  # The active segment is being sealed; index it once that's done
+        if not self._matches_log():
+            logger.warning(f"{self.log.path} no longer matches its recall index; rebuilding")
+            self._reset()
+
+        added = 0
+        for segment_id, offset, line in self.log.lines_from(self.segment, self.indexed_bytes):
+            if segment_id != self.segment:
+                self.segment, self.head, self.head_bytes = segment_id, "", 0
+            stripped = line.strip()
+            if stripped:
+                try:
+                    entry = json.loads(stripped)
+                except json.JSONDecodeError:
+                    entry = None
+                if isinstance(entry, dict):
+                    self.add(pack(segment_id, offset), entry)
+                    added += 1
+            self.indexed_bytes = offset + len(line)
+
+        # Step past a sealed segment once it has been read to the end
+        sealed = self._sealed(self.segment)
+        if sealed is not None and self.indexed_bytes >= sealed.raw_bytes:
+            self.segment, self.indexed_bytes, self.head, self.head_bytes = sealed.id + 1, 0, "", 0
+        if self.segment == self.log.active_id and self.head_bytes < HEAD_BYTES:
+            self.head_bytes = min(HEAD_BYTES, self.indexed_bytes)
+            self.head = self._log_head(self.head_bytes)
+
+        if self._unsaved >= SNAPSHOT_INTERVAL:
+            self.save()
+        return added
+
+    def _matches_log(self) -> bool:
+        """Whether the log still holds what was indexed up to the watermark"""
+        if self.segment == 0 and self.indexed_bytes == 0:
+            return True
+        active_id = self.log.active_id
+        if self.segment > active_id:
+            return False
+        if self.segment < active_id:
+            sealed = self._sealed(self.segment)
+            return sealed is not None and sealed.raw_bytes >= self.indexed_bytes
+        try:
+            size = self.log.path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        return size >= self.indexed_bytes and self._log_head(self.head_bytes) == self.head
+
+    def _sealed(self, segment_id: int):
+        return next((segment for segment in self.log.segments if segment.id == segment_id), None)
+
+    def _reset(self):
+        self.positions, self.lengths = array("Q"), array("I")
+        self.postings = {}
+        self.total_length = self.segment = self.indexed_bytes = self.head_bytes = 0
+        self.head = ""
+
+    def _log_head(self, size: int) -> str:
+        try:
+            with open(self.log.path, "rb") as f:
+                return hashlib.sha256(f.read(size)).hexdigest()
+        except FileNotFoundError:
+            return ""
+
+    # ─── Snapshot ────────────────────────────────────────────────────────────
+
+    def save(self):
+        """Write a snapshot; arrays first, then meta.json pointing at them"""
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        generation = self._generation + 1
+        tokens = sorted(self.postings)
+        columns = {name: array(typecode) for name, typecode in self.COLUMNS[2:]}
+        for token in tokens:
+            postings = self.postings[token]
+            for name, column in columns.items():
+                column.extend(getattr(postings, name))
+        columns["positions"], columns["lengths"] = self.positions, self.lengths
+
+        for name, column in columns.items():
+            with open(self.snapshot_dir / f"{name}.{generation}", "wb") as f:
+                column.tofile(f)
+        meta = {
+            "version": self.VERSION,
+            "generation": generation,
+            "byteorder": sys.byteorder,
+            "segment": self.segment,
+            "indexed_bytes": self.indexed_bytes,
+            "head": self.head,
+            "head_bytes": self.head_bytes,
+            "total_length": self.total_length,
+            "terms": [[token, len(self.postings[token].docs)] for token in tokens],
+        }
+        tmp = self.snapshot_dir / "meta.json.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f, separators=(",", ":"))
+        os.replace(tmp, self.snapshot_dir / "meta.json")
+
+        for path in self.snapshot_dir.iterdir():
+            suffix = path.suffix.lstrip(".")
+            if path.stem in dict(self.COLUMNS) and suffix.isdigit() and int(suffix) != generation:
+                path.unlink(missing_ok=True)
+        self._generation = generation
+        self._unsaved = 0
+
+    def _load_snapshot(self):
+        try:
+            with open(self.snapshot_dir / "meta.json", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("version") != self.VERSION or meta.get("byteorder") != sys.byteorder:
+                return
+            generation = meta["generation"]
+            columns = {}
+            for name, typecode in self.COLUMNS:
+                column = array(typecode)
+                path = self.snapshot_dir / f"{name}.{generation}"
+                with open(path, "rb") as f:
+                    column.frombytes(f.read())
+                columns[name] = column
+        except (FileNotFoundError, ValueError, KeyError) as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.warning(f"Ignoring unreadable recall snapshot in {self.snapshot_dir}: {e}")
+            return
+
+        postings, start, block_start = {}, 0, 0
+        for token, count in meta["terms"]:
+            blocks = -(-count // BLOCK)
+            postings[token] = _Postings(
+                columns["docs"][start:start + count], columns["tfs"][start:start + count],
+                *(columns[name][block_start:block_start + blocks]
+                  for name in ("block_tf", "block_dl", "block_impact", "block_avgdl"))
+            )
+            start += count
+            block_start += blocks
+        self.positions, self.lengths, self.postings = columns["positions"], columns["lengths"], postings
+        self.total_length = meta["total_length"]
+        self.segment, self.indexed_bytes = meta["segment"], meta["indexed_bytes"]
+        self.head, self.head_bytes = meta["head"], meta["head_bytes"]
+        self._generation = generation
+
+    # ─── Search ──────────────────────────────────────────────────────────────
+
+    def search(self, query: str, limit: int = 10) -> list[tuple[float, int]]:
+        """(score, log position) of the best `limit` entries, best first; ties favour newer entries"""
+        self.refresh()
+        count = len(self.positions)
+        terms = [token for token in dict.fromkeys(tokenize(query)) if token in self.postings]
+        if not terms or limit <= 0:
+            return []
+
+        avgdl = self.total_length / count or 1.0
+        lists = [self.postings[token] for token in terms]
+        idfs = [math.log(1 + (count - len(p.docs) + 0.5) / (len(p.docs) + 0.5)) for p in lists]
+        norm = K1 * (1 - B)
+        per_length = K1 * B / avgdl
+        lengths = self.lengths
+
+        def term_score(i: int, tf: int, dl: int) -> float:
+            return idfs[i] * tf * (K1 + 1) / (tf + norm + per_length * dl)
+
+        def block_bound(i: int, postings: _Postings, start: int, end: int) -> float:
+            by_shape = term_score(i, max(postings.block_tf[start:end]), min(postings.block_dl[start:end]))
+            by_weight = (idfs[i] * max(postings.block_impact[start:end]) * FLOAT32_SLACK
+                         * max(1.0, avgdl / min(postings.block_avgdl[start:end])))
+            return min(by_shape, by_weight)
+
+        top: list[tuple[float, int]] = []
+
+        def offer(score: float, doc: int):
+            if len(top) < limit:
+                heapq.heappush(top, (score, doc))
+            elif (score, doc) > top[0]:
+                heapq.heapreplace(top, (score, doc))
+
+        if sum(len(p.docs) for p in lists) <= EXHAUSTIVE_LIMIT:
+            scores: dict[int, float] = {}
+            for i, postings in enumerate(lists):
+                for doc, tf in zip(postings.docs, postings.tfs):
+                    scores[doc] = scores.get(doc, 0.0) + term_score(i, tf, lengths[doc])
+            for doc, score in scores.items():
+                offer(score, doc)
+        else:
+            self._search_blocks(lists, term_score, block_bound, offer, top, limit)
+
+        ranked = sorted(top, reverse=True)
+        return [(score, self.positions[doc]) for score, doc in ranked]
+
+    def _search_blocks(self, lists, term_score, block_bound, offer, top, limit):
+        """
+        Threshold search over block bounds: visit blocks best bound first,
+        score each new entry fully (other terms by binary search), and stop
+        once the k-th score reaches the sum of the terms' remaining bounds.
+        """
+        # Per term, a max-heap of (-bound, -first block, blocks in unit)
+        frontier: list[list[tuple[float, int, int]]] = []
+        for i, postings in enumerate(lists):
+            units = []
+            for start in range(0, len(postings.block_tf), SUPERBLOCK):
+                end = min(start + SUPERBLOCK, len(postings.block_tf))
+                bound = block_bound(i, postings, start, end)
+                units.append((-bound, -start, end - start))
+            heapq.heapify(units)
+            frontier.append(units)
+
+        lengths = self.lengths
+        seen: set[int] = set()
+        while True:
+            remaining = [-units[0][0] if units else 0.0 for units in frontier]
+            if len(top) == limit and top[0][0] >= sum(remaining):
+                return
+            i = max(range(len(lists)), key=remaining.__getitem__)
+            if not frontier[i]:
+                return
+            _, start, size = heapq.heappop(frontier[i])
+            start, postings = -start, lists[i]
+            if size > 1:
+                # Open a coarse unit into its blocks
+                for block in range(start, start + size):
+                    bound = block_bound(i, postings, block, block + 1)
+                    heapq.heappush(frontier[i], (-bound, -block, 1))
+                continue
+
+            lo = start * BLOCK
+            for doc, tf in zip(postings.docs[lo:lo + BLOCK], postings.tfs[lo:lo + BLOCK]):
+                if doc in seen:
+                    continue
+                seen.add(doc)
+                score = 0.0
+                for j, other in enumerate(lists):
+                    other_tf = tf if j == i else other.tf(doc)
+                    if other_tf:
+                        score += term_score(j, other_tf, lengths[doc])
+                offer(score, doc)
+
+    def recent(self, limit: int) -> list[int]:
+        """Log positions of the newest `limit` entries, newest first"""
+        self.refresh()
+        return list(reversed(self.positions[-limit:])) if limit > 0 else []
+
+    def read(self, positions: list[int]) -> Iterator[dict[str, Any]]:
+        """Entries at the given log positions, in the given order"""
+        yield from self.log.read_at(unpack(position) for position in positions)
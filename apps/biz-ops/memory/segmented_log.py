@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+SEGMENTED LOG
+=============
+Rotating, compressed storage for append-only JSONL logs (Vault namespaces
+and the dispatch log).
+
+Writers keep appending to the log's usual path (e.g. commands.jsonl), the
+active segment. Once it outgrows a size or age limit it is sealed:
+
+    archive/00000007.jsonl            active segment renamed aside (transient)
+    archive/00000007.jsonl.gz         sealed: the same bytes, compressed
+    archive/manifest.json             every sealed segment and its index
+
+A sealed segment is written as independent compressed frames of about
+FRAME_BYTES each, and the manifest keeps a sparse index per segment: for
+every frame its offset in the raw and compressed bytes and its first
+timestamp, plus the segment's time range, entry count and SHA-256 of the
+raw bytes. Range scans and tails decompress only the frames they need.
+
+Sealing never edits an entry: the compressed segment decompresses to
+exactly the bytes that were appended, so the audit trail stays intact.
+A position in the log is (segment id, byte offset in the raw segment); it
+stays valid when the active segment is sealed.
+
+Segments are compressed with gzip (standard library). Pass codec="zstd"
+to compress with zstd instead, which needs the optional `zstandard`
+package for writing and reading; each sealed file records its format in
+its suffix, so a log can hold segments of both kinds.
+
+Appends take a shared lock and rollovers an exclusive one, so an entry is
+never written to an active file that is being renamed aside. Without
+fcntl (Windows) writers are not guarded against concurrent processes.
+"""
+
+import bisect
+import gzip
+import hashlib
+import json
+import logging
+import mmap
+import os
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from memory.log_tail import TimeBound, first_after, newest_entries, parse_timestamp, reverse_lines
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:  # Windows: appends and rollovers are not guarded against concurrent processes
+    HAS_FCNTL = False
+
+logger = logging.getLogger("SegmentedLog")
+
+FRAME_BYTES = 64 * 1024
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+DEFAULT_MAX_AGE = timedelta(days=7)
+CODECS = {"gzip": ".gz", "zstd": ".zst"}
+
+
+def _compress(data: bytes, suffix: str) -> bytes:
+    if suffix == ".zst":
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _decompress(data: bytes, suffix: str) -> bytes:
+    if suffix == ".zst":
+        if not HAS_ZSTD:
+            raise RuntimeError("Reading .zst log segments requires the zstandard package")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+@dataclass
+class Frame:
+    raw_offset: int
+    offset: int        # In the compressed file
+    length: int        # Compressed bytes
+    first_ts: Optional[str]
+
+
+@dataclass
+class Segment:
+    """Manifest entry of a sealed segment"""
+    id: int
+    file: str
+    entries: int
+    raw_bytes: int
+    bytes: int
+    sha256: str
+    first_ts: Optional[str]
+    last_ts: Optional[str]
+    frames: list[Frame] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Segment":
+        frames = [Frame(*frame) for frame in data.pop("frames", [])]
+        return cls(**data, frames=frames)
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["frames"] = [[f.raw_offset, f.offset, f.length, f.first_ts] for f in self.frames]
+        return data
+
+
+class SegmentedLog:
+    """
+    Append-only JSONL log split into an active file and sealed segments.
+
+    Usage:
+        log = SegmentedLog(DATA_DIR / "dispatch-log" / "commands.jsonl")
+        log.append({"timestamp": ..., "agent": "vault", "action": "rehydrate"})
+        recent = log.tail(20, keys=["hunter"], key_field="agent")
+        january = list(log.scan(since="2026-01-01", until="2026-01-31T23:59:59Z"))
+        log.roll()  # Seal the active segment now
+
+    Raises:
+        ValueError: Unknown codec, or "zstd" without the zstandard package
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age: timedelta = DEFAULT_MAX_AGE,
+        time_field: str = "timestamp",
+        codec: str = "gzip",
+    ) -> None:
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec {codec!r}; expected one of {sorted(CODECS)}")
+        if codec == "zstd" and not HAS_ZSTD:
+            raise ValueError("codec='zstd' requires the zstandard package")
+        self.path = Path(path)
+        self.archive_dir = self.path.parent / "archive"
+        self.manifest_path = self.archive_dir / "manifest.json"
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.time_field = time_field
+        self.codec = codec
+        self._manifest_mtime: Optional[int] = None
+        self.segments: list[Segment] = []
+        self.next_id = 0
+        self._load_manifest()
+
+    # ─── Manifest ────────────────────────────────────────────────────────────
+
+    def _load_manifest(self) -> None:
+        """(Re)load the manifest when another process changed it"""
+        try:
+            mtime = self.manifest_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self._manifest_mtime:
+            return
+        with open(self.manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        self.segments = [Segment.from_dict(segment) for segment in manifest.get("segments", [])]
+        self.next_id = manifest.get("next_id", len(self.segments))
+        self._manifest_mtime = mtime
+
+    def _save_manifest(self) -> None:
+        """Write atomically, one segment per line so commits diff cleanly"""
+        tmp = self.manifest_path.with_suffix(".tmp")
+        entries = ",".join(f"\n  {json.dumps(segment.to_dict())}" for segment in self.segments)
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(f'{{"next_id": {self.next_id},\n "segments": [{entries}\n ]\n}}\n')
+        os.replace(tmp, self.manifest_path)
+        self._manifest_mtime = self.manifest_path.stat().st_mtime_ns
+
+    @property
+    def active_id(self) -> int:
+        """Segment id the active file will be sealed as"""
+        self._load_manifest()
+        return self.next_id
+
+    def sealing(self) -> bool:
+        """True while a rollover is in progress (the active file is not yet numbered)"""
+        return self.archive_dir.exists() and any(self.archive_dir.glob("*.jsonl"))
+
+    # ─── Writing ─────────────────────────────────────────────────────────────
+
+    def append(self, entry: dict) -> None:
+        """Append one entry, sealing the active segment first when it is due"""
+        if self._due():
+            self.roll(force=False)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        line = json.dumps(entry) + "\n"
+        # Shared: appends run concurrently, but never while roll() renames the file
+        with self._lock(exclusive=False), open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+    def _due(self) -> bool:
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            return False
+        if size >= self.max_bytes:
+            return True
+        if size == 0 or self.max_age is None:
+            return False
+        try:
+            with open(self.path, "rb") as f:
+                first = f.readline()
+        except FileNotFoundError:
+            return False  # Rolled by another writer since the stat
+        try:
+            started = parse_timestamp(json.loads(first).get(self.time_field))
+        except (json.JSONDecodeError, AttributeError):
+            return False
+        return started is not None and datetime.now(timezone.utc) - started >= self.max_age
+
+    @contextmanager
+    def _lock(self, exclusive: bool = True):
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.archive_dir / ".lock", "a") as lock:
+            if HAS_FCNTL:
+                fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                if HAS_FCNTL:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def roll(self, force: bool = True) -> Optional[Segment]:
+        """
+        Seal the active segment (if it has entries); returns its manifest
+        entry. With force=False only when it's still due once the lock is
+        held, since another process may have just rolled it.
+        """
+        with self._lock():
+            self._load_manifest()
+            self._recover()
+            if not force and not self._due():
+                return None
+            try:
+                if self.path.stat().st_size == 0:
+                    return None
+            except FileNotFoundError:
+                return None
+            pending = self.archive_dir / f"{self.next_id:08d}.jsonl"
+            os.replace(self.path, pending)
+            return self._seal(pending)
+
+    def _recover(self) -> None:
+        """Finish rollovers interrupted after the active file was renamed aside"""
+        sealed = {segment.id for segment in self.segments}
+        for pending in sorted(self.archive_dir.glob("*.jsonl")):
+            if int(pending.stem) in sealed:
+                pending.unlink()  # Interrupted after the manifest was written
+            else:
+                self._seal(pending)
+
+    def _seal(self, pending: Path) -> Segment:
+        segment_id = int(pending.stem)
+        raw = pending.read_bytes()
+        if raw and not raw.endswith(b"\n"):
+            raw += b"\n"  # A writer died mid-line; keep what it wrote
+        suffix = CODECS[self.codec]
+        sealed = self.archive_dir / f"{segment_id:08d}.jsonl{suffix}"
+
+        frames: list[Frame] = []
+        entries, first_ts, last_ts = 0, None, None
+        with open(sealed.with_suffix(suffix + ".tmp"), "wb") as out:
+            start = 0
+            while start < len(raw):
+                end = raw.find(b"\n", min(start + FRAME_BYTES, len(raw)) - 1) + 1 or len(raw)
+                chunk = raw[start:end]
+                data = _compress(chunk, suffix)
+                lines = [line for line in chunk.split(b"\n") if line.strip()]
+                frame_first = self._stamp(lines[0]) if lines else None
+                frames.append(Frame(start, out.tell(), len(data), frame_first))
+                out.write(data)
+                entries += len(lines)
+                first_ts = first_ts or frame_first
+                last_ts = self._stamp(lines[-1]) if lines else last_ts
+                start = end
+        os.replace(sealed.with_suffix(suffix + ".tmp"), sealed)
+
+        segment = Segment(
+            id=segment_id,
+            file=sealed.name,
+            entries=entries,
+            raw_bytes=len(raw),
+            bytes=sealed.stat().st_size,
+            sha256=hashlib.sha256(raw).hexdigest(),
+            first_ts=first_ts,
+            last_ts=last_ts,
+            frames=frames,
+        )
+        self.segments.append(segment)
+        self.segments.sort(key=lambda s: s.id)
+        self.next_id = max(self.next_id, segment_id + 1)
+        self._save_manifest()
+        pending.unlink()
+        logger.info(f"Sealed {self.path.name} segment {segment_id}: {entries} entries, "
+                    f"{len(raw)} -> {segment.bytes} bytes")
+        return segment
+
+    def _stamp(self, line: bytes) -> Optional[str]:
+        try:
+            stamp = parse_timestamp(json.loads(line).get(self.time_field))
+        except (json.JSONDecodeError, AttributeError):
+            return None
+        return stamp.isoformat() if stamp else None
+
+    # ─── Reading ─────────────────────────────────────────────────────────────
+
+    def _frame_bytes(self, segment: Segment, number: int) -> bytes:
+        frame = segment.frames[number]
+        with open(self.archive_dir / segment.file, "rb") as f:
+            f.seek(frame.offset)
+            return _decompress(f.read(frame.length), Path(segment.file).suffix)
+
+    def lines_from(self, segment_id: int = 0, offset: int = 0) -> Iterator[tuple[int, int, bytes]]:
+        """
+        (segment id, raw offset, line) for every complete line from a position
+        to the end of the log: the rest of the sealed segments, then the
+        active file (skipped while a rollover is in progress).
+        """
+        self._load_manifest()
+        for segment in self.segments:
+            if segment.id < segment_id:
+                continue
+            start = offset if segment.id == segment_id else 0
+            first = max(bisect.bisect_right([f.raw_offset for f in segment.frames], start) - 1, 0)
+            for number in range(first, len(segment.frames)):
+                base = segment.frames[number].raw_offset
+                data = self._frame_bytes(segment, number)
+                position = max(start - base, 0)
+                for line in data[position:].splitlines(keepends=True):
+                    yield segment.id, base + position, line
+                    position += len(line)
+
+        active_id = self.next_id
+        if active_id < segment_id or self.sealing() or not self.path.exists():
+            return
+        start = offset if active_id == segment_id else 0
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Partially written; picked up next time
+                yield active_id, start, line
+                start += len(line)
+
+    def read_at(self, positions: Iterable[tuple[int, int]]) -> list[dict]:
+        """
+        Entries at (segment id, raw offset) positions, in the given order.
+
+        Raises:
+            KeyError: A position names neither a sealed segment nor the active one
+        """
+        self._load_manifest()
+        by_id = {segment.id: segment for segment in self.segments}
+        frames: dict[tuple[int, int], bytes] = {}
+        entries = []
+        active = None
+        try:
+            for segment_id, offset in positions:
+                segment = by_id.get(segment_id)
+                if segment is None:
+                    if segment_id != self.next_id:
+                        raise KeyError(f"No segment {segment_id} in {self.path.name}")
+                    if active is None:
+                        # Mid-rollover the active file has been renamed aside under its id
+                        pending = self.archive_dir / f"{segment_id:08d}.jsonl"
+                        active = open(pending if pending.exists() else self.path, "rb")
+                    active.seek(offset)
+                    entries.append(json.loads(active.readline()))
+                    continue
+                number = bisect.bisect_right([f.raw_offset for f in segment.frames], offset) - 1
+                if (segment_id, number) not in frames:
+                    frames[segment_id, number] = self._frame_bytes(segment, number)
+                data = frames[segment_id, number]
+                start = offset - segment.frames[number].raw_offset
+                end = data.find(b"\n", start)
+                entries.append(json.loads(data[start:end if end >= 0 else len(data)]))
+        finally:
+            if active:
+                active.close()
+        return entries
+
+    def _reverse_lines(self, until: Optional[datetime]) -> Iterator[bytes]:
+        """
+        Every line newest first: the active file, any segment being sealed,
+        then sealed frames backwards
+        """
+        pending = sorted(self.archive_dir.glob("*.jsonl"), reverse=True) if self.archive_dir.exists() else []
+        for path in [self.path, *pending]:
+            if path.exists() and path.stat().st_size:
+                with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    end = first_after(mm, until, self.time_field) if until else None
+                    yield from reverse_lines(mm, end)
+        for segment in reversed(self.segments):
+            for number in range(len(segment.frames) - 1, -1, -1):
+                frame_first = parse_timestamp(segment.frames[number].first_ts)
+                if until and frame_first and frame_first > until:
+                    continue
+                yield from reversed(self._frame_bytes(segment, number).splitlines())
+
+    def tail(
+        self,
+        limit: int,
+        since: TimeBound = None,
+        until: TimeBound = None,
+        keys: Optional[Iterable[str]] = None,
+        key_field: str = "key",
+    ) -> list[dict]:
+        """Last `limit` matching entries across segments, oldest first"""
+        self._load_manifest()
+        lines = self._reverse_lines(parse_timestamp(until))
+        try:
+            return newest_entries(lines, limit, since, until, keys, key_field, self.time_field)
+        finally:
+            lines.close()
+
+    def scan(self, since: TimeBound = None, until: TimeBound = None) -> Iterator[dict]:
+        """Entries in [since, until], oldest first, reading only overlapping frames"""
+        since, until = parse_timestamp(since), parse_timestamp(until)
+        self._load_manifest()
+        start_id, start_offset = self.next_id, 0
+        for segment in self.segments:
+            last = parse_timestamp(segment.last_ts)
+            if since and last and last < since:
+                continue
+            stamps = [parse_timestamp(frame.first_ts) for frame in segment.frames]
+            first = 0
+            if since:
+                # Last frame starting before `since`; equal stamps may straddle frames
+                first = max(sum(1 for stamp in stamps if stamp and stamp < since) - 1, 0)
+            start_id, start_offset = segment.id, segment.frames[first].raw_offset if segment.frames else 0
+            break
+
+        for _, _, line in self.lines_from(start_id, start_offset):
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(entry, dict):
+                continue
+            if since or until:
+                stamp = parse_timestamp(entry.get(self.time_field))
+                if stamp is None or (since and stamp < since):
+                    continue
+                if until and stamp > until:
+                    return  # Appended in time order: nothing later qualifies
+            yield entry
+
+    def stats(self) -> dict:
+        self._load_manifest()
+        active = self.path.stat().st_size if self.path.exists() else 0
+        return {
+            "segments": len(self.segments),
+            "entries": sum(segment.entries for segment in self.segments),
+            "raw_bytes": sum(segment.raw_bytes for segment in self.segments),
+            "compressed_bytes": sum(segment.bytes for segment in self.segments),
+            "active_bytes": active,
+            "first_ts": self.segments[0].first_ts if self.segments else None,
+            "codec": self.codec,
+        }
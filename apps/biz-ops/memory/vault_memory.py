@@ -7,9 +7,11 @@ Uses JSON files in data/ backed to GitHub (immutable audit trail).
 
 Features:
 - Context rehydration: load recent state before each agent run
-- Semantic index: keyword lookup across all stored entries
+- Recall index: BM25-ranked keyword search over an inverted index kept
+  next to each namespace's log (see memory/recall_index.py)
 - Agent isolation: each agent gets its own memory namespace
-- Immutable audit: all writes append-only (never overwrite)
+- Immutable audit: all writes append-only (never overwrite); logs roll
+  into compressed, sealed segments (see memory/segmented_log.py)
 - Enterprise-grade: handles 10K+ entries with pagination
 """
 
@@ -19,12 +21,36 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Optional
 
+from memory.log_tail import TimeBound
+from memory.recall_index import RecallIndex, tokenize
+from memory.segmented_log import SegmentedLog
+
 logger = logging.getLogger("VaultMemory")
 
 REPO_ROOT = Path(__file__).resolve().parents[3]
 MEMORY_ROOT = REPO_ROOT / "data" / "memory"
 DISPATCH_LOG = REPO_ROOT / "data" / "dispatch-log" / "commands.jsonl"
 
+# One segmented log and recall index per log, shared by every VaultMemory on that namespace
+_LOGS: dict[Path, SegmentedLog] = {}
+_RECALL_INDEXES: dict[Path, RecallIndex] = {}
+
+
+def segment_log(path: Path) -> SegmentedLog:
+    """The segmented log whose active segment is at `path`"""
+    key = Path(path).resolve()
+    if key not in _LOGS:
+        _LOGS[key] = SegmentedLog(key)
+    return _LOGS[key]
+
+
+def recall_index(index_file: Path) -> RecallIndex:
+    """The (lazily loaded) recall index over a namespace's index.jsonl"""
+    key = Path(index_file).resolve()
+    if key not in _RECALL_INDEXES:
+        _RECALL_INDEXES[key] = RecallIndex(segment_log(key))
+    return _RECALL_INDEXES[key]
+
 
 class VaultMemory:
     """
@@ -58,58 +84,37 @@ class VaultMemory:
             "tags": tags or [],
             "timestamp": datetime.now(timezone.utc).isoformat(),
         }
-        with open(self.index_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(entry) + "\n")
+        segment_log(self.index_file).append(entry)
         logger.debug(f"Stored: {entry_id}")
         return entry_id
 
     def recall(self, query: str, limit: int = 10) -> list[dict]:
         """
-        Keyword search across stored entries.
-        Returns up to `limit` matching entries, most recent first.
+        Keyword search across stored entries (key, tags and value).
+        Returns up to `limit` entries ranked by BM25, ties most recent first;
+        a query without search terms returns the most recent entries.
         """
-        if not self.index_file.exists():
-            return []
-
-        query_lower = query.lower()
-        matches = []
-        with open(self.index_file, encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    entry = json.loads(line)
-                    entry_text = json.dumps(entry).lower()
-                    if query_lower in entry_text:
-                        matches.append(entry)
-                except json.JSONDecodeError:
-                    continue
-
-        # Most recent first
-        matches.sort(key=lambda e: e.get("timestamp", ""), reverse=True)
-        return matches[:limit]
-
-    def rehydrate(self, max_entries: int = 50) -> list[dict]:
+        index = recall_index(self.index_file)
+        if tokenize(query):
+            positions = [position for _, position in index.search(query, limit)]
+        else:
+            positions = index.recent(limit)
+        return list(index.read(positions))
+
+    def rehydrate(
+        self,
+        max_entries: int = 50,
+        since: TimeBound = None,
+        until: TimeBound = None,
+        keys: Optional[list[str]] = None,
+    ) -> list[dict]:
         """
         Load recent memory entries for LLM context window.
-        Returns the last `max_entries` entries across this namespace.
+        Returns the last `max_entries` entries across this namespace, oldest
+        first, optionally limited to a time range and to the given keys.
+        Only the tail of the log is read.
         """
-        if not self.index_file.exists():
-            return []
-
-        entries = []
-        with open(self.index_file, encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    entries.append(json.loads(line))
-                except json.JSONDecodeError:
-                    continue
-
-        return entries[-max_entries:]
+        return segment_log(self.index_file).tail(max_entries, since=since, until=until, keys=keys)
 
     def save_state(self, state: dict) -> None:
         """Overwrite the current state snapshot (mutable, for fast reads)."""
@@ -128,26 +133,19 @@ class VaultMemory:
         with open(self.state_file, encoding="utf-8") as f:
             return json.load(f)
 
-    def dispatch_context(self, limit: int = 20) -> list[dict]:
+    def dispatch_context(
+        self,
+        limit: int = 20,
+        since: TimeBound = None,
+        until: TimeBound = None,
+        agents: Optional[list[str]] = None,
+    ) -> list[dict]:
         """
         Load recent dispatch log entries for orchestration context.
         Used by all agents to understand what has recently been run.
+        Optionally limited to a time range and to dispatches of given agents.
         """
-        if not DISPATCH_LOG.exists():
-            return []
-
-        entries = []
-        with open(DISPATCH_LOG, encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    entries.append(json.loads(line))
-                except json.JSONDecodeError:
-                    continue
-
-        return entries[-limit:]
+        return segment_log(DISPATCH_LOG).tail(limit, since=since, until=until, keys=agents, key_field="agent")
 
 
 # Module-level convenience functions
@@ -162,7 +160,7 @@ def build_llm_context(namespace: str, query: str = "") -> str:
     Returns a text block suitable for system prompt prepending.
     """
     vault = VaultMemory(namespace)
-    recent = vault.rehydrate(50)
+    recent = vault.rehydrate(10)
     dispatch = vault.dispatch_context(10)
 
     lines = [
@@ -171,7 +169,7 @@ def build_llm_context(namespace: str, query: str = "") -> str:
         "",
         "## Recent Agent Memory",
     ]
-    for entry in recent[-10:]:
+    for entry in recent:
         lines.append(f"- [{entry.get('key')}] {json.dumps(entry.get('value', ''))[:120]}")
 
     lines.extend(["", "## Recent Dispatches"])
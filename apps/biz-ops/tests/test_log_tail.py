@@ -0,0 +1,75 @@
+import json
+import mmap
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from memory import vault_memory  # noqa: E402
+from memory.log_tail import first_after, newest_entries, parse_timestamp, reverse_lines  # noqa: E402
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def write_log(path: Path, count: int) -> mmap.mmap:
+    with open(path, "w", encoding="utf-8") as f:
+        for minute in range(count):
+            stamp = (START + timedelta(minutes=minute)).strftime("%Y-%m-%d %H:%M:%S UTC")
+            f.write(json.dumps({"timestamp": stamp, "agent": "hunter" if minute % 2 else "vault", "n": minute}) + "\n")
+        f.write("not json\n\n")
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def test_timestamps_in_every_logged_form():
+    assert parse_timestamp("2026-01-01 00:05:00 UTC") == START + timedelta(minutes=5)
+    assert parse_timestamp("2026-01-01T00:05:00Z") == START + timedelta(minutes=5)
+    assert parse_timestamp(datetime(2026, 1, 1)) == START
+    assert parse_timestamp("yesterday") is None and parse_timestamp(None) is None
+
+
+def test_newest_entries_read_only_the_tail(tmp_path):
+    mm = write_log(tmp_path / "commands.jsonl", 100)
+    read = []
+
+    def counted(lines):
+        for line in lines:
+            read.append(line)
+            yield line
+
+    entries = newest_entries(counted(reverse_lines(mm)), 3)
+    assert [entry["n"] for entry in entries] == [97, 98, 99]
+    assert len(read) == 4  # The unparseable last line, then three entries
+
+    hunters = newest_entries(reverse_lines(mm), 2, keys=["hunter"], key_field="agent")
+    assert [entry["n"] for entry in hunters] == [97, 99]
+    recent = newest_entries(reverse_lines(mm), 50, since=START + timedelta(minutes=95))
+    assert [entry["n"] for entry in recent] == [95, 96, 97, 98, 99]
+    mm.close()
+
+
+def test_until_is_found_by_binary_search(tmp_path):
+    mm = write_log(tmp_path / "commands.jsonl", 100)
+    end = first_after(mm, START + timedelta(minutes=40), "timestamp")
+    assert json.loads(mm[end:mm.find(b"\n", end)])["n"] == 41
+
+    entries = newest_entries(reverse_lines(mm, end), 2, until=START + timedelta(minutes=40))
+    assert [entry["n"] for entry in entries] == [39, 40]
+    mm.close()
+
+
+def test_rehydrate_and_dispatch_context_read_the_newest_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr(vault_memory, "MEMORY_ROOT", tmp_path / "memory")
+    monkeypatch.setattr(vault_memory, "DISPATCH_LOG", tmp_path / "commands.jsonl")
+    monkeypatch.setattr(vault_memory, "_LOGS", {})
+    write_log(tmp_path / "commands.jsonl", 30).close()
+
+    vault = vault_memory.VaultMemory("hunter")
+    for n in range(20):
+        vault.store("lead" if n % 2 else "run", {"n": n})
+    assert [entry["value"]["n"] for entry in vault.rehydrate(3)] == [17, 18, 19]
+    assert [entry["value"]["n"] for entry in vault.rehydrate(2, keys=["run"])] == [16, 18]
+
+    assert [entry["n"] for entry in vault.dispatch_context(2, agents=["vault"])] == [26, 28]
+    assert [entry["n"] for entry in vault.dispatch_context(5, until="2026-01-01T00:10:00Z")] == [6, 7, 8, 9, 10]
@@ -0,0 +1,106 @@
+import random
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from memory import recall_index, vault_memory  # noqa: E402
+from memory.recall_index import RecallIndex  # noqa: E402
+from memory.segmented_log import SegmentedLog  # noqa: E402
+
+WORDS = ["lake", "nona", "medical", "tower", "permit", "orlando", "clinic", "retail", "school", "garage",
+         "hotel", "office", "bridge", "plaza", "county", "road", "parking", "station", "campus", "arena"]
+
+
+def memory_entry(n: int, words: list) -> dict:
+    return {"key": f"lead-{n}", "value": {"notes": " ".join(words)}, "tags": [], "n": n,
+            "timestamp": datetime(2026, 1, 1, tzinfo=timezone.utc).isoformat()}
+
+
+def fill(log: SegmentedLog, count: int, seed: int = 3):
+    rng = random.Random(seed)
+    for n in range(count):
+        # The first few words are common, so their posting lists span many blocks
+        words = [rng.choice(WORDS[:4] if rng.random() < 0.3 else WORDS) for _ in range(rng.randint(2, 12))]
+        log.append(memory_entry(n, words))
+
+
+def found(index: RecallIndex, query: str, limit: int = 10) -> list:
+    """Entry numbers of the search results, best first"""
+    return [entry["n"] for entry in index.read([position for _, position in index.search(query, limit)])]
+
+
+def ranked(index: RecallIndex, query: str, limit: int = 10) -> list:
+    results = index.search(query, limit)
+    numbers = [entry["n"] for entry in index.read([position for _, position in results])]
+    return [(round(score, 9), n) for (score, _), n in zip(results, numbers)]
+
+
+@pytest.fixture
+def log(tmp_path):
+    return SegmentedLog(tmp_path / "index.jsonl", max_bytes=64 * 1024, max_age=None)
+
+
+def test_best_matches_rank_first(log):
+    log.append(memory_entry(0, ["retail", "plaza"]))
+    log.append(memory_entry(1, ["lake", "nona", "medical", "tower"]))
+    log.append(memory_entry(2, ["lake", "county", "road"]))
+    log.append(memory_entry(3, ["lake", "nona", "medical", "tower"]))
+
+    index = RecallIndex(log)
+    assert found(index, "Lake Nona!") == [3, 1, 2]
+    assert index.search("submarine", 10) == []
+    assert [entry["n"] for entry in index.read(index.recent(2))] == [3, 2]
+
+
+def test_block_search_returns_the_exhaustive_ranking(log, monkeypatch):
+    fill(log, 3000)
+    exhaustive = RecallIndex(log, log.path.parent / "exhaustive")
+    expected = {query: ranked(exhaustive, query) for query in ("lake", "nona tower", "medical permit arena")}
+
+    monkeypatch.setattr(recall_index, "EXHAUSTIVE_LIMIT", 0)
+    for query, ranking in expected.items():
+        assert ranked(exhaustive, query) == ranking
+
+
+def test_snapshot_is_reused_and_only_new_lines_are_read(log):
+    fill(log, 300)
+    index = RecallIndex(log)
+    index.refresh()
+    index.save()
+    log.append(memory_entry(300, ["submarine", "dock"]))
+
+    reopened = RecallIndex(SegmentedLog(log.path, max_bytes=64 * 1024, max_age=None))
+    assert len(reopened) == 300
+    assert reopened.refresh() == 1
+    assert found(reopened, "submarine") == [300]
+
+
+def test_a_replaced_log_is_reindexed(log):
+    fill(log, 50)
+    index = RecallIndex(log)
+    index.refresh()
+    index.save()
+
+    for path in log.path.parent.glob("index*"):
+        path.unlink()
+    fresh = SegmentedLog(log.path, max_bytes=64 * 1024, max_age=None)
+    fresh.append(memory_entry(0, ["submarine"]))
+    reopened = RecallIndex(fresh)
+    assert found(reopened, "submarine lake") == [0]
+    assert len(reopened) == 1
+
+
+def test_vault_recall_uses_the_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(vault_memory, "MEMORY_ROOT", tmp_path)
+    monkeypatch.setattr(vault_memory, "_LOGS", {})
+    monkeypatch.setattr(vault_memory, "_RECALL_INDEXES", {})
+
+    vault = vault_memory.VaultMemory("hunter")
+    vault.store("lead", {"project_name": "Lake Nona Medical", "value": 1200000}, tags=["healthcare"])
+    vault.store("lead", {"project_name": "Downtown Garage"})
+    assert [entry["value"]["project_name"] for entry in vault.recall("healthcare")] == ["Lake Nona Medical"]
+    assert [entry["value"]["project_name"] for entry in vault.recall("", limit=1)] == ["Downtown Garage"]
@@ -15,6 +15,10 @@ export interface Lead {
   qualification_date?: string;
   permit_date?: string;
   min_value_check?: string;
+  id?: string;
+  metro?: string | null;
+  county?: string | null;
+  day?: string;
 }
 
 export interface LeadData {
@@ -37,22 +41,158 @@ export function formatCurrency(value: number): string {
 }
 
 /**
- * Load lead data from JSON files
+ * Dashboard export (written by apps/hunter-agent/dashboard_export.py)
+ *
+ * manifest.json carries totals and aggregates; leads live in gzip shards
+ * (per day, by descending value, per geohash tile) so a view fetches only
+ * the shards it needs.
  */
-export async function loadLeads(): Promise<Lead[]> {
+export interface LeadAggregate {
+  count: number;
+  total_value: number;
+  max_value: number | null;
+}
+
+export interface LeadShardRef extends LeadAggregate {
+  shard: string;
+}
+
+export interface LeadManifest extends LeadAggregate {
+  version: number;
+  generated_at: string;
+  fields: string[];
+  days: (LeadShardRef & { date: string })[];
+  cities: (LeadAggregate & { name: string })[];
+  project_types: (LeadAggregate & { name: string })[];
+  by_value: (LeadShardRef & { min_value: number })[];
+  tiles: {
+    precision: number;
+    cells: (LeadShardRef & { geohash: string; bbox: [number, number, number, number] })[];
+  };
+}
+
+/** [south, west, north, east] in degrees */
+export type LatLngBounds = [number, number, number, number];
+
+const LEADS_PATH = '/data/leads';
+// Single-file dataset published before the sharded export existed
+const LEGACY_LEADS_FILE = '/data/raw-leads/2026-02-19.json';
+
+let manifestRequest: Promise<LeadManifest | null> | null = null;
+const shardRequests = new Map<string, Promise<Lead[]>>();
+
+function leadsUrl(path: string): string {
+  return `${process.env.NEXT_PUBLIC_BASE_PATH || ''}${LEADS_PATH}/${path}`;
+}
+
+/**
+ * Load the export manifest (cached; null when no export is deployed)
+ */
+export function loadManifest(): Promise<LeadManifest | null> {
+  if (!manifestRequest) {
+    manifestRequest = fetch(leadsUrl('manifest.json'))
+      .then(response => (response.ok ? (response.json() as Promise<LeadManifest>) : null))
+      .catch(error => {
+        console.warn('Could not load lead manifest:', error);
+        return null;
+      });
+  }
+  return manifestRequest;
+}
+
+/**
+ * Load and decode one gzip shard (cached per shard)
+ */
+export function loadShard(shard: string): Promise<Lead[]> {
+  let request = shardRequests.get(shard);
+  if (!request) {
+    request = (async () => {
+      const response = await fetch(leadsUrl(shard));
+      if (!response.ok || !response.body) {
+        throw new Error(`Shard ${shard}: HTTP ${response.status}`);
+      }
+      const text = await new Response(
+        response.body.pipeThrough(new DecompressionStream('gzip'))
+      ).text();
+      const { fields, rows } = JSON.parse(text) as { fields: string[]; rows: unknown[][] };
+      return rows.map(row => Object.fromEntries(fields.map((field, i) => [field, row[i]])) as unknown as Lead);
+    })();
+    request.catch(() => shardRequests.delete(shard));
+    shardRequests.set(shard, request);
+  }
+  return request;
+}
+
+/**
+ * Leads found on the given days (YYYY-MM-DD)
+ */
+export async function loadLeadsForDays(manifest: LeadManifest, dates: string[]): Promise<Lead[]> {
+  const wanted = new Set(dates);
+  const shards = manifest.days.filter(day => wanted.has(day.date)).map(day => day.shard);
+  return (await Promise.all(shards.map(loadShard))).flat();
+}
+
+/**
+ * Highest-value leads, reading value chunks only until `limit` is reached
+ */
+export async function loadTopLeads(manifest: LeadManifest, limit: number, minValue = 0): Promise<Lead[]> {
+  const leads: Lead[] = [];
+  for (const chunk of manifest.by_value) {
+    if (leads.length >= limit || chunk.max_value === null || chunk.max_value < minValue) break;
+    leads.push(...(await loadShard(chunk.shard)).filter(lead => lead.project_value >= minValue));
+  }
+  return leads.slice(0, limit);
+}
+
+/**
+ * Leads inside a map viewport, fetching only the tiles that overlap it
+ */
+export async function loadLeadsInBounds(manifest: LeadManifest, bounds: LatLngBounds): Promise<Lead[]> {
+  const [south, west, north, east] = bounds;
+  const shards = manifest.tiles.cells
+    .filter(({ bbox: [s, w, n, e] }) => s <= north && n >= south && w <= east && e >= west)
+    .map(cell => cell.shard);
+  return (await Promise.all(shards.map(loadShard)))
+    .flat()
+    .filter(lead => lead.lat >= south && lead.lat <= north && lead.lng >= west && lead.lng <= east);
+}
+
+/**
+ * Load leads from the legacy raw-leads JSON file (null when unavailable)
+ */
+async function loadLegacyLeads(): Promise<Lead[] | null> {
   try {
-    // In production (static export), load from public directory
-    const basePath = process.env.NEXT_PUBLIC_BASE_PATH || '';
-    const response = await fetch(`${basePath}/data/raw-leads/2026-02-19.json`);
+    const response = await fetch(`${process.env.NEXT_PUBLIC_BASE_PATH || ''}${LEGACY_LEADS_FILE}`);
     if (response.ok) {
       const data: LeadData = await response.json();
       return data.leads || [];
     }
+  } catch (error) {
+    console.warn('Could not load legacy leads:', error);
+  }
+  return null;
+}
+
+/**
+ * Load the leads of the most recent days from the dashboard export,
+ * falling back to the legacy raw-leads file and then to mock data
+ */
+export async function loadLeads(days = 7): Promise<Lead[]> {
+  try {
+    const manifest = await loadManifest();
+    if (manifest && manifest.count > 0) {
+      return await loadLeadsForDays(manifest, manifest.days.slice(0, days).map(day => day.date));
+    }
   } catch (error) {
     console.warn('Could not load leads:', error);
   }
-  
-  // Return mock data if file not available
+
+  const legacy = await loadLegacyLeads();
+  if (legacy && legacy.length > 0) {
+    return legacy;
+  }
+
+  // Return mock data if no lead data is available
   return getMockLeads();
 }
 
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+SHADOW CHANGE DETECTION CACHE
+=============================
+Remembers what each URL looked like last time it was scraped
+
+Per URL the cache keeps the response validators (ETag / Last-Modified),
+a hash of the extraction spec, a hash of the fetched document and a hash
+of the extracted data. The HTTP fast path sends conditional requests with
+the validators, so an unchanged page answers 304 and is never re-extracted.
+A page fetched in full is hashed before extraction (the raw body on the
+fast path, the rendered DOM in a browser); when that hash matches the
+stored one the previous extraction is reused. Otherwise the fresh
+extraction is compared by hash.
+
+Either way the result is marked `unchanged` and carries the previous data.
+Job result endpoints and the hunter pipeline drop unchanged results, so
+only pages that actually changed reach qualification.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+logger = logging.getLogger('ChangeCache')
+
+
+def content_hash(data: Any) -> str:
+    """Stable hash of extracted data (key order and whitespace don't matter)"""
+    canonical = json.dumps(data, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(canonical.encode()).hexdigest()
+
+
+def document_hash(document: Union[str, bytes]) -> str:
+    """Hash of a fetched document, taken before any extraction runs"""
+    if isinstance(document, str):
+        document = document.encode()
+    return hashlib.sha1(document).hexdigest()
+
+
+def spec_hash(selectors: Dict[str, str], row_selector: Optional[str]) -> str:
+    """Hash of what was extracted; a changed spec invalidates the cached data"""
+    return content_hash([selectors, row_selector])
+
+
+@dataclass
+class PageState:
+    """What the cache knows about a URL"""
+    url: str
+    spec: str
+    content_hash: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    checked_at: float
+    payload: bytes
+    document_hash: Optional[str] = None
+
+    @property
+    def data(self) -> Any:
+        return json.loads(zlib.decompress(self.payload))
+
+
+class ChangeCache:
+    """
+    On-disk page state keyed by URL.
+
+    Usage:
+        cache = ChangeCache(".cache/changes.sqlite3")
+        headers = cache.conditional_headers(url, spec)
+        ...
+        changed = cache.record(url, spec, data, etag, last_modified)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                spec TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                checked_at REAL NOT NULL,
+                data BLOB NOT NULL,
+                document_hash TEXT
+            )
+        """)
+        # Caches created before documents were hashed
+        if "document_hash" not in {row[1] for row in self._db.execute("PRAGMA table_info(pages)")}:
+            self._db.execute("ALTER TABLE pages ADD COLUMN document_hash TEXT")
+
+    def get(self, url: str) -> Optional[PageState]:
+        row = self._db.execute(
+            "SELECT url, spec, content_hash, etag, last_modified, checked_at, data, document_hash "
+            "FROM pages WHERE url = ?",
+            (url,)
+        ).fetchone()
+        return PageState(*row) if row else None
+
+    def conditional_headers(self, url: str, spec: str) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since for a URL last scraped with the same spec"""
+        state = self.get(url)
+        if state is None or state.spec != spec:
+            return {}
+        headers = {}
+        if state.etag:
+            headers['If-None-Match'] = state.etag
+        if state.last_modified:
+            headers['If-Modified-Since'] = state.last_modified
+        return headers
+
+    def known_document(self, url: str, spec: str) -> Optional[str]:
+        """Document hash from the last scrape of a URL with the same spec"""
+        state = self.get(url)
+        if state is None or state.spec != spec:
+            return None
+        return state.document_hash
+
+    def not_modified(self, url: str) -> Optional[PageState]:
+        """Handle a 304 (or an identical document): refresh the check time and return the cached state"""
+        state = self.get(url)
+        if state is not None:
+            state.checked_at = time.time()
+            self._db.execute("UPDATE pages SET checked_at = ? WHERE url = ?", (state.checked_at, url))
+        return state
+
+    def same_document(self, url: str, spec: str, document: Optional[str]) -> Optional[PageState]:
+        """The cached state when `document` hashes the same as last time, so extraction can be skipped"""
+        if document is None or self.known_document(url, spec) != document:
+            return None
+        return self.not_modified(url)
+
+    def record(self, url: str, spec: str, data: Any, etag: Optional[str] = None,
+               last_modified: Optional[str] = None, document: Optional[str] = None) -> bool:
+        """Store a fresh extraction; returns False when it matches the previous one"""
+        digest = content_hash(data)
+        previous = self.get(url)
+        changed = previous is None or previous.spec != spec or previous.content_hash != digest
+
+        if changed:
+            payload = zlib.compress(json.dumps(data, separators=(',', ':'), default=str).encode(), 6)
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages "
+                "(url, spec, content_hash, etag, last_modified, checked_at, data, document_hash) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, spec, digest, etag, last_modified, time.time(), payload, document)
+            )
+        else:
+            # Keep the stored data; only validators, the document hash and the check time move on
+            self._db.execute(
+                "UPDATE pages SET etag = ?, last_modified = ?, checked_at = ?, document_hash = ? WHERE url = ?",
+                (etag, last_modified, time.time(), document, url)
+            )
+        return changed
+
+    def forget(self, url: str):
+        self._db.execute("DELETE FROM pages WHERE url = ?", (url,))
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def close(self):
+        self._db.close()
+
+
+__all__ = [
+    'ChangeCache',
+    'PageState',
+    'content_hash',
+    'document_hash',
+    'spec_hash'
+]
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+HUNTER DASHBOARD EXPORT
+=======================
+Static, sharded lead dataset for the command-center dashboard
+
+The command center is a static export, so every query it can make is
+precomputed here from the lead store (newest version of each lead):
+
+    manifest.json             totals, per-day / per-city / per-type
+                              aggregates, and the shard lists below
+    days/YYYY-MM-DD.json.gz   leads found on one day
+    value/NNN.json.gz         all leads by descending value, in chunks
+                              (the manifest keeps each chunk's value range)
+    tiles/<geohash>.json.gz   leads per geohash cell, for LeadMap viewports
+
+Shards are gzip-compressed `{"fields": [...], "rows": [[...], ...]}`
+documents, so field names are written once per shard. They are written
+deterministically and only when their content changed, which keeps the
+daily commit limited to the shards that actually moved; the manifest is
+replaced last so readers never see it point at a missing shard.
+
+Usage:
+    python dashboard_export.py
+    python dashboard_export.py --store ../../data/lead-store --output /tmp/leads
+"""
+
+import argparse
+import gzip
+import json
+import os
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from geo import geohash_bounds
+from lead_store import LeadStore
+from spatial_index import GeoIndex
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+DEFAULT_STORE = REPO_ROOT / "data" / "lead-store"
+DEFAULT_OUTPUT = REPO_ROOT / "apps" / "command-center" / "public" / "data" / "leads"
+
+# Row layout shared by every shard (store column -> exported field)
+FIELDS = {
+    "fingerprint": "id",
+    "project_name": "project_name",
+    "developer": "developer",
+    "project_value": "project_value",
+    "location": "location",
+    "contact": "contact",
+    "project_type": "project_type",
+    "lat": "lat",
+    "lng": "lng",
+    "qualified": "qualified",
+    "qualification_date": "qualification_date",
+    "permit_date": "permit_date",
+    "min_value_check": "min_value_check",
+    "metro": "metro",
+    "county": "county",
+    "date": "day"
+}
+
+VERSION = 1
+TILE_PRECISION = 4  # ~24 x 12 miles per tile
+VALUE_CHUNK = 250
+
+_CITY = re.compile(r",\s*([^,]+),\s*([A-Z]{2})\b")
+
+
+def lead_city(row: Dict[str, Any]) -> str:
+    """"City, ST" from the lead's address"""
+    match = _CITY.search(row.get("location") or "")
+    return f"{match.group(1).strip()}, {match.group(2)}" if match else "Unknown"
+
+
+def _aggregate(rows: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    values = [row["project_value"] for row in rows if row.get("project_value") is not None]
+    return {
+        "count": len(rows),
+        "total_value": round(sum(values), 2),
+        "max_value": max(values) if values else None
+    }
+
+
+@dataclass
+class ExportResult:
+    manifest: Dict[str, Any]
+    shards: int
+    rewritten: int
+    removed: int
+
+
+class ShardWriter:
+    """Writes gzip shards under an output directory, skipping unchanged ones"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.written: List[str] = []
+        self.unchanged = 0
+
+    def write(self, name: str, rows: Sequence[Dict[str, Any]]) -> str:
+        fields = list(FIELDS.values())
+        document = json.dumps(
+            {"fields": fields, "rows": [[row.get(field) for field in fields] for row in rows]},
+            separators=(",", ":"), ensure_ascii=False
+        ).encode("utf-8")
+        data = gzip.compress(document, compresslevel=9, mtime=0)
+
+        path = self.root / name
+        self.written.append(name)
+        if path.exists() and path.read_bytes() == data:
+            self.unchanged += 1
+            return name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        return name
+
+    def remove_stale(self) -> int:
+        """Delete shards from earlier exports that this one didn't write"""
+        keep = set(self.written)
+        stale = [path for path in self.root.glob("*/*.json.gz")
+                 if path.relative_to(self.root).as_posix() not in keep]
+        for path in stale:
+            path.unlink()
+        return len(stale)
+
+
+def load_rows(store: LeadStore) -> List[Dict[str, Any]]:
+    """Newest version of every stored lead, in dashboard field names"""
+    rows = store.read(list(FIELDS), latest=True)
+    return [{FIELDS[column]: value for column, value in row.items()} for row in rows]
+
+
+def export_dashboard(rows: List[Dict[str, Any]], output: Path = DEFAULT_OUTPUT,
+                     tile_precision: int = TILE_PRECISION, value_chunk: int = VALUE_CHUNK) -> ExportResult:
+    """Write shards and the manifest for the given lead rows"""
+    output = Path(output)
+    shards = ShardWriter(output)
+
+    # Per-day shards, newest first
+    by_day: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for row in rows:
+        by_day[row["day"]].append(row)
+    days = []
+    for day in sorted(by_day, reverse=True):
+        day_rows = sorted(by_day[day], key=lambda row: -(row.get("project_value") or 0))
+        days.append({"date": day, **_aggregate(day_rows),
+                     "shard": shards.write(f"days/{day}.json.gz", day_rows)})
+
+    # Value index: every priced lead, highest first, in fixed-size chunks
+    priced = sorted((row for row in rows if row.get("project_value") is not None),
+                    key=lambda row: (-row["project_value"], row["id"]))
+    by_value = []
+    for number, start in enumerate(range(0, len(priced), value_chunk)):
+        chunk = priced[start:start + value_chunk]
+        by_value.append({
+            "count": len(chunk),
+            "max_value": chunk[0]["project_value"],
+            "min_value": chunk[-1]["project_value"],
+            "shard": shards.write(f"value/{number:03d}.json.gz", chunk)
+        })
+
+    # Geo tiles: group by geohash cell using the spatial index's sorted keys
+    index = GeoIndex.build([row.get("lat") if row.get("lat") is not None else np.nan for row in rows],
+                           [row.get("lng") if row.get("lng") is not None else np.nan for row in rows],
+                           precision=tile_precision)
+    tiles = []
+    if len(index):
+        starts = np.flatnonzero(np.r_[True, index.keys[1:] != index.keys[:-1]])
+        ends = np.r_[starts[1:], len(index.keys)]
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            key = int(index.keys[start])
+            cell = index.grid.geohash(divmod(key, index.grid.cols))
+            tile_rows = [rows[position] for position in index.positions[start:end].tolist()]
+            lat_lo, lat_hi, lng_lo, lng_hi = geohash_bounds(cell)
+            tiles.append({"geohash": cell, "bbox": [lat_lo, lng_lo, lat_hi, lng_hi], **_aggregate(tile_rows),
+                          "shard": shards.write(f"tiles/{cell}.json.gz", tile_rows)})
+
+    # Small aggregates live in the manifest itself
+    by_city: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    by_type: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for row in rows:
+        by_city[lead_city(row)].append(row)
+        by_type[row.get("project_type") or "Unknown"].append(row)
+
+    manifest = {
+        "version": VERSION,
+        "generated_at": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC"),
+        "fields": list(FIELDS.values()),
+        **_aggregate(rows),
+        "days": days,
+        "cities": sorted(({"name": name, **_aggregate(group)} for name, group in by_city.items()),
+                         key=lambda entry: -entry["total_value"]),
+        "project_types": sorted(({"name": name, **_aggregate(group)} for name, group in by_type.items()),
+                                key=lambda entry: -entry["total_value"]),
+        "by_value": by_value,
+        "tiles": {"precision": tile_precision, "cells": tiles}
+    }
+
+    output.mkdir(parents=True, exist_ok=True)
+    tmp = output / "manifest.json.tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp, output / "manifest.json")
+    return ExportResult(manifest, shards=len(shards.written),
+                        rewritten=len(shards.written) - shards.unchanged, removed=shards.remove_stale())
+
+
+def export_from_store(store: LeadStore, output: Path = DEFAULT_OUTPUT, **options) -> ExportResult:
+    return export_dashboard(load_rows(store), output, **options)
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Export the lead store for the command-center dashboard")
+    parser.add_argument("--store", type=Path, default=DEFAULT_STORE)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--tile-precision", type=int, default=TILE_PRECISION)
+    args = parser.parse_args(argv)
+
+    result = export_from_store(LeadStore(args.store), args.output, tile_precision=args.tile_precision)
+    print(f"Exported {result.manifest['count']} leads: {len(result.manifest['days'])} days, "
+          f"{len(result.manifest['tiles']['cells'])} tiles, {len(result.manifest['by_value'])} value chunks "
+          f"({result.rewritten}/{result.shards} shards rewritten, {result.removed} removed) -> {args.output}")
+
+
+__all__ = [
+    'export_dashboard',
+    'ExportResult',
+    'export_from_store',
+    'load_rows',
+    'lead_city',
+    'FIELDS'
+]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,594 @@
+#!/usr/bin/env python3
+"""
+SHADOW DISTRIBUTED SCRAPING
+===========================
+Coordinator/worker protocol so several machines share one scrape job
+
+Protocol (one coordinator, any number of workers):
+    register   -> worker id and lease length
+    lease      -> up to N (job_id, task_id, target) the worker has room for
+    heartbeat  -> extend every lease the worker holds
+    complete   -> results for leased tasks; the coordinator acks them
+    release    -> hand unfinished leases back on shutdown
+    unregister -> forget the worker, returning what it still held
+
+The coordinator keeps jobs in durable WorkQueues, so a worker that dies
+only costs its in-flight leases: they are re-leased when the worker misses
+its heartbeats (counted as a failed attempt) or when the lease expires.
+
+Transports:
+- LocalBroker: calls a Coordinator in the same process (tests, single node)
+- HttpBroker: talks to the coordinator endpoints in scraper_api.py
+
+Rate limits, robots.txt and Retry-After are enforced by each worker's own
+orchestrator, i.e. per worker rather than across the fleet.
+
+Usage (worker node):
+    python distributed.py --coordinator http://scraper-api:8000 --instances 10
+"""
+
+import argparse
+import asyncio
+import itertools
+import logging
+import os
+import socket
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from scraper_orchestrator import ScrapeResult, ScraperConfig, ScraperOrchestrator, ScrapeTarget
+from work_queue import WorkQueue, target_from_dict
+
+logger = logging.getLogger('DistributedScraper')
+
+TaskKey = Tuple[str, int]  # (job_id, task_id)
+
+
+class UnknownWorker(Exception):
+    """The coordinator has no registration for this worker (expired or restarted)"""
+
+
+@dataclass
+class RemoteLease:
+    """A target checked out to a remote worker"""
+    job_id: str
+    task_id: int
+    target: ScrapeTarget
+
+    @property
+    def key(self) -> TaskKey:
+        return (self.job_id, self.task_id)
+
+
+def result_to_wire(result: ScrapeResult) -> Dict[str, Any]:
+    """JSON-safe form of a ScrapeResult for the HTTP transport"""
+    return {
+        'target_id': result.target_id,
+        'url': result.url,
+        'success': result.success,
+        'data': result.data,
+        'error': result.error,
+        'items_extracted': result.items_extracted,
+        'execution_time_ms': result.execution_time_ms,
+        'timestamp': result.timestamp.isoformat(),
+        'unchanged': result.unchanged
+    }
+
+
+def result_from_wire(data: Dict[str, Any]) -> ScrapeResult:
+    """Inverse of result_to_wire"""
+    return ScrapeResult(
+        target_id=data['target_id'],
+        url=data['url'],
+        success=data['success'],
+        data=data.get('data'),
+        error=data.get('error'),
+        items_extracted=data.get('items_extracted', 0),
+        execution_time_ms=data.get('execution_time_ms', 0),
+        timestamp=datetime.fromisoformat(data['timestamp']) if data.get('timestamp') else datetime.utcnow(),
+        unchanged=data.get('unchanged', False)
+    )
+
+
+@dataclass
+class WorkerInfo:
+    """Coordinator-side registration of one worker"""
+    worker_id: str
+    hostname: str
+    capacity: int
+    registered_at: float = field(default_factory=time.time)
+    last_seen: float = field(default_factory=time.time)
+    leases: Set[TaskKey] = field(default_factory=set)
+    completed: int = 0
+
+
+@dataclass
+class DistributedJob:
+    """A job the coordinator hands out to workers"""
+    job_id: str
+    queue: WorkQueue
+    on_result: Callable[[int, ScrapeResult], Awaitable[None]]
+    on_done: Callable[[], Awaitable[None]]
+    max_in_flight: Optional[int] = None  # Cap on this job's targets leased at once
+
+
+class Coordinator:
+    """
+    Broker between job queues and remote workers.
+    Workers that miss heartbeats for worker_timeout_s are dropped and their
+    leases nacked, so a target that keeps killing workers is dead-lettered.
+    """
+
+    def __init__(self, lease_seconds: float = 120, worker_timeout_s: Optional[float] = None):
+        self.lease_seconds = lease_seconds
+        self.worker_timeout_s = worker_timeout_s or lease_seconds
+        self.workers: Dict[str, WorkerInfo] = {}
+        self.jobs: Dict[str, DistributedJob] = {}
+        self._owners: Dict[TaskKey, str] = {}
+        self._rotation = itertools.count()
+
+    async def add_job(self, job_id: str, queue: WorkQueue,
+                      on_result: Callable[[int, ScrapeResult], Awaitable[None]],
+                      on_done: Callable[[], Awaitable[None]],
+                      max_in_flight: Optional[int] = None):
+        """
+        Start handing out a queued job's targets; on_result gets (task_id,
+        result) and on_done fires once the job drains
+        """
+        job = DistributedJob(job_id, queue, on_result, on_done, max_in_flight)
+        self.jobs[job_id] = job
+        logger.info(f"Job {job_id} open for workers ({queue.unfinished()} targets)")
+        await self._finish_if_done(job)
+
+    async def register(self, hostname: str, capacity: int) -> Dict[str, Any]:
+        worker_id = f"{hostname}-{uuid.uuid4().hex[:8]}"
+        self.workers[worker_id] = WorkerInfo(worker_id, hostname, max(1, capacity))
+        logger.info(f"Worker {worker_id} registered (capacity {capacity})")
+        return {'worker_id': worker_id, 'lease_seconds': self.lease_seconds}
+
+    def _worker(self, worker_id: str) -> WorkerInfo:
+        worker = self.workers.get(worker_id)
+        if worker is None:
+            raise UnknownWorker(worker_id)
+        worker.last_seen = time.time()
+        return worker
+
+    async def lease(self, worker_id: str, limit: int) -> List[RemoteLease]:
+        """Up to `limit` targets, taken round-robin across open jobs"""
+        worker = self._worker(worker_id)
+        await self._reap()
+        limit = min(limit, worker.capacity)
+        jobs = list(self.jobs.values())
+        if not jobs or limit <= 0:
+            return []
+
+        start = next(self._rotation) % len(jobs)
+        leases: List[RemoteLease] = []
+        for job in jobs[start:] + jobs[:start]:
+            if len(leases) >= limit:
+                break
+            room = limit - len(leases)
+            if job.max_in_flight is not None:
+                room = min(room, job.max_in_flight - job.queue.leased())
+                if room <= 0:
+                    continue
+            for lease in job.queue.lease(worker_id, room, self.lease_seconds):
+                leases.append(RemoteLease(job.job_id, lease.task_id, lease.target))
+            await self._finish_if_done(job)
+
+        for lease in leases:
+            # An expired lease re-leased here no longer belongs to its old holder
+            previous = self._owners.get(lease.key)
+            if previous is not None and previous in self.workers:
+                self.workers[previous].leases.discard(lease.key)
+            self._owners[lease.key] = worker_id
+            worker.leases.add(lease.key)
+        return leases
+
+    async def heartbeat(self, worker_id: str) -> int:
+        """Extend every lease the worker holds; returns how many"""
+        worker = self._worker(worker_id)
+        by_job: Dict[str, List[int]] = {}
+        for job_id, task_id in worker.leases:
+            by_job.setdefault(job_id, []).append(task_id)
+        for job_id, task_ids in by_job.items():
+            if job_id in self.jobs:
+                self.jobs[job_id].queue.extend(task_ids, self.lease_seconds)
+        return len(worker.leases)
+
+    async def complete(self, worker_id: str,
+                       results: List[Tuple[str, int, ScrapeResult]]) -> Dict[str, int]:
+        """
+        Ack results for leases the worker still holds. Results for leases it
+        lost (reaped and handed to another worker) are dropped as stale.
+        """
+        worker = self._worker(worker_id)
+        accepted = stale = 0
+        touched: Dict[str, DistributedJob] = {}
+
+        for job_id, task_id, result in results:
+            job = self.jobs.get(job_id)
+            if job is None or (job_id, task_id) not in worker.leases:
+                stale += 1
+                continue
+            worker.leases.discard((job_id, task_id))
+            self._owners.pop((job_id, task_id), None)
+            # Record before acking: a crash in between redelivers the task
+            # (deduplicated by task_id) instead of losing its result
+            await job.on_result(task_id, result)
+            job.queue.ack(task_id, result)
+            touched[job_id] = job
+            accepted += 1
+
+        worker.completed += accepted
+        for job in touched.values():
+            await self._finish_if_done(job)
+        return {'accepted': accepted, 'stale': stale}
+
+    async def release(self, worker_id: str, keys: List[TaskKey]):
+        """Return unfinished leases without counting an attempt"""
+        worker = self._worker(worker_id)
+        self._return_leases(worker, [key for key in keys if key in worker.leases], failed=False)
+
+    async def unregister(self, worker_id: str):
+        worker = self.workers.pop(worker_id, None)
+        if worker is not None:
+            self._return_leases(worker, list(worker.leases), failed=False)
+            logger.info(f"Worker {worker_id} unregistered after {worker.completed} results")
+
+    def _return_leases(self, worker: WorkerInfo, keys: List[TaskKey], failed: bool):
+        by_job: Dict[str, List[int]] = {}
+        for key in keys:
+            worker.leases.discard(key)
+            self._owners.pop(key, None)
+            by_job.setdefault(key[0], []).append(key[1])
+
+        for job_id, task_ids in by_job.items():
+            job = self.jobs.get(job_id)
+            if job is None:
+                continue
+            if failed:
+                for task_id in task_ids:
+                    job.queue.nack(task_id, f"worker {worker.worker_id} lost")
+            else:
+                job.queue.release(task_ids)
+
+    async def _reap(self):
+        """Drop workers that stopped heartbeating and requeue what they held"""
+        cutoff = time.time() - self.worker_timeout_s
+        for worker in [w for w in self.workers.values() if w.last_seen < cutoff]:
+            logger.warning(f"Worker {worker.worker_id} missed heartbeats, requeueing {len(worker.leases)} leases")
+            self._return_leases(worker, list(worker.leases), failed=True)
+            del self.workers[worker.worker_id]
+
+    async def _finish_if_done(self, job: DistributedJob):
+        if job.job_id not in self.jobs:
+            return
+        # Dead-lettered targets still count towards the job: report each as a failure
+        for task_id, result in job.queue.dead_letters():
+            await job.on_result(task_id, result)
+            job.queue.ack_dead_letter(task_id, result)
+        if job.queue.unfinished() == 0:
+            del self.jobs[job.job_id]
+            for key in [key for key in self._owners if key[0] == job.job_id]:
+                del self._owners[key]
+            await job.on_done()
+
+    def status(self) -> Dict[str, Any]:
+        """Registered workers and open jobs"""
+        now = time.time()
+        return {
+            'workers': [
+                {
+                    'worker_id': worker.worker_id,
+                    'hostname': worker.hostname,
+                    'capacity': worker.capacity,
+                    'leased': len(worker.leases),
+                    'completed': worker.completed,
+                    'idle_seconds': round(now - worker.last_seen, 1)
+                }
+                for worker in self.workers.values()
+            ],
+            'jobs': {job_id: job.queue.stats() for job_id, job in self.jobs.items()}
+        }
+
+
+class Broker(ABC):
+    """Worker-side view of the coordinator; one method per protocol message"""
+
+    @abstractmethod
+    async def register(self, hostname: str, capacity: int) -> Dict[str, Any]:
+        """Join the pool; returns the worker id and lease length"""
+
+    @abstractmethod
+    async def lease(self, worker_id: str, limit: int) -> List[RemoteLease]:
+        """Claim up to `limit` tasks"""
+
+    @abstractmethod
+    async def heartbeat(self, worker_id: str) -> int:
+        """Renew this worker's leases; returns how many are still held"""
+
+    @abstractmethod
+    async def complete(self, worker_id: str, results: List[Tuple[str, int, ScrapeResult]]) -> Dict[str, int]:
+        """Report (job id, task id, result) for finished tasks"""
+
+    @abstractmethod
+    async def release(self, worker_id: str, keys: List[TaskKey]):
+        """Return unfinished leases without counting an attempt"""
+
+    @abstractmethod
+    async def unregister(self, worker_id: str):
+        """Leave the pool, releasing any held leases"""
+
+    async def close(self):
+        pass
+
+
+class LocalBroker(Broker):
+    """In-process stand-in for the coordinator service"""
+
+    def __init__(self, coordinator: Coordinator):
+        self.coordinator = coordinator
+
+    async def register(self, hostname: str, capacity: int) -> Dict[str, Any]:
+        return await self.coordinator.register(hostname, capacity)
+
+    async def lease(self, worker_id: str, limit: int) -> List[RemoteLease]:
+        return await self.coordinator.lease(worker_id, limit)
+
+    async def heartbeat(self, worker_id: str) -> int:
+        return await self.coordinator.heartbeat(worker_id)
+
+    async def complete(self, worker_id: str, results: List[Tuple[str, int, ScrapeResult]]) -> Dict[str, int]:
+        return await self.coordinator.complete(worker_id, results)
+
+    async def release(self, worker_id: str, keys: List[TaskKey]):
+        await self.coordinator.release(worker_id, keys)
+
+    async def unregister(self, worker_id: str):
+        await self.coordinator.unregister(worker_id)
+
+
+class HttpBroker(Broker):
+    """Coordinator reached over the scraper API's /workers endpoints"""
+
+    def __init__(self, base_url: str, timeout_seconds: float = 30, transport: Optional[Any] = None):
+        import httpx
+        # transport lets tests drive the FastAPI app in-process (httpx.ASGITransport)
+        self._client = httpx.AsyncClient(base_url=base_url.rstrip('/'), timeout=timeout_seconds,
+                                         transport=transport)
+
+    async def _post(self, path: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        response = await self._client.post(path, json=payload or {})
+        if response.status_code == 404:
+            raise UnknownWorker(path)
+        response.raise_for_status()
+        return response.json()
+
+    async def register(self, hostname: str, capacity: int) -> Dict[str, Any]:
+        return await self._post('/workers/register', {'hostname': hostname, 'capacity': capacity})
+
+    async def lease(self, worker_id: str, limit: int) -> List[RemoteLease]:
+        reply = await self._post(f'/workers/{worker_id}/lease', {'limit': limit})
+        return [
+            RemoteLease(item['job_id'], item['task_id'], target_from_dict(item['target']))
+            for item in reply['leases']
+        ]
+
+    async def heartbeat(self, worker_id: str) -> int:
+        return (await self._post(f'/workers/{worker_id}/heartbeat'))['extended']
+
+    async def complete(self, worker_id: str, results: List[Tuple[str, int, ScrapeResult]]) -> Dict[str, int]:
+        return await self._post(f'/workers/{worker_id}/results', {
+            'results': [
+                {'job_id': job_id, 'task_id': task_id, 'result': result_to_wire(result)}
+                for job_id, task_id, result in results
+            ]
+        })
+
+    async def release(self, worker_id: str, keys: List[TaskKey]):
+        await self._post(f'/workers/{worker_id}/release', {
+            'leases': [{'job_id': job_id, 'task_id': task_id} for job_id, task_id in keys]
+        })
+
+    async def unregister(self, worker_id: str):
+        response = await self._client.delete(f'/workers/{worker_id}')
+        if response.status_code != 404:
+            response.raise_for_status()
+
+    async def close(self):
+        await self._client.aclose()
+
+
+class RemoteWorker:
+    """
+    Lease targets from a broker, scrape them on a local orchestrator and
+    send results back in batches.
+    """
+
+    def __init__(self, broker: Broker, orchestrator: ScraperOrchestrator,
+                 capacity: Optional[int] = None, batch_size: int = 50,
+                 flush_interval_s: float = 1.0, poll_interval_s: float = 2.0,
+                 max_poll_interval_s: float = 30.0):
+        self.broker = broker
+        self.orchestrator = orchestrator
+        self.capacity = capacity or orchestrator._in_flight_limit()
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self.poll_interval_s = poll_interval_s
+        self.max_poll_interval_s = max_poll_interval_s
+        self.hostname = socket.gethostname()
+        self.worker_id: Optional[str] = None
+        self.lease_seconds = 120.0
+        self.results_sent = 0
+        self._stopping = False
+
+    async def _register(self):
+        reply = await self.broker.register(self.hostname, self.capacity)
+        self.worker_id = reply['worker_id']
+        self.lease_seconds = reply['lease_seconds']
+        logger.info(f"Registered as {self.worker_id}")
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await self.broker.heartbeat(self.worker_id)
+            except UnknownWorker:
+                # Leases held under the old id are lost; finish them anyway as stale
+                await self._register()
+            except Exception as e:
+                logger.warning(f"Heartbeat failed: {e}")
+
+    def stop(self):
+        """Finish in-flight targets, send their results and exit run()"""
+        self._stopping = True
+
+    async def run(self, exit_when_idle: bool = False):
+        """
+        Work until stop() is called, or until the coordinator has nothing left
+        when exit_when_idle is set.
+        """
+        await self._register()
+        heartbeat = asyncio.ensure_future(self._heartbeat())
+        in_flight: Dict[asyncio.Future, RemoteLease] = {}
+        pending: List[Tuple[str, int, ScrapeResult]] = []
+        last_flush = time.monotonic()
+        next_lease_at = 0.0
+        poll_delay = self.poll_interval_s
+
+        try:
+            while True:
+                room = self.capacity - len(in_flight)
+                if room > 0 and not self._stopping and time.monotonic() >= next_lease_at:
+                    try:
+                        leases = await self.broker.lease(self.worker_id, room)
+                    except UnknownWorker:
+                        await self._register()
+                        continue
+                    except Exception as e:
+                        logger.warning(f"Lease request failed: {e}")
+                        leases = []
+
+                    for lease in leases:
+                        in_flight[asyncio.ensure_future(self.orchestrator.scrape(lease.target))] = lease
+                    if leases:
+                        poll_delay = self.poll_interval_s
+                    else:
+                        if exit_when_idle and not in_flight:
+                            break
+                        next_lease_at = time.monotonic() + poll_delay
+                        poll_delay = min(poll_delay * 2, self.max_poll_interval_s)
+
+                if not in_flight:
+                    if self._stopping:
+                        break
+                    await asyncio.sleep(max(0.0, next_lease_at - time.monotonic()))
+                    continue
+
+                done, _ = await asyncio.wait(list(in_flight), timeout=self.flush_interval_s,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    pending.append(self._completed(task, in_flight.pop(task)))
+
+                if len(pending) >= self.batch_size or (
+                        pending and time.monotonic() - last_flush >= self.flush_interval_s):
+                    pending = await self._flush(pending)
+                    last_flush = time.monotonic()
+        finally:
+            heartbeat.cancel()
+            # Cancel unfinished scrapes and wait until they've returned their
+            # instances; scrapes that finished meanwhile are reported, not released
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+            unfinished = [lease.key for task, lease in in_flight.items() if task.cancelled()]
+            pending.extend(self._completed(task, lease) for task, lease in in_flight.items()
+                           if not task.cancelled())
+            try:
+                await self._flush(pending)
+                if unfinished:
+                    await self.broker.release(self.worker_id, unfinished)
+                await self.broker.unregister(self.worker_id)
+            except Exception as e:
+                logger.warning(f"Clean shutdown failed, leases will expire on the coordinator: {e}")
+
+        logger.info(f"Worker {self.worker_id} finished after {self.results_sent} results")
+
+    def _completed(self, task: asyncio.Future, lease: RemoteLease) -> Tuple[str, int, ScrapeResult]:
+        """Result entry for a finished scrape task"""
+        if task.exception() is not None:
+            result = self.orchestrator._error_result(lease.task_id, lease.target, task.exception())
+        else:
+            result = task.result()
+        return lease.job_id, lease.task_id, result
+
+    async def _flush(self, pending: List[Tuple[str, int, ScrapeResult]]) -> List[Tuple[str, int, ScrapeResult]]:
+        """Send buffered results; on failure keep them for the next flush"""
+        if not pending:
+            return pending
+        try:
+            reply = await self.broker.complete(self.worker_id, pending)
+        except UnknownWorker:
+            logger.warning(f"Coordinator forgot {self.worker_id}; dropping {len(pending)} stale results")
+            await self._register()
+            return []
+        except Exception as e:
+            logger.warning(f"Sending {len(pending)} results failed, will retry: {e}")
+            return pending
+
+        self.results_sent += reply['accepted']
+        if reply['stale']:
+            logger.info(f"{reply['stale']} results arrived after their lease moved to another worker")
+        return []
+
+
+async def _worker_main(args):
+    config = ScraperConfig(
+        max_instances=args.instances,
+        headless=True,
+        shared_browsers=args.shared_browsers
+    )
+    orchestrator = ScraperOrchestrator(config)
+    broker = HttpBroker(args.coordinator)
+    await orchestrator.start()
+    try:
+        worker = RemoteWorker(broker, orchestrator, capacity=args.capacity)
+        await worker.run(exit_when_idle=args.exit_when_idle)
+    finally:
+        await orchestrator.stop()
+        await broker.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Remote scrape worker")
+    parser.add_argument('--coordinator', default=os.getenv('SCRAPER_COORDINATOR_URL', 'http://localhost:8000'))
+    parser.add_argument('--instances', type=int, default=10)
+    parser.add_argument('--shared-browsers', type=int, default=0)
+    parser.add_argument('--capacity', type=int, default=None, help="Targets in flight (default: instances x 2)")
+    parser.add_argument('--exit-when-idle', action='store_true')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_worker_main(args))
+
+
+__all__ = [
+    'Coordinator',
+    'Broker',
+    'LocalBroker',
+    'HttpBroker',
+    'RemoteWorker',
+    'RemoteLease',
+    'UnknownWorker',
+    'result_to_wire',
+    'result_from_wire'
+]
+
+
+if __name__ == "__main__":
+    main()
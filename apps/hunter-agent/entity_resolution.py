@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+HUNTER ENTITY RESOLUTION
+========================
+Merges the same project reported by several sources into one lead
+
+Permits, Google Maps and county records name the same project slightly
+differently ("Lake Nona Medical Plaza LLC" at "6900 Tavistock Lakes
+Boulevard" vs "Lake Nona Medical Plz" at "6900 Tavistock Lakes Blvd").
+
+Pipeline:
+1. Normalize developer names (legal suffixes dropped), addresses (street
+   suffixes abbreviated, ZIP extracted) and coordinates
+2. Blocking: each lead is only compared with earlier leads sharing a
+   geohash cell, a numbered street or a rare name token in the same area
+   (coarse geohash cell or ZIP), so the work grows with block size instead of O(n^2)
+3. Pairwise scoring on name, developer, street and distance
+4. Union-find clustering, then one canonical lead per cluster with the
+   source records it was built from under `provenance`
+"""
+
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Hashable, List, Optional, Set, Tuple
+
+from geo import GeoGrid, coordinates, haversine_miles
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+_ZIP = re.compile(r"\b(\d{5})(?:-\d{4})?\b")
+
+LEGAL_SUFFIXES = frozenset({
+    "inc", "incorporated", "llc", "llp", "lp", "ltd", "limited", "co", "corp",
+    "corporation", "company", "plc", "pllc", "the"
+})
+
+STREET_ABBREVIATIONS = {
+    "street": "st", "avenue": "ave", "boulevard": "blvd", "drive": "dr", "road": "rd",
+    "lane": "ln", "court": "ct", "place": "pl", "parkway": "pkwy", "highway": "hwy",
+    "circle": "cir", "terrace": "ter", "trail": "trl", "square": "sq", "plaza": "plz",
+    "north": "n", "south": "s", "east": "e", "west": "w", "suite": "ste"
+}
+
+# Tokens too common in lead names to be useful as blocking keys
+STOP_TOKENS = frozenset({
+    "project", "construction", "new", "building", "center", "the", "of", "and", "at",
+    "phase", "commercial", "development", "expansion", "renovation"
+}) | frozenset(STREET_ABBREVIATIONS) | frozenset(STREET_ABBREVIATIONS.values())
+
+
+def tokens(value: Any) -> List[str]:
+    return _NON_WORD.sub(" ", str(value or "").lower()).split()
+
+
+def normalize_developer(value: Any) -> str:
+    """Developer name without punctuation, casing or legal suffixes"""
+    return " ".join(token for token in tokens(value) if token not in LEGAL_SUFFIXES)
+
+
+def normalize_address(value: Any) -> Tuple[str, Optional[str]]:
+    """(normalized street line, ZIP) from a free-form address"""
+    text = str(value or "")
+    zips = _ZIP.findall(text)
+    street = text.split(",")[0]
+    normalized = " ".join(STREET_ABBREVIATIONS.get(token, token) for token in tokens(street))
+    return normalized, (zips[-1] if zips else None)
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+@dataclass
+class MatchRules:
+    """Thresholds for deciding that two records describe the same project"""
+    geohash_precision: int = 6  # ~1.2 km cells for the same-site block
+    area_precision: int = 4  # ~39 km cells that scope name-token blocks
+    same_site_miles: float = 0.1  # Closer than this counts as the same site
+    nearby_miles: float = 1.5  # Name-driven matches must still be this close (or share a ZIP)
+    name_on_site: float = 0.4  # Name similarity needed at the same site / street
+    developer_on_site: float = 0.75  # ...or developer similarity
+    name_strong: float = 0.8  # Name similarity that matches without a shared site
+    developer_strong: float = 0.5
+    max_block_size: int = 200  # Larger blocks (very common keys) are not used for matching
+
+
+@dataclass(slots=True)
+class _Record:
+    """Normalized view of one input lead"""
+    index: int
+    name: FrozenSet[str]
+    developer: FrozenSet[str]
+    street: str
+    zip: Optional[str]
+    point: Optional[Tuple[float, float]]
+
+
+class _DisjointSet:
+    """Union-find with path halving"""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a: int, b: int):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            # Keep the earlier record as root so clusters are stable
+            if root_b < root_a:
+                root_a, root_b = root_b, root_a
+            self.parent[root_b] = root_a
+
+
+class EntityResolver:
+    """
+    Deduplicate leads across sources.
+
+    Usage:
+        resolver = EntityResolver()
+        canonical = resolver.resolve(raw_leads)
+        print(resolver.stats)
+    """
+
+    def __init__(self, rules: Optional[MatchRules] = None):
+        self.rules = rules or MatchRules()
+        self.stats: Dict[str, int] = {}
+        self._sites = GeoGrid(self.rules.geohash_precision)
+        self._areas = GeoGrid(self.rules.area_precision)
+
+    def _record(self, index: int, lead: Dict[str, Any]) -> _Record:
+        street, zip_code = normalize_address(lead.get("location"))
+        point = coordinates(lead)
+        return _Record(
+            index=index,
+            name=frozenset(tokens(lead.get("project_name"))),
+            developer=frozenset(normalize_developer(lead.get("developer")).split()),
+            street=street if any(char.isdigit() for char in street) else "",  # Only numbered streets identify a site
+            zip=zip_code,
+            point=point
+        )
+
+    def _keys(self, record: _Record, zipless_streets: Set[str]) -> List[Hashable]:
+        """
+        Blocking keys of a record.
+
+        Cells are taken over the whole box within matching distance, so two
+        records close enough to match always share a cell even across a cell
+        edge. Name tokens only block within an area (coarse geohash cell or
+        ZIP), since name-driven matches must be nearby anyway.
+        """
+        rules = self.rules
+        names = [token for token in record.name if token not in STOP_TOKENS and len(token) > 2]
+        keys: List[Hashable] = []
+
+        if record.point:
+            lat, lng = record.point
+            keys.extend(("g", cell) for cell in self._sites.cells_within(lat, lng, rules.same_site_miles))
+            for area in self._areas.cells_within(lat, lng, rules.nearby_miles):
+                keys.extend(("t", area, token) for token in names)
+        if record.zip:
+            keys.extend(("z", record.zip, token) for token in names)
+        if record.street:
+            keys.append(("s", record.street, record.zip))
+            # A street without a ZIP has to be compared with that street in every ZIP
+            if record.zip and record.street in zipless_streets:
+                keys.append(("s", record.street, None))
+        return keys
+
+    def _is_match(self, a: _Record, b: _Record) -> bool:
+        rules = self.rules
+        name = jaccard(a.name, b.name)
+        developer = jaccard(a.developer, b.developer)
+        if name < rules.name_on_site and developer < rules.developer_on_site:
+            return False  # Too different for any rule below
+        distance = haversine_miles(*a.point, *b.point) if a.point and b.point else None
+
+        same_site = (distance is not None and distance <= rules.same_site_miles) or (
+            a.street and a.street == b.street and (a.zip == b.zip or not a.zip or not b.zip)
+        )
+        if same_site and (name >= rules.name_on_site or developer >= rules.developer_on_site):
+            return True
+
+        nearby = (distance is not None and distance <= rules.nearby_miles) or (a.zip and a.zip == b.zip)
+        return bool(nearby) and name >= rules.name_strong and developer >= rules.developer_strong
+
+    def cluster(self, leads: List[Dict[str, Any]]) -> List[List[int]]:
+        """Indices of leads grouped by the real-world project they describe"""
+        records = [self._record(index, lead) for index, lead in enumerate(leads)]
+
+        zipless_streets = {record.street for record in records if record.street and not record.zip}
+
+        blocks: Dict[Hashable, List[int]] = defaultdict(list)
+        for record in records:
+            for key in self._keys(record, zipless_streets):
+                blocks[key].append(record.index)
+
+        clusters = _DisjointSet(len(records))
+        comparisons = 0
+        oversized = 0
+
+        for members in blocks.values():
+            if len(members) < 2:
+                continue
+            if len(members) > self.rules.max_block_size:
+                # Keys shared by this many records carry no identity
+                oversized += 1
+                continue
+            for position, index in enumerate(members):
+                record = records[index]
+                for other in members[:position]:
+                    if clusters.find(other) == clusters.find(index):
+                        continue
+                    comparisons += 1
+                    if self._is_match(record, records[other]):
+                        clusters.union(index, other)
+
+        groups: Dict[int, List[int]] = defaultdict(list)
+        for record in records:
+            groups[clusters.find(record.index)].append(record.index)
+
+        self.stats = {
+            'input': len(records),
+            'clusters': len(groups),
+            'merged': len(records) - len(groups),
+            'comparisons': comparisons,
+            'oversized_blocks': oversized
+        }
+        return list(groups.values())
+
+    def resolve(self, leads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """One canonical lead per cluster, in input order of each cluster's first record"""
+        groups = self.cluster(leads)
+        return [merge_cluster([leads[i] for i in group]) for group in groups]
+
+
+def merge_cluster(members: List[Dict[str, Any]], completeness: Optional[List[int]] = None) -> Dict[str, Any]:
+    """
+    Canonical lead from a cluster: the most complete record wins, gaps are
+    filled from the others, and every member is listed under `provenance`.
+    """
+    if len(members) == 1:
+        return members[0]
+
+    if completeness is None:
+        completeness = [sum(1 for value in member.values() if value not in (None, "", [], {})) for member in members]
+    order = sorted(range(len(members)), key=lambda i: (-completeness[i], i))
+    canonical = dict(members[order[0]])
+    for i in order[1:]:
+        for key, value in members[i].items():
+            if canonical.get(key) in (None, "") and value not in (None, ""):
+                canonical[key] = value
+
+    values = [m.get("project_value") for m in members if isinstance(m.get("project_value"), (int, float))]
+    if values and not isinstance(canonical.get("project_value"), (int, float)):
+        canonical["project_value"] = max(values)
+
+    canonical["provenance"] = [
+        {
+            "source": member.get("source") or "unknown",
+            "project_name": member.get("project_name"),
+            "developer": member.get("developer"),
+            "location": member.get("location")
+        }
+        for member in members
+    ]
+    canonical["sources"] = sorted({entry["source"] for entry in canonical["provenance"]})
+    return canonical
+
+
+def resolve_leads(leads: List[Dict[str, Any]],
+                  rules: Optional[MatchRules] = None) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """Convenience wrapper: (canonical leads, resolver stats)"""
+    resolver = EntityResolver(rules)
+    return resolver.resolve(leads), resolver.stats
+
+
+__all__ = [
+    'EntityResolver',
+    'MatchRules',
+    'merge_cluster',
+    'resolve_leads',
+    'normalize_developer',
+    'normalize_address'
+]
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+HUNTER GEO HELPERS
+==================
+Geohash cells and great-circle distance for lead coordinates
+"""
+
+import math
+from typing import List, Optional, Tuple
+
+EARTH_RADIUS_MILES = 3958.8
+EARTH_RADIUS_KM = 6371.0088
+MILES_PER_DEGREE = math.radians(1) * EARTH_RADIUS_MILES  # Along a meridian
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DECODE = {char: index for index, char in enumerate(_BASE32)}
+
+
+def geohash_encode(lat: float, lng: float, precision: int = 6) -> str:
+    """Geohash of a point; precision 6 is a ~1.2 x 0.6 km cell"""
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+
+    while len(chars) < precision:
+        if even:
+            mid = (lng_lo + lng_hi) / 2
+            if lng >= mid:
+                value = (value << 1) | 1
+                lng_lo = mid
+            else:
+                value <<= 1
+                lng_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                value = (value << 1) | 1
+                lat_lo = mid
+            else:
+                value <<= 1
+                lat_hi = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits = 0
+            value = 0
+
+    return "".join(chars)
+
+
+def geohash_bounds(cell: str) -> Tuple[float, float, float, float]:
+    """(lat_lo, lat_hi, lng_lo, lng_hi) of a geohash cell"""
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    even = True
+
+    for char in cell:
+        value = _DECODE[char]
+        for shift in range(4, -1, -1):
+            bit = (value >> shift) & 1
+            if even:
+                mid = (lng_lo + lng_hi) / 2
+                if bit:
+                    lng_lo = mid
+                else:
+                    lng_hi = mid
+            else:
+                mid = (lat_lo + lat_hi) / 2
+                if bit:
+                    lat_lo = mid
+                else:
+                    lat_hi = mid
+            even = not even
+
+    return lat_lo, lat_hi, lng_lo, lng_hi
+
+
+class GeoGrid:
+    """
+    Geohash cells at one precision as integer (row, col) pairs.
+
+    Same cells as geohash_encode, but adjacent cells differ by one in row
+    or col, so neighborhoods are arithmetic instead of string decoding.
+    Scale factors are computed once, which matters when gridding hundreds
+    of thousands of points.
+    """
+
+    def __init__(self, precision: int = 6):
+        self.precision = precision
+        lat_bits = 5 * precision // 2
+        lng_bits = 5 * precision - lat_bits
+        self.rows = 1 << lat_bits
+        self.cols = 1 << lng_bits
+        self._rows_per_degree = self.rows / 180.0
+        self._cols_per_degree = self.cols / 360.0
+
+    def cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        """(row, col) of the cell containing a point"""
+        row = int((lat + 90.0) * self._rows_per_degree)
+        col = int((lng + 180.0) * self._cols_per_degree)
+        return min(row, self.rows - 1), min(col, self.cols - 1)
+
+    def cells_within(self, lat: float, lng: float, miles: float) -> List[Tuple[int, int]]:
+        """Cells touched by the box of +/- `miles` around a point"""
+        d_lat = miles / MILES_PER_DEGREE
+        d_lng = d_lat / max(math.cos(math.radians(lat)), 1e-6)
+        row_lo, col_lo = self.cell(max(lat - d_lat, -90.0), max(lng - d_lng, -180.0))
+        row_hi, col_hi = self.cell(min(lat + d_lat, 90.0), min(lng + d_lng, 180.0))
+        if row_lo == row_hi and col_lo == col_hi:
+            return [(row_lo, col_lo)]
+        return [(row, col) for row in range(row_lo, row_hi + 1) for col in range(col_lo, col_hi + 1)]
+
+    def geohash(self, cell: Tuple[int, int]) -> str:
+        """Geohash string of a (row, col) cell"""
+        lat = (cell[0] + 0.5) / self._rows_per_degree - 90.0
+        lng = (cell[1] + 0.5) / self._cols_per_degree - 180.0
+        return geohash_encode(lat, lng, self.precision)
+
+
+def haversine_miles(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in miles"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.asin(min(1.0, math.sqrt(a)))
+
+
+def coordinates(lead: dict) -> Optional[Tuple[float, float]]:
+    """(lat, lng) of a lead, or None when missing or not numeric"""
+    try:
+        lat, lng = float(lead["lat"]), float(lead["lng"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        return None
+    return lat, lng
+
+
+__all__ = [
+    'geohash_encode',
+    'geohash_bounds',
+    'GeoGrid',
+    'haversine_miles',
+    'coordinates',
+    'EARTH_RADIUS_MILES'
+]
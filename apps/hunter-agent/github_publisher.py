@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""
+HUNTER GITHUB PUBLISHER
+=======================
+One GitHub issue per lead, created or updated only when the lead changed
+
+Every lead issue carries a hidden marker with the lead fingerprint and the
+digest of its tracked fields (see lead_index). Existing `[LEAD]` issues are
+listed once and cached locally by fingerprint; later runs only fetch issues
+updated since the last sync. Publishing then compares each lead against the
+cache and sends just the delta: new leads are created, changed leads have
+their issue edited, everything else is skipped.
+
+Requests go through the REST API with a pooled async client, a bounded
+number in flight, and pacing driven by GitHub's rate-limit headers
+(X-RateLimit-Remaining / X-RateLimit-Reset, Retry-After on secondary
+limits). The API base URL is configurable (GITHUB_API_URL), so the
+publisher can run against a local mock server.
+
+Creating an issue is not idempotent: a 5xx or a dropped connection may come
+after GitHub already created it. Before a create is retried, recently
+updated issues are searched for the lead's marker, so a retry never opens a
+duplicate.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from lead_index import lead_digest, lead_fingerprint
+from retry_policy import RetryPolicy
+
+logger = logging.getLogger('GitHubPublisher')
+
+DEFAULT_API_URL = "https://api.github.com"
+DEFAULT_REPO = "InfinityXOneSystems/construct-iq-360"
+LEAD_LABELS = ['lead', 'automated', 'orlando', 'needs-review']
+TITLE_PREFIX = "[LEAD]"
+
+_MARKER = re.compile(r"<!-- hunter-lead fingerprint=(\w+) digest=(\w+) -->")
+_NEXT_LINK = re.compile(r'<([^>]+)>;\s*rel="next"')
+_LAST_PAGE = re.compile(r'[?&]page=(\d+)[^>]*>;\s*rel="last"')
+
+
+def issue_title(lead: Dict[str, Any]) -> str:
+    return f"{TITLE_PREFIX} {lead.get('developer', 'Unknown')} - {lead.get('project_name', 'Project')}"
+
+
+def issue_body(lead: Dict[str, Any], fingerprint: str, digest: str) -> str:
+    value = lead.get('project_value', 0)
+    return f"""## 🎯 New Lead Discovered - Orlando, FL
+
+**Project:** {lead.get('project_name', 'N/A')}
+**Developer:** {lead.get('developer', 'N/A')}
+**Estimated Value:** ${value:,}
+**Location:** {lead.get('location', 'N/A')}
+**Contact:** {lead.get('contact', 'N/A')}
+**Type:** {lead.get('project_type', 'N/A')}
+
+**Coordinates:** {lead.get('lat', 'N/A')}, {lead.get('lng', 'N/A')}
+
+---
+
+**Discovered:** {lead.get('qualification_date', 'N/A')}
+**Source:** {lead.get('source', 'Automated Hunt')}
+**Status:** Qualified - Awaiting Review
+
+---
+
+*This lead was automatically discovered by the Hunter Agent.*
+
+<!-- hunter-lead fingerprint={fingerprint} digest={digest} -->
+"""
+
+
+@dataclass
+class CachedIssue:
+    """What the publisher knows about an existing lead issue"""
+    number: int
+    digest: Optional[str]  # None for issues created before the marker existed
+    state: str = "open"
+
+
+class IssueCache:
+    """
+    Lead issues by fingerprint, persisted as JSON next to the lead index.
+
+    Issues without a marker (published by older runs) are kept by title
+    until a publish run adopts them.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.issues: Dict[str, CachedIssue] = {}
+        self.legacy: Dict[str, int] = {}
+        self.synced_at: Optional[str] = None
+
+    @classmethod
+    def load(cls, path: Path) -> "IssueCache":
+        cache = cls(path)
+        try:
+            with open(path) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return cache
+        cache.issues = {fingerprint: CachedIssue(**entry) for fingerprint, entry in state.get("issues", {}).items()}
+        cache.legacy = state.get("legacy", {})
+        cache.synced_at = state.get("synced_at")
+        return cache
+
+    def observe(self, issue: Dict[str, Any]):
+        """Record an issue from the API"""
+        title = issue.get("title") or ""
+        if not title.startswith(TITLE_PREFIX) or "pull_request" in issue:
+            return
+        marker = _MARKER.search(issue.get("body") or "")
+        if marker:
+            self.issues[marker.group(1)] = CachedIssue(issue["number"], marker.group(2), issue.get("state", "open"))
+        else:
+            self.legacy[title] = issue["number"]
+
+    def save(self):
+        """Write atomically, one issue per line so daily commits diff cleanly"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        entries = ",".join(
+            f"\n  {json.dumps(fingerprint)}: {json.dumps(vars(self.issues[fingerprint]), sort_keys=True)}"
+            for fingerprint in sorted(self.issues)
+        )
+        with open(tmp, "w") as f:
+            f.write(f'{{"synced_at": {json.dumps(self.synced_at)},\n')
+            f.write(f' "legacy": {json.dumps(self.legacy, sort_keys=True)},\n')
+            f.write(f' "issues": {{{entries}\n }}\n}}\n')
+        os.replace(tmp, self.path)
+
+    def __len__(self) -> int:
+        return len(self.issues) + len(self.legacy)
+
+
+@dataclass
+class PublishReport:
+    """Outcome of one publish run"""
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    published: List[Dict[str, Any]] = field(default_factory=list)  # Issue created, updated or already current
+    failed: List[Dict[str, Any]] = field(default_factory=list)
+    requests: int = 0
+    rate_limit_waits: float = 0.0
+
+
+class GitHubError(Exception):
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class GitHubPublisher:
+    """
+    Delta publisher for lead issues.
+
+    Usage:
+        publisher = GitHubPublisher(token, cache=IssueCache.load(path))
+        await publisher.sync()
+        report = await publisher.publish(qualified_leads)
+        publisher.cache.save()
+        await publisher.close()
+    """
+
+    def __init__(self, token: str, cache: IssueCache, repo: str = DEFAULT_REPO,
+                 base_url: Optional[str] = None, labels: Optional[List[str]] = None,
+                 max_concurrency: int = 4, max_retries: int = 5, rate_limit_reserve: int = 10,
+                 secondary_wait_s: float = 60.0, timeout_seconds: float = 30,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.cache = cache
+        self.repo = repo
+        self.labels = labels or list(LEAD_LABELS)
+        self.max_retries = max_retries
+        self.rate_limit_reserve = rate_limit_reserve  # Requests kept back for other jobs sharing the token
+        self.secondary_wait_s = secondary_wait_s
+        self.retry_policy = RetryPolicy(base_delay_s=1.0, max_delay_s=30.0)
+        self.report = PublishReport()
+
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._remaining: Optional[int] = None
+        self._reset_at = 0.0
+        self._paused_until = 0.0
+        # transport lets tests point the publisher at an in-process mock server
+        self._client = httpx.AsyncClient(
+            base_url=(base_url or os.getenv("GITHUB_API_URL") or DEFAULT_API_URL).rstrip('/'),
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Accept": "application/vnd.github+json",
+                "X-GitHub-Api-Version": "2022-11-28"
+            },
+            timeout=timeout_seconds,
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
+            transport=transport
+        )
+
+    def _pause(self, until: float):
+        """Hold every request until `until` (wall clock); overlapping pauses are counted once"""
+        start = max(self._paused_until, time.time())
+        if until > start:
+            self.report.rate_limit_waits += until - start
+            logger.warning(f"GitHub rate limit: pausing requests for {until - time.time():.1f}s")
+            self._paused_until = until
+
+    async def _wait_for_budget(self):
+        """Sleep while the primary limit is (nearly) spent or a secondary limit is active"""
+        while True:
+            now = time.time()
+            if self._remaining is not None and self._remaining <= self.rate_limit_reserve and self._reset_at > now:
+                self._pause(self._reset_at)
+            if self._paused_until <= now:
+                return
+            await asyncio.sleep(self._paused_until - now)
+
+    def _observe_limits(self, response: httpx.Response):
+        remaining = response.headers.get("x-ratelimit-remaining")
+        reset = response.headers.get("x-ratelimit-reset")
+        if remaining is not None:
+            self._remaining = int(remaining)
+        if reset is not None:
+            self._reset_at = float(reset)
+
+    async def _request(self, method: str, path: str, idempotent: bool = True, **kwargs) -> httpx.Response:
+        """
+        One API call with bounded concurrency, rate-limit pacing and retries.
+        Non-idempotent calls are not retried after a server error or transport
+        failure (the request may have been applied); rate-limit rejections are
+        still waited out, since GitHub did not act on them.
+        """
+        for attempt in range(self.max_retries + 1):
+            async with self._slots:
+                await self._wait_for_budget()
+                if self._remaining is not None:
+                    self._remaining -= 1  # Claim budget before the response reports it
+                self.report.requests += 1
+                try:
+                    response = await self._client.request(method, path, **kwargs)
+                except httpx.TransportError as e:
+                    if attempt == self.max_retries or not idempotent:
+                        raise GitHubError(f"{method} {path}: {e}") from e
+                    await asyncio.sleep(self.retry_policy.backoff(attempt))
+                    continue
+                self._observe_limits(response)
+
+            if response.status_code < 400:
+                return response
+
+            if response.status_code in (403, 429) and (
+                "retry-after" in response.headers
+                or response.headers.get("x-ratelimit-remaining") == "0"
+                or "rate limit" in response.text.lower()
+            ):
+                retry_after = response.headers.get("retry-after")
+                if retry_after is not None:
+                    wait = float(retry_after)
+                elif response.headers.get("x-ratelimit-remaining") == "0":
+                    wait = max(self._reset_at - time.time(), 1.0)
+                else:
+                    # Secondary limit without a hint: GitHub asks for at least a minute
+                    wait = self.secondary_wait_s * (2 ** attempt)
+                self._pause(time.time() + wait)
+            elif response.status_code >= 500 and idempotent:
+                await asyncio.sleep(self.retry_policy.backoff(attempt))
+            else:
+                raise GitHubError(f"{method} {path}: {response.status_code} {response.text[:200]}",
+                                  response.status_code)
+
+        raise GitHubError(f"{method} {path}: gave up after {self.max_retries + 1} attempts",
+                          response.status_code)
+
+    async def sync(self, full: bool = False) -> int:
+        """
+        Refresh the cache from GitHub: everything on the first run (or with
+        full=True), otherwise only issues updated since the last sync.
+        Returns the number of issues seen.
+        """
+        started = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        params = {"labels": self.labels[0], "state": "all", "per_page": 100, "sort": "updated"}
+        if self.cache.synced_at and not full:
+            params["since"] = self.cache.synced_at
+
+        path = f"/repos/{self.repo}/issues"
+        first = await self._request("GET", path, params=params)
+        pages = [first]
+        last = _LAST_PAGE.search(first.headers.get("link", ""))
+        if last:
+            # Every page URL is known up front, so fetch the rest concurrently
+            pages.extend(await asyncio.gather(*(
+                self._request("GET", path, params={**params, "page": page})
+                for page in range(2, int(last.group(1)) + 1)
+            )))
+        else:
+            next_link = _NEXT_LINK.search(first.headers.get("link", ""))
+            while next_link:
+                pages.append(await self._request("GET", next_link.group(1)))
+                next_link = _NEXT_LINK.search(pages[-1].headers.get("link", ""))
+
+        seen = 0
+        for page in pages:
+            for issue in page.json():
+                self.cache.observe(issue)
+                seen += 1
+        self.cache.synced_at = started
+        return seen
+
+    async def _find_issue(self, fingerprint: str, since: str) -> Optional[Dict[str, Any]]:
+        """The lead issue with this fingerprint among issues updated since `since`, if any"""
+        response = await self._request("GET", f"/repos/{self.repo}/issues", params={
+            "labels": self.labels[0], "state": "all", "since": since,
+            "sort": "created", "direction": "desc", "per_page": 100
+        })
+        for issue in response.json():
+            marker = _MARKER.search(issue.get("body") or "")
+            if marker and marker.group(1) == fingerprint:
+                return issue
+        return None
+
+    async def _create_issue(self, payload: Dict[str, Any], fingerprint: str) -> Dict[str, Any]:
+        """POST a new issue, checking for one created by an earlier attempt before each retry"""
+        path = f"/repos/{self.repo}/issues"
+        for attempt in range(self.max_retries + 1):
+            # A minute of slack for clock skew between us and GitHub
+            since = (datetime.now(timezone.utc) - timedelta(minutes=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+            try:
+                response = await self._request("POST", path, idempotent=False, json=payload)
+                return response.json()
+            except GitHubError as e:
+                ambiguous = e.status is None or e.status >= 500
+                if not ambiguous or attempt == self.max_retries:
+                    raise
+                logger.warning(f"Create of {payload['title']} may have gone through ({e}), checking")
+
+            issue = await self._find_issue(fingerprint, since)
+            if issue is not None:
+                return issue
+            await asyncio.sleep(self.retry_policy.backoff(attempt))
+
+    async def _publish_one(self, lead: Dict[str, Any], fingerprint: str, digest: str):
+        title = issue_title(lead)
+        existing = self.cache.issues.get(fingerprint)
+        number = existing.number if existing else self.cache.legacy.get(title)
+        payload = {"title": title, "body": issue_body(lead, fingerprint, digest)}
+
+        try:
+            if number is None:
+                issue = await self._create_issue({**payload, "labels": self.labels}, fingerprint)
+                self.cache.issues[fingerprint] = CachedIssue(issue["number"], digest, issue.get("state", "open"))
+                self.report.created += 1
+                print(f"   ✅ Created issue #{issue['number']}: {title}")
+            else:
+                response = await self._request("PATCH", f"/repos/{self.repo}/issues/{number}", json=payload)
+                issue = response.json()
+                self.cache.issues[fingerprint] = CachedIssue(number, digest, issue.get("state", "open"))
+                self.cache.legacy.pop(title, None)
+                self.report.updated += 1
+                print(f"   ✏️  Updated issue #{number}: {title}")
+        except GitHubError as e:
+            logger.error(f"Could not publish {title}: {e}")
+            self.report.failed.append(lead)
+
+    def plan(self, leads: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], str, str]]:
+        """(lead, fingerprint, digest) for leads whose issue is missing or stale"""
+        pending = []
+        planned = set()
+        for lead in leads:
+            fingerprint, digest = lead_fingerprint(lead), lead_digest(lead)
+            existing = self.cache.issues.get(fingerprint)
+            if fingerprint in planned or (existing is not None and existing.digest == digest):
+                self.report.unchanged += 1
+                continue
+            planned.add(fingerprint)
+            pending.append((lead, fingerprint, digest))
+        return pending
+
+    async def publish(self, leads: List[Dict[str, Any]]) -> PublishReport:
+        """Create or update issues for the leads that need it"""
+        await asyncio.gather(*(
+            self._publish_one(lead, fingerprint, digest) for lead, fingerprint, digest in self.plan(leads)
+        ))
+        failed = {lead_fingerprint(lead) for lead in self.report.failed}
+        self.report.published = [lead for lead in leads if lead_fingerprint(lead) not in failed]
+        return self.report
+
+    async def close(self):
+        await self._client.aclose()
+
+
+async def publish_leads(leads: List[Dict[str, Any]], token: str, cache_path: Path,
+                        full_sync: bool = False, **options) -> PublishReport:
+    """Sync, publish the delta and save the cache; the publisher's options pass through"""
+    publisher = GitHubPublisher(token, IssueCache.load(cache_path), **options)
+    try:
+        try:
+            await publisher.sync(full=full_sync)
+        except GitHubError as e:
+            # Without a fresh listing, unknown leads would be duplicated; publish nothing
+            logger.error(f"Issue sync failed: {e}")
+            publisher.report.failed = list(leads)
+            return publisher.report
+        await publisher.publish(leads)
+        return publisher.report
+    finally:
+        publisher.cache.save()
+        await publisher.close()
+
+
+__all__ = [
+    'GitHubPublisher',
+    'IssueCache',
+    'CachedIssue',
+    'PublishReport',
+    'GitHubError',
+    'publish_leads',
+    'issue_title',
+    'issue_body'
+]
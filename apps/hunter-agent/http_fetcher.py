@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+SHADOW HTTP FAST PATH
+=====================
+Browserless fetch tier for server-rendered HTML and JSON endpoints
+
+A pooled async HTTP client (keep-alive, HTTP/2 when `h2` is installed)
+fetches the target and runs the same selectors with lxml or dotted JSON
+paths. The orchestrator falls back to a browser page when the target is
+marked requires_js, the response isn't HTML/JSON, or nothing was found.
+"""
+
+import json
+import logging
+import random
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from change_cache import document_hash
+from extraction import extract_html, extract_json, found_anything
+
+logger = logging.getLogger('HttpFetcher')
+
+try:
+    import httpx
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
+
+@dataclass
+class FetchOutcome:
+    """Result of a fast-path attempt"""
+    status: int
+    data: Any = None
+    retry_after: Optional[str] = None
+    found: bool = False  # False means the caller should fall back to the browser
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    document_hash: Optional[str] = None
+    same_document: bool = False  # Body hashes like known_document: nothing was extracted
+
+
+class HttpFetcher:
+    """Shared async HTTP client used before (or instead of) a browser page"""
+
+    def __init__(self, config, user_agents: List[str]):
+        self.config = config
+        self.user_agents = user_agents
+        self._client = httpx.AsyncClient(
+            http2=HAS_HTTP2,
+            timeout=config.timeout_seconds,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=config.http_max_connections,
+                max_keepalive_connections=config.http_max_connections
+            ),
+            headers={'Accept': 'text/html,application/xhtml+xml,application/json;q=0.9,*/*;q=0.5'}
+        )
+
+    async def fetch(self, url: str, selectors: Dict[str, str],
+                    row_selector: Optional[str] = None,
+                    conditional: Optional[Dict[str, str]] = None,
+                    known_document: Optional[str] = None) -> FetchOutcome:
+        """
+        Fetch a URL and extract from the body; network errors propagate.
+        With conditional headers a 304 comes back as status 304 and no data.
+        A body whose hash equals known_document is not parsed at all
+        (same_document is set and data stays None).
+        """
+        headers = dict(conditional or {})
+        if self.config.user_agent_rotation:
+            headers['User-Agent'] = random.choice(self.user_agents)
+
+        response = await self._client.get(url, headers=headers)
+        outcome = FetchOutcome(
+            status=response.status_code,
+            retry_after=response.headers.get('retry-after'),
+            etag=response.headers.get('etag'),
+            last_modified=response.headers.get('last-modified')
+        )
+        if response.status_code == 304 or response.status_code >= 400:
+            return outcome
+
+        outcome.document_hash = document_hash(response.content)
+        if known_document is not None and outcome.document_hash == known_document:
+            outcome.same_document = True
+            return outcome
+
+        content_type = response.headers.get('content-type', '').split(';')[0].strip().lower()
+        if content_type == 'application/json' or content_type.endswith('+json'):
+            try:
+                outcome.data = extract_json(json.loads(response.content), selectors, row_selector)
+            except ValueError:
+                return outcome
+        elif content_type in ('text/html', 'application/xhtml+xml', ''):
+            outcome.data = extract_html(response.text, str(response.url), selectors, row_selector)
+        else:
+            return outcome
+
+        # With no selectors, a successful fetch is all the target asked for
+        outcome.found = not selectors or found_anything(outcome.data)
+        return outcome
+
+    async def close(self):
+        await self._client.aclose()
+
+
+__all__ = [
+    'HttpFetcher',
+    'FetchOutcome',
+    'HAS_HTTPX'
+]
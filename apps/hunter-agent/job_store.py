@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+SHADOW JOB STORE
+================
+Bounded, persistent storage for scrape job progress and results
+
+Backends:
+- SQLiteJobStore: on-disk (default), survives restarts
+- MemoryJobStore: process-local, for development and tests
+
+Both evict finished jobs by age (TTL) and by total stored size, and keep
+decoded results in memory only for a small LRU of hot jobs, bounded by job
+count and by encoded size; a job that outgrows the budget is served from
+the backend. Results appended
+with a work-queue task_id are stored once per task, so at-least-once
+redelivery doesn't duplicate them.
+"""
+
+import json
+import logging
+import sqlite3
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from scraper_orchestrator import ScrapeResult
+
+logger = logging.getLogger('JobStore')
+
+ACTIVE_STATUSES = ("queued", "running")
+COMPRESS_THRESHOLD = 512  # Payloads smaller than this are stored as plain JSON
+
+
+def encode_result(result: ScrapeResult) -> bytes:
+    """Compact serialization: positional JSON array, zlib'd when large"""
+    raw = json.dumps([
+        result.target_id,
+        result.url,
+        result.success,
+        result.data,
+        result.error,
+        result.items_extracted,
+        round(result.execution_time_ms, 3),
+        result.timestamp.isoformat(),
+        result.unchanged
+    ], separators=(',', ':'), default=str).encode()
+    if len(raw) >= COMPRESS_THRESHOLD:
+        return b'z' + zlib.compress(raw, 6)
+    return b'j' + raw
+
+
+def decode_result(payload: bytes) -> ScrapeResult:
+    """Inverse of encode_result"""
+    raw = zlib.decompress(payload[1:]) if payload[:1] == b'z' else payload[1:]
+    # Rows written before change detection have no trailing `unchanged` flag
+    target_id, url, success, data, error, items, elapsed, timestamp, *rest = json.loads(raw)
+    return ScrapeResult(
+        target_id=target_id,
+        url=url,
+        success=success,
+        data=data,
+        error=error,
+        items_extracted=items,
+        execution_time_ms=elapsed,
+        timestamp=datetime.fromisoformat(timestamp),
+        unchanged=bool(rest and rest[0])
+    )
+
+
+class JobStore(ABC):
+    """
+    Interface shared by all job store backends.
+    Job metadata is a dict with status, total, successful, failed,
+    submitted_at and finished_at.
+    """
+
+    def __init__(self, ttl_hours: float = 24, max_bytes: int = 512 * 1024 * 1024,
+                 hot_jobs: int = 8, hot_bytes: int = 32 * 1024 * 1024):
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_bytes = max_bytes
+        self.hot_jobs = hot_jobs
+        self.hot_bytes = hot_bytes
+        self._hot: "OrderedDict[str, List[ScrapeResult]]" = OrderedDict()
+        self._hot_sizes: Dict[str, int] = {}  # Encoded bytes of each hot job's results
+        self._hot_total = 0
+
+    @abstractmethod
+    def create_job(self, job_id: str, total: int) -> Dict[str, Any]:
+        """Register a queued job expecting `total` results"""
+
+    @abstractmethod
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job metadata, or None once the job is unknown or evicted"""
+
+    @abstractmethod
+    def update_job(self, job_id: str, **fields):
+        """Set status and/or finished_at"""
+
+    @abstractmethod
+    def append_result(self, job_id: str, result: ScrapeResult, task_id: Optional[int] = None) -> bool:
+        """Store a result; returns False if the job is gone or task_id was already stored"""
+
+    @abstractmethod
+    def result_count(self, job_id: str) -> int:
+        """Results stored so far"""
+
+    @abstractmethod
+    def get_results(self, job_id: str, cursor: int = 0, limit: int = 100) -> List[ScrapeResult]:
+        """Up to `limit` results from position `cursor`, in arrival order"""
+
+    @abstractmethod
+    def delete_job(self, job_id: str):
+        """Drop a job and its results"""
+
+    @abstractmethod
+    def evict(self) -> int:
+        """Drop expired or over-budget finished jobs; returns how many were removed"""
+
+    def close(self):
+        """Release backend resources"""
+
+    # Hot-job LRU shared by the backends
+
+    def _touch(self, job_id: str) -> List[ScrapeResult]:
+        """Mark a job hot, evicting the least recently used one from memory"""
+        if job_id in self._hot:
+            self._hot.move_to_end(job_id)
+        else:
+            self._hot[job_id] = []
+            self._hot_sizes[job_id] = 0
+            while len(self._hot) > self.hot_jobs:
+                self._forget_hot(next(iter(self._hot)))
+        return self._hot[job_id]
+
+    def _cache_result(self, job_id: str, result: ScrapeResult, size: int):
+        """Keep a new result of a hot job in memory, within the hot_bytes budget"""
+        if job_id not in self._hot:
+            return
+        self._touch(job_id).append(result)
+        self._hot_sizes[job_id] += size
+        self._hot_total += size
+        # Least recently used first; a job that alone exceeds the budget goes cold too
+        while self._hot_total > self.hot_bytes and self._hot:
+            self._forget_hot(next(iter(self._hot)))
+
+    def _forget_hot(self, job_id: str):
+        """Drop a job's decoded results; reads then go to the backend"""
+        if self._hot.pop(job_id, None) is not None:
+            self._hot_total -= self._hot_sizes.pop(job_id)
+
+
+class SQLiteJobStore(JobStore):
+    """Job store persisted to a single SQLite file (WAL mode)"""
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                total INTEGER NOT NULL,
+                successful INTEGER NOT NULL DEFAULT 0,
+                failed INTEGER NOT NULL DEFAULT 0,
+                bytes INTEGER NOT NULL DEFAULT 0,
+                submitted_at TEXT NOT NULL,
+                finished_at TEXT,
+                updated REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS results (
+                job_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                payload BLOB NOT NULL,
+                task_id INTEGER,
+                PRIMARY KEY (job_id, position)
+            ) WITHOUT ROWID;
+        """)
+        # Stores created before results were keyed by task
+        if "task_id" not in {row[1] for row in self._db.execute("PRAGMA table_info(results)")}:
+            self._db.execute("ALTER TABLE results ADD COLUMN task_id INTEGER")
+        self._db.execute("CREATE UNIQUE INDEX IF NOT EXISTS results_by_task ON results (job_id, task_id)")
+        # Jobs that were in flight when the previous process died can't finish now
+        self._db.execute(
+            "UPDATE jobs SET status = 'interrupted', finished_at = ? WHERE status IN (?, ?)",
+            (datetime.utcnow().isoformat(), *ACTIVE_STATUSES)
+        )
+        self.evict()
+
+    def create_job(self, job_id: str, total: int) -> Dict[str, Any]:
+        self.evict()
+        now = datetime.utcnow().isoformat()
+        self._db.execute(
+            "INSERT INTO jobs (job_id, status, total, submitted_at, updated) VALUES (?, 'queued', ?, ?, ?)",
+            (job_id, total, now, time.time())
+        )
+        self._touch(job_id)
+        return self.get_job(job_id)
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._db.execute(
+            "SELECT status, total, successful, failed, submitted_at, finished_at FROM jobs WHERE job_id = ?",
+            (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        status, total, successful, failed, submitted_at, finished_at = row
+        return {
+            "status": status,
+            "total": total,
+            "successful": successful,
+            "failed": failed,
+            "submitted_at": submitted_at,
+            "finished_at": finished_at
+        }
+
+    def update_job(self, job_id: str, **fields):
+        allowed = {"status", "finished_at"}
+        columns = [name for name in fields if name in allowed]
+        if not columns:
+            return
+        assignments = ", ".join(f"{name} = ?" for name in columns)
+        self._db.execute(
+            f"UPDATE jobs SET {assignments}, updated = ? WHERE job_id = ?",
+            (*[fields[name] for name in columns], time.time(), job_id)
+        )
+
+    def append_result(self, job_id: str, result: ScrapeResult, task_id: Optional[int] = None) -> bool:
+        payload = encode_result(result)
+        counter = "successful" if result.success else "failed"
+        self._db.execute("BEGIN")
+        try:
+            row = self._db.execute(
+                "SELECT successful + failed FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                self._db.execute("ROLLBACK")
+                logger.warning(f"Dropping result for unknown or evicted job {job_id}")
+                return False
+            if task_id is not None and self._db.execute(
+                "SELECT 1 FROM results WHERE job_id = ? AND task_id = ?", (job_id, task_id)
+            ).fetchone():
+                self._db.execute("ROLLBACK")
+                return False
+            position = row[0]
+            self._db.execute(
+                "INSERT INTO results (job_id, position, payload, task_id) VALUES (?, ?, ?, ?)",
+                (job_id, position, payload, task_id)
+            )
+            self._db.execute(
+                f"UPDATE jobs SET {counter} = {counter} + 1, bytes = bytes + ?, updated = ? WHERE job_id = ?",
+                (len(payload), time.time(), job_id)
+            )
+            self._db.execute("COMMIT")
+        except Exception:
+            self._db.execute("ROLLBACK")
+            raise
+
+        self._cache_result(job_id, result, len(payload))
+        return True
+
+    def result_count(self, job_id: str) -> int:
+        row = self._db.execute(
+            "SELECT successful + failed FROM jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_results(self, job_id: str, cursor: int = 0, limit: int = 100) -> List[ScrapeResult]:
+        hot = self._hot.get(job_id)
+        if hot is not None and len(hot) == self.result_count(job_id):
+            self._hot.move_to_end(job_id)
+            return hot[cursor:cursor + limit]
+
+        rows = self._db.execute(
+            "SELECT payload FROM results WHERE job_id = ? AND position >= ? ORDER BY position LIMIT ?",
+            (job_id, cursor, limit)
+        ).fetchall()
+        return [decode_result(payload) for (payload,) in rows]
+
+    def delete_job(self, job_id: str):
+        self._db.execute("BEGIN")
+        self._db.execute("DELETE FROM results WHERE job_id = ?", (job_id,))
+        self._db.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+        self._db.execute("COMMIT")
+        self._forget_hot(job_id)
+
+    def evict(self) -> int:
+        placeholders = ", ".join("?" for _ in ACTIVE_STATUSES)
+        finished = self._db.execute(
+            f"SELECT job_id, bytes, updated FROM jobs WHERE status NOT IN ({placeholders}) ORDER BY updated",
+            ACTIVE_STATUSES
+        ).fetchall()
+        total_bytes = self._db.execute("SELECT COALESCE(SUM(bytes), 0) FROM jobs").fetchone()[0]
+
+        cutoff = time.time() - self.ttl_seconds
+        evicted = 0
+        for job_id, size, updated in finished:
+            if updated >= cutoff and total_bytes <= self.max_bytes:
+                break
+            self.delete_job(job_id)
+            total_bytes -= size
+            evicted += 1
+
+        if evicted:
+            logger.info(f"Evicted {evicted} finished jobs")
+        return evicted
+
+    def close(self):
+        self._db.close()
+
+
+class MemoryJobStore(JobStore):
+    """Process-local job store with the same bounds as the SQLite backend"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._results: Dict[str, List[bytes]] = {}
+        self._task_ids: Dict[str, Set[int]] = {}
+
+    def create_job(self, job_id: str, total: int) -> Dict[str, Any]:
+        self.evict()
+        self._jobs[job_id] = {
+            "status": "queued",
+            "total": total,
+            "successful": 0,
+            "failed": 0,
+            "submitted_at": datetime.utcnow().isoformat(),
+            "finished_at": None,
+            "bytes": 0,
+            "updated": time.time()
+        }
+        self._results[job_id] = []
+        self._task_ids[job_id] = set()
+        self._touch(job_id)
+        return self.get_job(job_id)
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        return {key: value for key, value in job.items() if key not in ("bytes", "updated")}
+
+    def update_job(self, job_id: str, **fields):
+        job = self._jobs.get(job_id)
+        if job is None:
+            logger.warning(f"Ignoring update for unknown or evicted job {job_id}")
+            return
+        for name in ("status", "finished_at"):
+            if name in fields:
+                job[name] = fields[name]
+        job["updated"] = time.time()
+
+    def append_result(self, job_id: str, result: ScrapeResult, task_id: Optional[int] = None) -> bool:
+        job = self._jobs.get(job_id)
+        if job is None:
+            logger.warning(f"Dropping result for unknown or evicted job {job_id}")
+            return False
+        if task_id is not None:
+            if task_id in self._task_ids[job_id]:
+                return False
+            self._task_ids[job_id].add(task_id)
+        payload = encode_result(result)
+        self._results[job_id].append(payload)
+        job["successful" if result.success else "failed"] += 1
+        job["bytes"] += len(payload)
+        job["updated"] = time.time()
+        self._cache_result(job_id, result, len(payload))
+        return True
+
+    def result_count(self, job_id: str) -> int:
+        return len(self._results.get(job_id, ()))
+
+    def get_results(self, job_id: str, cursor: int = 0, limit: int = 100) -> List[ScrapeResult]:
+        hot = self._hot.get(job_id)
+        if hot is not None and len(hot) == self.result_count(job_id):
+            self._hot.move_to_end(job_id)
+            return hot[cursor:cursor + limit]
+        return [decode_result(p) for p in self._results.get(job_id, [])[cursor:cursor + limit]]
+
+    def delete_job(self, job_id: str):
+        self._jobs.pop(job_id, None)
+        self._results.pop(job_id, None)
+        self._task_ids.pop(job_id, None)
+        self._forget_hot(job_id)
+
+    def evict(self) -> int:
+        cutoff = time.time() - self.ttl_seconds
+        total_bytes = sum(job["bytes"] for job in self._jobs.values())
+        finished = sorted(
+            (job["updated"], job_id) for job_id, job in self._jobs.items()
+            if job["status"] not in ACTIVE_STATUSES
+        )
+
+        evicted = 0
+        for updated, job_id in finished:
+            if updated >= cutoff and total_bytes <= self.max_bytes:
+                break
+            total_bytes -= self._jobs[job_id]["bytes"]
+            self.delete_job(job_id)
+            evicted += 1
+        return evicted
+
+
+__all__ = [
+    'JobStore',
+    'SQLiteJobStore',
+    'MemoryJobStore',
+    'encode_result',
+    'decode_result'
+]
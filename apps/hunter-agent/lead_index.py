@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+HUNTER LEAD INDEX
+=================
+Persistent record of every lead the hunter has already processed
+
+Each lead gets a stable fingerprint from its developer, location and
+project name (normalized, so punctuation and casing don't matter) and a
+digest of the fields that make it worth re-publishing when they change.
+A run only qualifies, saves and publishes leads whose fingerprint is new
+or whose digest moved. Per-source watermarks record the newest permit
+date and the last run that produced a delta.
+
+A lead counts as seen only once its issue is published, so an unpublished
+lead is qualified again next run. The digest of the version last written
+to the lead store is kept separately, so those retries don't append the
+same lead to the store again.
+
+The index is a small JSON file under data/ so the daily GitHub Actions
+run can commit it next to the raw leads.
+"""
+
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Fields whose change makes a known lead worth processing again
+TRACKED_FIELDS = ("project_value", "contact", "project_type", "lat", "lng")
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(value: Any) -> str:
+    """Lowercase alphanumeric tokens separated by single spaces"""
+    return _NON_WORD.sub(" ", str(value or "").lower()).strip()
+
+
+def lead_fingerprint(lead: Dict[str, Any]) -> str:
+    """Stable identity of a lead across runs and sources"""
+    key = "|".join(normalize(lead.get(name)) for name in ("developer", "location", "project_name"))
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+
+def lead_digest(lead: Dict[str, Any]) -> str:
+    """Hash of the tracked fields; changes when a known lead is updated"""
+    tracked = {name: lead.get(name) for name in TRACKED_FIELDS}
+    return hashlib.sha1(json.dumps(tracked, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def lead_source(lead: Dict[str, Any]) -> str:
+    return lead.get("source") or "unknown"
+
+
+class LeadIndex:
+    """
+    Seen-lead index and per-source watermarks.
+
+    Usage:
+        index = LeadIndex.load(repo_root / "data" / "lead-index" / "seen-leads.json")
+        new, changed, unchanged = index.partition(raw_leads)
+        ...
+        index.mark(new + changed)
+        index.save()
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Path, leads: Optional[Dict[str, Dict[str, Any]]] = None,
+                 watermarks: Optional[Dict[str, Dict[str, Any]]] = None,
+                 stored: Optional[Dict[str, str]] = None):
+        self.path = Path(path)
+        self.leads = leads or {}
+        self.watermarks = watermarks or {}
+        self.stored = stored or {}  # Fingerprint -> digest of the version in the lead store
+
+    @classmethod
+    def load(cls, path: Path) -> "LeadIndex":
+        """Read the index, starting empty when the file doesn't exist yet"""
+        try:
+            with open(path) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return cls(path)
+        return cls(path, state.get("leads", {}), state.get("watermarks", {}), state.get("stored", {}))
+
+    def partition(self, leads: List[Dict[str, Any]]) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+        """Split leads into (new, changed, unchanged); duplicates within the batch are dropped"""
+        new, changed, unchanged = [], [], []
+        batch = set()
+
+        for lead in leads:
+            fingerprint = lead_fingerprint(lead)
+            if fingerprint in batch:
+                continue
+            batch.add(fingerprint)
+
+            seen = self.leads.get(fingerprint)
+            if seen is None:
+                new.append(lead)
+            elif seen["digest"] != lead_digest(lead):
+                changed.append(lead)
+            else:
+                unchanged.append(lead)
+
+        return new, changed, unchanged
+
+    def mark(self, leads: List[Dict[str, Any]], when: Optional[datetime] = None):
+        """Record processed leads and advance their sources' watermarks"""
+        stamp = (when or datetime.utcnow()).strftime("%Y-%m-%d %H:%M:%S UTC")
+
+        for lead in leads:
+            fingerprint = lead_fingerprint(lead)
+            entry = self.leads.setdefault(fingerprint, {"first_seen": stamp, "source": lead_source(lead)})
+            entry["digest"] = lead_digest(lead)
+            entry["updated"] = stamp
+            entry["qualified"] = bool(lead.get("qualified"))
+
+            watermark = self.watermarks.setdefault(lead_source(lead), {"newest_permit_date": None})
+            watermark["last_delta_run"] = stamp
+            permit_date = lead.get("permit_date")
+            if permit_date and (watermark["newest_permit_date"] or "") < permit_date:
+                watermark["newest_permit_date"] = permit_date
+
+    def seed(self, daily_files: List[Path]) -> int:
+        """Bootstrap an empty index from existing data/raw-leads/*.json files"""
+        for daily_file in daily_files:
+            with open(daily_file) as f:
+                self.mark(json.load(f).get("leads", []))
+        return len(self.leads)
+
+    def unstored(self, leads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Leads whose current version has not been written to the lead store yet"""
+        return [lead for lead in leads if self.stored.get(lead_fingerprint(lead)) != lead_digest(lead)]
+
+    def mark_stored(self, leads: List[Dict[str, Any]]):
+        """Record that these versions are in the lead store"""
+        for lead in leads:
+            self.stored[lead_fingerprint(lead)] = lead_digest(lead)
+
+    def save(self):
+        """Write atomically, one lead per line so daily commits diff cleanly"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        entries = ",".join(
+            f"\n  {json.dumps(fingerprint)}: {json.dumps(self.leads[fingerprint], sort_keys=True)}"
+            for fingerprint in sorted(self.leads)
+        )
+        with open(tmp, "w") as f:
+            f.write(f'{{"version": {self.VERSION},\n')
+            f.write(f' "watermarks": {json.dumps(self.watermarks, sort_keys=True)},\n')
+            f.write(f' "stored": {json.dumps(self.stored, sort_keys=True)},\n')
+            f.write(f' "leads": {{{entries}\n }}\n}}\n')
+        os.replace(tmp, self.path)
+
+    def __len__(self) -> int:
+        return len(self.leads)
+
+
+__all__ = [
+    'LeadIndex',
+    'lead_fingerprint',
+    'lead_digest',
+    'normalize'
+]
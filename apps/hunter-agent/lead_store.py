@@ -0,0 +1,519 @@
+#!/usr/bin/env python3
+"""
+HUNTER LEAD STORE
+=================
+Date-partitioned columnar storage for leads
+
+Layout under data/lead-store/:
+
+    manifest.json                     schema + every segment with its stats
+    date=2026-02-19/part-00000.npz    one compressed array per column
+
+Every append writes a new segment into the day's partition and updates
+the manifest, so existing files are never rewritten. Columns are typed:
+numbers, dates and flags as NumPy arrays (a non-numeric value becomes
+missing), low-cardinality strings dictionary encoded, free text as one
+UTF-8 blob plus offsets. Fields outside the schema travel in a JSON
+`_extra` column, so a lead reads back whole.
+
+Reads open only the columns they need (projection). Filters are pushed
+down twice: the manifest's per-segment min/max and category sets skip
+partitions and segments without opening them, and the remaining rows are
+filtered with vector ops before any lead dict is built.
+
+Usage:
+    python lead_store.py import data/raw-leads/*.json
+    python lead_store.py scan --where "project_value>=1000000" --columns project_name,project_value
+"""
+
+import argparse
+import json
+import os
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from lead_index import lead_fingerprint
+
+# Column name -> type: float | date | category | string | bool
+SCHEMA = {
+    "fingerprint": "string",
+    "project_name": "string",
+    "developer": "string",
+    "location": "string",
+    "contact": "string",
+    "project_type": "category",
+    "source": "category",
+    "metro": "category",
+    "county": "category",
+    "project_value": "float",
+    "lat": "float",
+    "lng": "float",
+    "permit_date": "date",
+    "qualified": "bool",
+    "qualification_date": "string",
+    "min_value_check": "string",
+    "_extra": "string"
+}
+PARTITION_COLUMN = "date"  # Virtual column: the partition a row was appended to
+EXTRA_COLUMN = "_extra"
+
+OPERATORS = ("==", "!=", ">=", "<=", ">", "<", "in", "between")
+_PREDICATE = re.compile(r"^\s*(\w+)\s*(==|!=|>=|<=|>|<)\s*(.+?)\s*$")
+
+Predicate = Tuple[str, str, Any]
+
+
+def _to_date(value: Any) -> np.datetime64:
+    try:
+        return np.datetime64(str(value)[:10], "D")
+    except ValueError:
+        return np.datetime64("NaT")
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in ("true", "1", "yes"):
+            return True
+        if text in ("false", "0", "no", ""):
+            return False
+        raise ValueError(f"Not a boolean: {value!r}")
+    return bool(value)
+
+
+def _to_float(value: Any) -> float:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+# --- column encoding -------------------------------------------------------
+
+def _encode(kind: str, name: str, values: List[Any]) -> Dict[str, np.ndarray]:
+    """Arrays stored for one column of a segment"""
+    if kind == "float":
+        return {name: np.array([_to_float(value) for value in values], dtype=np.float64)}
+    if kind == "date":
+        return {name: np.array([_to_date(value) if value else np.datetime64("NaT") for value in values],
+                               dtype="datetime64[D]")}
+    nulls = np.array([value is None for value in values], dtype=bool)
+    if kind == "bool":
+        arrays = {name: np.array([bool(value) for value in values], dtype=bool)}
+        if nulls.any():
+            arrays[f"{name}.nulls"] = nulls
+        return arrays
+
+    strings = ["" if value is None else str(value) for value in values]
+    arrays = {}
+    if kind == "category":
+        dictionary = sorted(set(strings))
+        codes = {value: code for code, value in enumerate(dictionary)}
+        arrays[f"{name}.codes"] = np.array([codes[value] for value in strings], dtype=np.int32)
+        arrays[f"{name}.dict"] = np.array(dictionary, dtype=str) if dictionary else np.array([], dtype="<U1")
+    else:
+        encoded = [value.encode("utf-8") for value in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        arrays[f"{name}.data"] = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        arrays[f"{name}.offsets"] = offsets
+    if nulls.any():
+        arrays[f"{name}.nulls"] = nulls
+    return arrays
+
+
+class _Segment:
+    """Lazy reader over one segment file; arrays are only read when used"""
+
+    def __init__(self, path: Path, rows: int):
+        self._file = np.load(path, allow_pickle=False)
+        self.rows = rows
+
+    def close(self):
+        self._file.close()
+
+    def _nulls(self, name: str) -> Optional[np.ndarray]:
+        key = f"{name}.nulls"
+        return self._file[key] if key in self._file.files else None
+
+    def vector(self, kind: str, name: str) -> np.ndarray:
+        """Column as one array suitable for predicates (categories as their strings)"""
+        if kind in ("float", "date", "bool"):
+            if name not in self._file.files:  # Column added to the schema after this segment
+                return np.full(self.rows, np.nan if kind == "float" else
+                               (np.datetime64("NaT") if kind == "date" else False))
+            return self._file[name]
+        if kind == "category":
+            if f"{name}.codes" not in self._file.files:
+                return np.full(self.rows, "", dtype="<U1")
+            dictionary = self._file[f"{name}.dict"]
+            return dictionary[self._file[f"{name}.codes"]] if len(dictionary) else np.full(self.rows, "", "<U1")
+        return np.array(self.values(kind, name, np.arange(self.rows)), dtype=object)
+
+    def values(self, kind: str, name: str, rows: np.ndarray) -> List[Any]:
+        """Python values of a column for the given row numbers"""
+        if kind == "float":
+            return [None if np.isnan(value) else value for value in self.vector(kind, name)[rows].tolist()]
+        if kind == "date":
+            return [None if value is None else value.isoformat() for value in self.vector(kind, name)[rows].tolist()]
+        nulls = self._nulls(name)
+        if kind == "bool":
+            values = self.vector(kind, name)[rows].tolist()
+        elif kind == "category":
+            values = self.vector(kind, name)[rows].tolist()
+        elif f"{name}.data" not in self._file.files:
+            values = [None] * len(rows)
+        else:
+            blob = self._file[f"{name}.data"].tobytes()
+            offsets = self._file[f"{name}.offsets"]
+            starts, ends = offsets[rows].tolist(), offsets[rows + 1].tolist()
+            values = [blob[start:end].decode("utf-8") for start, end in zip(starts, ends)]
+        if nulls is not None:
+            values = [None if null else value for value, null in zip(values, nulls[rows].tolist())]
+        return values
+
+
+# --- predicates ------------------------------------------------------------
+
+def parse_predicate(text: str) -> Predicate:
+    """"project_value>=100000" -> ("project_value", ">=", 100000.0); "qualified==false" -> (..., False)"""
+    match = _PREDICATE.match(text)
+    if not match:
+        raise ValueError(f"Cannot parse predicate: {text!r}")
+    column, op, raw = match.groups()
+    raw = raw.strip("'\"")
+    kind = SCHEMA.get(column, "date" if column == PARTITION_COLUMN else "string")
+    value: Any = {"float": float, "bool": _to_bool}.get(kind, str)(raw)
+    return column, op, value
+
+
+def _compare(vector: np.ndarray, op: str, value: Any) -> np.ndarray:
+    with np.errstate(invalid="ignore"):
+        if op == "==":
+            return vector == value
+        if op == "!=":
+            return vector != value
+        if op == ">=":
+            return vector >= value
+        if op == "<=":
+            return vector <= value
+        if op == ">":
+            return vector > value
+        if op == "<":
+            return vector < value
+        if op == "in":
+            return np.isin(vector, list(value))
+        if op == "between":
+            low, high = value
+            return (vector >= low) & (vector <= high)
+    raise ValueError(f"Unknown operator {op!r}; expected one of {OPERATORS}")
+
+
+def _coerce(kind: str, op: str, value: Any) -> Any:
+    convert = {"date": _to_date, "float": _to_float, "bool": _to_bool}.get(kind)
+    if convert is None:
+        return value
+    if op in ("in", "between"):
+        return [convert(item) for item in value]
+    return convert(value)
+
+
+def _may_match(stats: Dict[str, Any], kind: str, op: str, value: Any) -> bool:
+    """False when segment stats prove no row can satisfy the predicate"""
+    if stats is None:
+        return True
+    if kind == "category":
+        present = set(stats)
+        if op == "==":
+            return value in present
+        if op == "in":
+            return bool(present & set(value))
+        return True
+
+    low, high = stats
+    if low is None:
+        return op == "!="  # Column entirely empty: only != can hold (NaN != x)
+    convert = _to_date if kind == "date" else float
+    low, high = convert(low), convert(high)
+    if op == "==":
+        return low <= value <= high
+    if op in (">=", ">"):
+        return high > value or (op == ">=" and high == value)
+    if op in ("<=", "<"):
+        return low < value or (op == "<=" and low == value)
+    if op == "between":
+        return high >= value[0] and low <= value[1]
+    if op == "in":
+        return any(low <= item <= high for item in value)
+    return True
+
+
+def _column_stats(kind: str, values: List[Any]) -> Any:
+    if kind == "category":
+        return sorted({"" if value is None else str(value) for value in values})
+    if kind == "float":
+        array = np.array([_to_float(value) for value in values], dtype=np.float64)
+        array = array[~np.isnan(array)]
+        return [float(array.min()), float(array.max())] if len(array) else [None, None]
+    if kind == "date":
+        dates = sorted(str(value)[:10] for value in values if value and not np.isnat(_to_date(value)))
+        return [dates[0], dates[-1]] if dates else [None, None]
+    return None
+
+
+# --- store -----------------------------------------------------------------
+
+@dataclass
+class SegmentInfo:
+    """Manifest entry for one segment file"""
+    partition: str
+    file: str
+    rows: int
+    stats: Dict[str, Any]
+
+
+class LeadStore:
+    """
+    Append-only columnar lead store.
+
+    Usage:
+        store = LeadStore(repo_root / "data" / "lead-store")
+        store.append(qualified_leads)
+        rows = store.read(columns=["project_name", "project_value"],
+                          where=[("project_value", ">=", 1e6), ("date", ">=", "2026-01-01")])
+    """
+
+    VERSION = 1
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.manifest_path = self.root / "manifest.json"
+        self.segments: List[SegmentInfo] = []
+        self._load_manifest()
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return
+        self.segments = [SegmentInfo(**entry) for entry in manifest.get("segments", [])]
+
+    def _save_manifest(self):
+        """Write atomically, one segment per line so daily commits diff cleanly"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_suffix(".tmp")
+        entries = ",".join(f"\n  {json.dumps(vars(segment), sort_keys=True)}" for segment in self.segments)
+        with open(tmp, "w") as f:
+            f.write(f'{{"version": {self.VERSION},\n')
+            f.write(f' "schema": {json.dumps(SCHEMA)},\n')
+            f.write(f' "segments": [{entries}\n ]\n}}\n')
+        os.replace(tmp, self.manifest_path)
+
+    def partitions(self) -> List[str]:
+        return sorted({segment.partition for segment in self.segments})
+
+    def __len__(self) -> int:
+        return sum(segment.rows for segment in self.segments)
+
+    def append(self, leads: Sequence[Dict[str, Any]], partition: Optional[str] = None) -> Optional[SegmentInfo]:
+        """Write leads as a new segment of a day's partition (today by default)"""
+        if not leads:
+            return None
+        partition = partition or datetime.utcnow().strftime("%Y-%m-%d")
+
+        columns: Dict[str, List[Any]] = {name: [] for name in SCHEMA}
+        for lead in leads:
+            for name in SCHEMA:
+                if name not in (EXTRA_COLUMN, "fingerprint"):
+                    columns[name].append(lead.get(name))
+            columns["fingerprint"].append(lead_fingerprint(lead))
+            extra = {key: value for key, value in lead.items() if key not in SCHEMA}
+            columns[EXTRA_COLUMN].append(json.dumps(extra, sort_keys=True, default=str) if extra else None)
+
+        arrays: Dict[str, np.ndarray] = {}
+        stats: Dict[str, Any] = {}
+        for name, kind in SCHEMA.items():
+            arrays.update(_encode(kind, name, columns[name]))
+            column_stats = _column_stats(kind, columns[name])
+            if column_stats is not None:
+                stats[name] = column_stats
+
+        directory = self.root / f"{PARTITION_COLUMN}={partition}"
+        directory.mkdir(parents=True, exist_ok=True)
+        number = sum(1 for segment in self.segments if segment.partition == partition)
+        while (directory / f"part-{number:05d}.npz").exists():
+            number += 1
+        file = f"{PARTITION_COLUMN}={partition}/part-{number:05d}.npz"
+        tmp = self.root / f"{file}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp, self.root / file)
+
+        segment = SegmentInfo(partition=partition, file=file, rows=len(leads), stats=stats)
+        self.segments.append(segment)
+        self._save_manifest()
+        return segment
+
+    def _plan(self, where: Sequence[Predicate]) -> List[SegmentInfo]:
+        """Segments that may hold matching rows, judged from the manifest alone"""
+        selected = []
+        for segment in self.segments:
+            keep = True
+            for column, op, value in where:
+                if column == PARTITION_COLUMN:
+                    keep = bool(_compare(np.array([_to_date(segment.partition)]), op,
+                                         _coerce("date", op, value))[0])
+                elif column in SCHEMA and SCHEMA[column] in ("float", "date", "category"):
+                    kind = SCHEMA[column]
+                    keep = _may_match(segment.stats.get(column), kind, op,
+                                      value if kind == "category" else _coerce(kind, op, value))
+                if not keep:
+                    break
+            if keep:
+                selected.append(segment)
+        return selected
+
+    def scan(self, columns: Optional[Sequence[str]] = None,
+             where: Sequence[Predicate] = ()) -> Iterator[Dict[str, List[Any]]]:
+        """
+        Matching rows one segment at a time, as {column: values} batches.
+        Only the projected and filtered columns are read from disk.
+        """
+        for _, _, batch in self._scan(columns, where):
+            yield batch
+
+    def _scan(self, columns: Optional[Sequence[str]],
+              where: Sequence[Predicate]) -> Iterator[Tuple[SegmentInfo, np.ndarray, Dict[str, List[Any]]]]:
+        """scan(), with each batch's segment and row numbers"""
+        where = [parse_predicate(item) if isinstance(item, str) else item for item in where]
+        columns = list(columns or [name for name in SCHEMA if name != EXTRA_COLUMN])
+        for column in columns + [predicate[0] for predicate in where]:
+            if column not in SCHEMA and column != PARTITION_COLUMN:
+                raise KeyError(f"Unknown column {column!r}")
+
+        for info in self._plan(where):
+            segment = _Segment(self.root / info.file, info.rows)
+            try:
+                mask = np.ones(info.rows, dtype=bool)
+                for column, op, value in where:
+                    if column == PARTITION_COLUMN:
+                        continue  # Already decided by the plan
+                    kind = SCHEMA[column]
+                    mask &= _compare(segment.vector(kind, column), op, _coerce(kind, op, value))
+                rows = np.flatnonzero(mask)
+                if not len(rows):
+                    continue
+                yield info, rows, {
+                    column: ([info.partition] * len(rows) if column == PARTITION_COLUMN
+                             else segment.values(SCHEMA[column], column, rows))
+                    for column in columns
+                }
+            finally:
+                segment.close()
+
+    def read(self, columns: Optional[Sequence[str]] = None, where: Sequence[Predicate] = (),
+             latest: bool = False) -> List[Dict[str, Any]]:
+        """
+        Matching rows as lead dicts. Without a projection the whole lead is
+        rebuilt (including `_extra` fields). With latest=True only the most
+        recently appended version of each lead is considered, so a lead whose
+        newest version fails the filter is left out even if an older one matches.
+        """
+        whole = columns is None
+        projection = list(columns) if columns else list(SCHEMA)
+        if latest and "fingerprint" not in projection:
+            projection.append("fingerprint")
+
+        newest: Dict[str, Tuple[str, int]] = {}
+        if latest and where:
+            # Resolve versions before filtering: fingerprint -> (segment file, row) of its newest version
+            for info, row_numbers, batch in self._scan(["fingerprint"], ()):
+                for fingerprint, number in zip(batch["fingerprint"], row_numbers.tolist()):
+                    newest[fingerprint] = (info.file, number)
+
+        rows: List[Dict[str, Any]] = []
+        for info, row_numbers, batch in self._scan(projection, where):
+            names = list(batch)
+            for number, values in zip(row_numbers.tolist(), zip(*(batch[name] for name in names))):
+                row = dict(zip(names, values))
+                if newest and newest[row["fingerprint"]] != (info.file, number):
+                    continue  # A newer version of this lead exists
+                if whole:
+                    extra = row.pop(EXTRA_COLUMN, None)
+                    row = {key: value for key, value in row.items() if value is not None}
+                    if extra:
+                        row.update(json.loads(extra))
+                rows.append(row)
+
+        if latest:
+            by_fingerprint = {row["fingerprint"]: row for row in rows}
+            rows = list(by_fingerprint.values())
+            if columns is not None and "fingerprint" not in columns:
+                for row in rows:
+                    del row["fingerprint"]
+        if whole:
+            for row in rows:
+                row.pop("fingerprint", None)
+        return rows
+
+
+def import_json_files(store: LeadStore, paths: Sequence[Path]) -> int:
+    """Backfill daily raw-leads JSON files, one partition per file date"""
+    imported = 0
+    known = {segment.partition for segment in store.segments}
+    for path in sorted(paths):
+        partition = path.stem
+        if partition in known:
+            continue
+        with open(path) as f:
+            leads = json.load(f).get("leads", [])
+        if store.append(leads, partition):
+            imported += len(leads)
+    return imported
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hunter lead store")
+    parser.add_argument("--store", type=Path, default=Path(__file__).parent.parent.parent / "data" / "lead-store")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    backfill = commands.add_parser("import", help="Backfill data/raw-leads/YYYY-MM-DD.json files")
+    backfill.add_argument("files", nargs="+", type=Path)
+
+    scan = commands.add_parser("scan", help="Print matching leads as JSON lines")
+    scan.add_argument("--columns", help="Comma-separated projection (default: whole leads)")
+    scan.add_argument("--where", action="append", default=[], help='Predicate like "project_value>=100000"')
+    scan.add_argument("--latest", action="store_true", help="Only the newest version of each lead")
+
+    args = parser.parse_args(argv)
+    store = LeadStore(args.store)
+
+    if args.command == "import":
+        count = import_json_files(store, args.files)
+        print(f"Imported {count} leads; store holds {len(store)} rows in {len(store.partitions())} partitions")
+        return
+
+    columns = args.columns.split(",") if args.columns else None
+    for row in store.read(columns, args.where, latest=args.latest):
+        print(json.dumps(row, default=str))
+
+
+__all__ = [
+    'LeadStore',
+    'SegmentInfo',
+    'SCHEMA',
+    'parse_predicate',
+    'import_json_files'
+]
+
+
+if __name__ == "__main__":
+    main()
@@ -10,20 +10,39 @@ Target Area: Orlando, FL (100-mile radius)
 Sources:
     1. Mock Construction Permit Data (MVP stability)
     2. Google Maps - "New Commercial Construction"
+    3. Pages listed under inputs.scrape_targets in the hunter blueprint,
+       scraped by the orchestrator with change detection: pages that did
+       not change since the last run are dropped before qualification
 
 Data Pipeline:
-    Scrape → Extract → Validate → Save to data/raw-leads/YYYY-MM-DD.json
+    Scrape → Resolve (cross-source dedup) → Delta (seen-lead index) → Validate
+    → Append to data/lead-store/ (columnar, partitioned by day)
+    → Export dashboard shards to apps/command-center/public/data/leads/
+
+Runs are incremental: only leads that are new or changed since the last
+run (data/lead-index/seen-leads.json) are qualified, saved and published.
+Pass --full to reprocess everything.
 
 Automation: Daily via .github/workflows/hunter-cron.yml
 """
 
+import argparse
 import asyncio
 import json
 import os
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
+
+from dashboard_export import export_from_store
+from entity_resolution import resolve_leads
+from github_publisher import publish_leads
+from lead_index import LeadIndex
+from lead_store import LeadStore, SegmentInfo, import_json_files
+from qualification import HUNTER_BLUEPRINT, LeadColumns, RuleSet
+from scraper_orchestrator import (ScraperConfig, ScraperMode, ScraperOrchestrator, ScrapeResult,
+                                  ScrapeTarget, SiteType)
 
 
 def initialize_hunter():
@@ -186,6 +205,55 @@ async def scrape_google_maps_playwright(query: str, location: str) -> List[Dict[
         return []
 
 
+def load_scrape_targets(path: Path = HUNTER_BLUEPRINT) -> List[ScrapeTarget]:
+    """Pages listed under inputs.scrape_targets in the hunter blueprint"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            blueprint = json.load(f)
+    except FileNotFoundError:
+        return []
+
+    targets = []
+    for entry in blueprint.get("inputs", {}).get("scrape_targets", []):
+        targets.append(ScrapeTarget(
+            url=entry["url"],
+            site_type=SiteType(entry.get("site_type", SiteType.PERMITS.value)),
+            mode=ScraperMode.EXTRACT,
+            selectors=entry.get("selectors", {}),
+            row_selector=entry.get("row_selector"),
+            requires_js=entry.get("requires_js", False)
+        ))
+    return targets
+
+
+async def scrape_targets(targets: List[ScrapeTarget], config: Optional[ScraperConfig] = None) -> List[ScrapeResult]:
+    """Scrape configured pages, flagging the ones whose content hasn't changed since the last run"""
+    config = config or ScraperConfig(max_instances=min(len(targets), 10))
+    config.change_detection = True
+    orchestrator = ScraperOrchestrator(config)
+    await orchestrator.start()
+    try:
+        return await orchestrator.scrape_parallel(targets)
+    finally:
+        await orchestrator.stop()
+
+
+def leads_from_results(results: List[ScrapeResult]) -> List[Dict[str, Any]]:
+    """
+    Turn extracted rows into leads. Failed pages and pages that haven't
+    changed since the last run are dropped, so they never reach qualification.
+    """
+    leads = []
+    for result in results:
+        if not result.success or result.unchanged:
+            continue
+        rows = result.data if isinstance(result.data, list) else [result.data]
+        for row in rows:
+            if isinstance(row, dict) and any(value is not None for value in row.values()):
+                leads.append({**row, "source": row.get("source") or result.url})
+    return leads
+
+
 def scrape_sources() -> List[Dict[str, Any]]:
     """
     Execute multi-source scraping across Orlando construction data.
@@ -201,6 +269,8 @@ def scrape_sources() -> List[Dict[str, Any]]:
     # Source 1: Mock Construction Permit Data
     print("   📋 Source 1: Mock Construction Permits")
     mock_permits = generate_mock_permit_data()
+    for permit in mock_permits:
+        permit.setdefault("source", "Mock Construction Permits")
     all_leads.extend(mock_permits)
     print(f"   ✅ Found {len(mock_permits)} permit records")
 
@@ -219,23 +289,84 @@ def scrape_sources() -> List[Dict[str, Any]]:
     except Exception as e:
         print(f"   ⚠️  Google Maps search skipped: {e}")
 
+    # Source 3: Blueprint-configured pages (via the scraper orchestrator)
+    targets = load_scrape_targets()
+    if targets:
+        print(f"   🛰️  Source 3: {len(targets)} configured pages")
+        try:
+            results = asyncio.run(scrape_targets(targets))
+            page_leads = leads_from_results(results)
+            all_leads.extend(page_leads)
+            unchanged = sum(1 for result in results if result.unchanged)
+            print(f"   ✅ Found {len(page_leads)} leads ({unchanged} pages unchanged since the last run)")
+        except Exception as e:
+            print(f"   ⚠️  Configured pages skipped: {e}")
+
     print(f"   📊 Total Discovered: {len(all_leads)} raw leads")
     print()
 
     return all_leads
 
 
-def qualify_leads(leads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def resolve_entities(leads: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Merge leads that describe the same project across sources.
+
+    Args:
+        leads: Raw leads from scraping
+
+    Returns:
+        One canonical lead per project (with `provenance`), and resolver stats
+    """
+    print("🧬 RESOLUTION PHASE")
+    print("-" * 40)
+
+    canonical, stats = resolve_leads(leads)
+    print(f"   🔗 Merged {stats['merged']} duplicate records into {stats['clusters']} projects")
+    print(f"   ⚖️  Pairwise comparisons: {stats['comparisons']:,} (blocked)")
+    print()
+
+    return canonical, stats
+
+
+def select_delta(leads: List[Dict[str, Any]], index: LeadIndex) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Keep only leads that are new or changed since the last run.
+
+    Args:
+        leads: Raw leads from scraping
+        index: Seen-lead index from previous runs
+
+    Returns:
+        Leads to process, and new/changed/unchanged counts
+    """
+    print("🧮 DELTA PHASE")
+    print("-" * 40)
+
+    new, changed, unchanged = index.partition(leads)
+    for source, watermark in sorted(index.watermarks.items()):
+        print(f"   🔖 {source}: newest permit {watermark.get('newest_permit_date') or 'N/A'}")
+    print(f"   🆕 New: {len(new)}  ✏️  Changed: {len(changed)}  💤 Unchanged: {len(unchanged)}")
+    print(f"   📚 Index: {len(index)} known leads")
+    print()
+
+    counts = {"new": len(new), "changed": len(changed), "unchanged": len(unchanged)}
+    return new + changed, counts
+
+
+def qualify_leads(leads: List[Dict[str, Any]], rules: Optional[RuleSet] = None) -> List[Dict[str, Any]]:
     """
     Filter and qualify leads based on criteria.
 
-    Qualification Rules:
-        - Minimum project value: $100,000
-        - Must have valid location
-        - Must have contact information
+    Qualification Rules (from apps/biz-ops/blueprints/hunter.json):
+        - Minimum project value (inputs.min_project_value)
+        - Required fields: location and contact
+        - Optional project type allowlist
+        - Within the radius of one of the target metros
 
     Args:
         leads: Raw leads from scraping
+        rules: Rule set to apply (defaults to the hunter blueprint)
 
     Returns:
         Qualified leads meeting criteria
@@ -244,27 +375,27 @@ def qualify_leads(leads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     print("-" * 40)
     print("   Applying qualification filters...")
 
-    qualified = []
-    MIN_VALUE = 100000
-
-    for lead in leads:
-        # Check minimum value
-        project_value = lead.get('project_value', 0)
-        if project_value < MIN_VALUE:
-            continue
-
-        # Check required fields
-        if not lead.get('location'):
-            continue
-        if not lead.get('contact'):
-            continue
-
-        # Add qualification metadata
+    rules = rules or RuleSet.from_blueprint()
+    columns = LeadColumns(leads)
+    result = rules.evaluate(columns)
+    for name, failed in result.failures().items():
+        if failed:
+            print(f"   ❌ {name}: {failed} rejected")
+
+    min_value = rules.rule("min_value")
+    within_metro = rules.rule("within_metro")
+    metros = within_metro.assign(columns) if within_metro else None
+    qualification_date = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')
+    qualified = result.select(leads)
+
+    # Add qualification metadata
+    for position, lead in zip(result.positions(), qualified):
         lead['qualified'] = True
-        lead['qualification_date'] = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')
-        lead['min_value_check'] = f"PASS (${project_value:,} >= ${MIN_VALUE:,})"
-
-        qualified.append(lead)
+        lead['qualification_date'] = qualification_date
+        if min_value:
+            lead['min_value_check'] = f"PASS (${lead['project_value']:,} >= ${min_value.minimum:,.0f})"
+        if metros is not None and metros[position] >= 0:
+            lead['metro'] = within_metro.metros[metros[position]].name
 
     print(f"   ✅ Qualified: {len(qualified)}/{len(leads)} leads")
     print()
@@ -272,117 +403,88 @@ def qualify_leads(leads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return qualified
 
 
-def save_leads_to_json(leads: List[Dict[str, Any]], output_dir: Path) -> Path:
+def save_leads(leads: List[Dict[str, Any]], store: LeadStore) -> Optional[SegmentInfo]:
     """
-    Save leads to JSON file in data/raw-leads/ directory.
+    Append leads to the lead store as a new segment of today's partition.
+
+    Earlier segments are never rewritten; readers that want one row per
+    lead use LeadStore.read(latest=True).
 
     Args:
         leads: Qualified leads to save
-        output_dir: Base output directory (repo root)
+        store: Lead store under data/lead-store/
 
     Returns:
-        Path to saved JSON file
+        Manifest entry of the written segment
     """
     print("💾 PERSISTENCE PHASE")
     print("-" * 40)
 
-    # Create data/raw-leads directory
-    raw_leads_dir = output_dir / "data" / "raw-leads"
-    raw_leads_dir.mkdir(parents=True, exist_ok=True)
+    segment = store.append(leads)
 
-    # Create filename with today's date
-    today = datetime.utcnow().strftime('%Y-%m-%d')
-    output_file = raw_leads_dir / f"{today}.json"
+    print(f"   ✅ Saved {len(leads)} leads to: {store.root / segment.file}")
+    print()
 
-    # Save leads to JSON
-    output_data = {
-        "scrape_date": datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC'),
-        "location": "Orlando, FL (100-mile radius)",
-        "total_leads": len(leads),
-        "leads": leads
-    }
+    return segment
 
-    with open(output_file, 'w') as f:
-        json.dump(output_data, f, indent=2)
 
-    print(f"   ✅ Saved {len(leads)} leads to: {output_file}")
-    print()
+def export_dashboard(store: LeadStore):
+    """Rebuild the command-center dataset (manifest, day/value/geo shards) from the store"""
+    print("📊 EXPORT PHASE")
+    print("-" * 40)
 
-    return output_file
+    result = export_from_store(store)
+    manifest = result.manifest
+    print(f"   ✅ {manifest['count']} leads across {len(manifest['days'])} days, "
+          f"{len(manifest['tiles']['cells'])} map tiles")
+    print(f"   📦 {result.rewritten}/{result.shards} shards rewritten, {result.removed} removed")
+    print()
 
 
-def create_github_issues(qualified_leads: List[Dict[str, Any]]):
+def create_github_issues(qualified_leads: List[Dict[str, Any]],
+                         cache_path: Path) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
     """
-    Create GitHub Issues for qualified leads.
+    Create or update GitHub Issues for qualified leads.
+
+    Existing lead issues are cached by fingerprint in `cache_path`, so only
+    new leads get an issue and only changed leads get theirs edited.
 
     Args:
         qualified_leads: Leads that passed qualification
+        cache_path: Local cache of published lead issues
+
+    Returns:
+        Leads whose issue is published (created, updated or already up to
+        date), and created/updated/unchanged counts. Leads missing from the
+        first list - failed, or skipped without a token - are retried next run.
     """
     print("📝 GITHUB INTEGRATION PHASE")
     print("-" * 40)
 
+    counts = {"created": 0, "updated": 0, "unchanged": 0}
     if not qualified_leads:
         print("   ℹ️  No qualified leads to publish")
         print()
-        return
+        return [], counts
 
     github_token = os.getenv('GITHUB_TOKEN')
     if not github_token:
         print("   ⚠️  GITHUB_TOKEN not available, skipping issue creation")
         print("   💡 Issues will be created when run via GitHub Actions")
         print()
-        return
-
-    try:
-        from github import Github
-
-        g = Github(github_token)
-        repo = g.get_repo("InfinityXOneSystems/construct-iq-360")
-
-        for lead in qualified_leads:
-            # Create issue title
-            title = f"[LEAD] {lead.get('developer', 'Unknown')} - {lead.get('project_name', 'Project')}"
-
-            # Create issue body
-            body = f"""## 🎯 New Lead Discovered - Orlando, FL
-
-**Project:** {lead.get('project_name', 'N/A')}
-**Developer:** {lead.get('developer', 'N/A')}
-**Estimated Value:** ${lead.get('project_value', 0):,}
-**Location:** {lead.get('location', 'N/A')}
-**Contact:** {lead.get('contact', 'N/A')}
-**Type:** {lead.get('project_type', 'N/A')}
+        return [], counts
 
-**Coordinates:** {lead.get('lat', 'N/A')}, {lead.get('lng', 'N/A')}
+    report = asyncio.run(publish_leads(qualified_leads, github_token, cache_path))
+    counts = {"created": report.created, "updated": report.updated, "unchanged": report.unchanged}
 
----
-
-**Discovered:** {lead.get('qualification_date', 'N/A')}
-**Source:** {lead.get('source', 'Automated Hunt')}
-**Status:** Qualified - Awaiting Review
-
----
-
-*This lead was automatically discovered by the Hunter Agent.*
-"""
-
-            # Create the issue
-            issue = repo.create_issue(
-                title=title,
-                body=body,
-                labels=['lead', 'automated', 'orlando', 'needs-review']
-            )
-            print(f"   ✅ Created issue #{issue.number}: {title}")
-
-        print(f"   📤 Successfully created {len(qualified_leads)} GitHub issues")
-        print()
-
-    except ImportError:
-        print("   ⚠️  PyGithub not available, skipping issue creation")
-        print()
-    except Exception as e:
-        print(f"   ❌ Error creating GitHub issues: {e}")
-        print()
+    print(f"   📤 Created {report.created}, updated {report.updated}, "
+          f"{report.unchanged} already up to date ({report.requests} API requests)")
+    if report.rate_limit_waits:
+        print(f"   ⏳ Waited {report.rate_limit_waits:.0f}s for GitHub rate limits")
+    if report.failed:
+        print(f"   ❌ {len(report.failed)} leads could not be published; retrying next run")
+    print()
+    return report.published, counts
 
 
 def generate_report(stats):
@@ -392,16 +494,29 @@ def generate_report(stats):
     print("=" * 60)
     print(f"🔍 Sources Scanned: {stats.get('sources_scanned', 0)}")
     print(f"📥 Raw Leads Found: {stats.get('raw_leads', 0)}")
+    print(f"🔗 Duplicates Merged: {stats.get('duplicates_merged', 0)}")
+    print(f"🆕 New / Changed Leads: {stats.get('new_leads', 0)} / {stats.get('changed_leads', 0)}")
     print(f"✅ Qualified Leads: {stats.get('qualified_leads', 0)}")
-    print(f"📝 Issues Created: {stats.get('issues_created', 0)}")
+    print(f"📝 Issues Created / Updated: {stats.get('issues_created', 0)} / {stats.get('issues_updated', 0)}")
     print(f"⏱️  Execution Time: {stats.get('execution_time', 'N/A')}")
     print()
     print("🎯 Hunt protocol completed successfully")
     print("=" * 60)
 
 
-def main():
+def parse_args(argv=None) -> argparse.Namespace:
+    """Command line options."""
+    parser = argparse.ArgumentParser(description="Hunter Agent - autonomous lead discovery")
+    parser.add_argument(
+        "--full", action="store_true",
+        help="Reprocess every scraped lead instead of only new or changed ones"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Main execution flow for the Hunter Agent."""
+    args = parse_args(argv)
     start_time = datetime.utcnow()
 
     # Initialize
@@ -409,19 +524,46 @@ def main():
 
     # Get repository root (two levels up from main.py)
     repo_root = Path(__file__).parent.parent.parent
+    index = LeadIndex.load(repo_root / "data" / "lead-index" / "seen-leads.json")
+    if not index.path.exists():
+        # First incremental run: leads already saved by earlier runs count as seen
+        index.seed(sorted((repo_root / "data" / "raw-leads").glob("*.json")))
+    store = LeadStore(repo_root / "data" / "lead-store")
+    if not len(store):
+        # First run on the lead store: backfill the daily raw-leads files
+        imported = import_json_files(store, sorted((repo_root / "data" / "raw-leads").glob("*.json")))
+        print(f"📥 Backfilled {imported} leads from data/raw-leads/ into the lead store")
 
     # Execute scraping
     raw_leads = scrape_sources()
 
+    # One lead per real-world project, whichever sources reported it
+    leads, resolution = resolve_entities(raw_leads)
+
+    # Keep only what changed since the last run
+    if args.full:
+        to_process, delta = leads, {"new": len(leads), "changed": 0, "unchanged": 0}
+    else:
+        to_process, delta = select_delta(leads, index)
+
     # Qualify leads
-    qualified = qualify_leads(raw_leads)
+    qualified = qualify_leads(to_process)
 
-    # Save to JSON file
-    if qualified:
-        save_leads_to_json(qualified, repo_root)
+    # Append to the lead store; leads retried because their issue wasn't
+    # published are already there. The dashboard export is refreshed every run
+    to_store = index.unstored(qualified)
+    if to_store:
+        save_leads(to_store, store)
+        index.mark_stored(to_store)
+    export_dashboard(store)
 
     # Create GitHub issues
-    create_github_issues(qualified)
+    published, issues = create_github_issues(qualified, index.path.parent / "published-issues.json")
+
+    # Remember what was processed; qualified leads are only seen once their issue is published
+    pending = {id(lead) for lead in qualified} - {id(lead) for lead in published}
+    index.mark([lead for lead in to_process if id(lead) not in pending])
+    index.save()
 
     # Generate report
     execution_time = (datetime.utcnow() - start_time).total_seconds()
@@ -430,8 +572,13 @@ def main():
         'location': 'Orlando, FL (100-mile radius)',
         'sources_scanned': 2,  # Mock permits + Google Maps
         'raw_leads': len(raw_leads),
+        'duplicates_merged': resolution['merged'],
+        'new_leads': delta['new'],
+        'changed_leads': delta['changed'],
+        'unchanged_leads': delta['unchanged'],
         'qualified_leads': len(qualified),
-        'issues_created': len(qualified) if os.getenv('GITHUB_TOKEN') else 0,
+        'issues_created': issues['created'],
+        'issues_updated': issues['updated'],
         'execution_time': f"{execution_time:.2f}s"
     }
     generate_report(stats)
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+SHADOW POLITENESS SCHEDULER
+===========================
+Per-host rate limiting for the scraper orchestrator
+
+Features:
+- Token bucket per host driven by ScraperConfig.rate_limit_ms
+- robots.txt allow/deny and Crawl-delay, cached on disk
+- Retry-After back-off shared by every request to the host
+- Round-robin interleaving of targets across hosts
+"""
+
+import asyncio
+import json
+import logging
+import time
+import urllib.error
+import urllib.request
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+logger = logging.getLogger('PolitenessScheduler')
+
+ROBOTS_USER_AGENT = "*"
+
+
+def host_of(url: str) -> str:
+    """Normalized host key used for rate limiting"""
+    return (urlsplit(url).hostname or "").lower()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta seconds or HTTP date) into seconds"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HostBucket:
+    """Token bucket for a single host; reservations may run the balance negative"""
+
+    def __init__(self, interval_s: float, capacity: int):
+        self.interval_s = interval_s
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def reserve(self, now: float) -> float:
+        """Take one token and return how long the caller must wait for it"""
+        if self.interval_s > 0:
+            elapsed = now - self.updated
+            self.tokens = min(self.capacity, self.tokens + elapsed / self.interval_s)
+        else:
+            self.tokens = float(self.capacity)
+        self.updated = now
+
+        self.tokens -= 1
+        wait = -self.tokens * self.interval_s if self.tokens < 0 else 0.0
+        return max(wait, self.blocked_until - now)
+
+
+class RobotsCache:
+    """robots.txt rules per host, cached on disk with a TTL"""
+
+    def __init__(self, cache_dir: Path, ttl_hours: int = 24, timeout_seconds: int = 10):
+        self.cache_dir = cache_dir / "robots"
+        self.ttl_seconds = ttl_hours * 3600
+        self.timeout_seconds = timeout_seconds
+        self._parsers: Dict[str, RobotFileParser] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    async def get(self, url: str) -> RobotFileParser:
+        """Rules for the URL's host, fetching robots.txt at most once per TTL"""
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        if origin in self._parsers:
+            return self._parsers[origin]
+
+        # Coalesce concurrent lookups for the same host into one fetch
+        if origin not in self._pending:
+            self._pending[origin] = asyncio.ensure_future(self._load(origin))
+        try:
+            parser = await self._pending[origin]
+        finally:
+            self._pending.pop(origin, None)
+
+        self._parsers[origin] = parser
+        return parser
+
+    async def _load(self, origin: str) -> RobotFileParser:
+        """Read robots.txt from the disk cache, falling back to the network"""
+        cache_file = self.cache_dir / f"{urlsplit(origin).netloc.replace(':', '_')}.txt"
+
+        # Disk and network I/O both run in the default executor, off the event loop
+        body = await asyncio.to_thread(self._read_cached, cache_file)
+        if body is None:
+            body = await asyncio.to_thread(self._fetch, f"{origin}/robots.txt")
+            if body is not None:
+                await asyncio.to_thread(self._write_cached, cache_file, body)
+
+        parser = RobotFileParser()
+        # Unreachable robots.txt is treated as allow-all for this run
+        parser.parse((body or "").splitlines())
+        return parser
+
+    def _read_cached(self, cache_file: Path) -> Optional[str]:
+        """Cached robots.txt body, or None when missing or older than the TTL"""
+        try:
+            if time.time() - cache_file.stat().st_mtime >= self.ttl_seconds:
+                return None
+            return cache_file.read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def _write_cached(self, cache_file: Path, body: str):
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(body, encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Could not cache {cache_file.name}: {e}")
+
+    def _fetch(self, robots_url: str) -> Optional[str]:
+        """Blocking robots.txt download; returns '' for a missing file, None on error"""
+        try:
+            with urllib.request.urlopen(robots_url, timeout=self.timeout_seconds) as response:
+                return response.read().decode("utf-8", errors="replace")
+        except urllib.error.HTTPError as e:
+            # 4xx means no rules; 5xx is transient and not cached
+            return "" if 400 <= e.code < 500 else None
+        except Exception as e:
+            logger.debug(f"robots.txt unavailable at {robots_url}: {e}")
+            return None
+
+
+class PolitenessScheduler:
+    """
+    Gatekeeper that every scrape passes before taking a browser instance.
+    Targets waiting on a busy host never hold an instance, so the pool keeps
+    serving other hosts in the meantime.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.cache_dir = Path(config.cache_dir)
+        self.robots = RobotsCache(self.cache_dir, config.robots_cache_ttl_hours, config.timeout_seconds)
+        self._buckets: Dict[str, HostBucket] = {}
+        self._retry_after_file = self.cache_dir / "retry_after.json"
+        self._blocked_until = self._load_blocked()
+
+    def _load_blocked(self) -> Dict[str, float]:
+        """Retry-After deadlines that survive restarts (wall-clock timestamps)"""
+        try:
+            with open(self._retry_after_file, encoding="utf-8") as f:
+                deadlines = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        now = time.time()
+        return {host: until for host, until in deadlines.items() if until > now}
+
+    def _bucket(self, host: str, crawl_delay: Optional[float]) -> HostBucket:
+        """Bucket for a host, honoring the larger of our rate limit and Crawl-delay"""
+        interval = max(self.config.rate_limit_ms / 1000.0, crawl_delay or 0.0)
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = HostBucket(interval, self.config.rate_limit_burst)
+            self._buckets[host] = bucket
+        else:
+            bucket.interval_s = interval
+
+        if host in self._blocked_until:
+            remaining = self._blocked_until[host] - time.time()
+            bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + remaining)
+        return bucket
+
+    async def allowed(self, url: str) -> bool:
+        """Whether robots.txt permits fetching the URL"""
+        if not self.config.respect_robots_txt:
+            return True
+        parser = await self.robots.get(url)
+        return parser.can_fetch(ROBOTS_USER_AGENT, url)
+
+    async def acquire(self, url: str):
+        """Wait until the URL's host may receive another request"""
+        crawl_delay = None
+        if self.config.respect_robots_txt:
+            parser = await self.robots.get(url)
+            crawl_delay = parser.crawl_delay(ROBOTS_USER_AGENT)
+
+        bucket = self._bucket(host_of(url), float(crawl_delay) if crawl_delay else None)
+        wait = bucket.reserve(time.monotonic())
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def defer(self, url: str, seconds: float, persist: bool = True):
+        """
+        Pause all requests to the URL's host (e.g. after a Retry-After).
+        Short retry back-offs pass persist=False to skip the disk write.
+        """
+        host = host_of(url)
+        until = time.time() + seconds
+        if until <= self._blocked_until.get(host, 0):
+            return
+
+        self._blocked_until[host] = until
+        bucket = self._buckets.get(host)
+        if bucket is not None:
+            bucket.blocked_until = time.monotonic() + seconds
+        logger.debug(f"Deferring {host} for {seconds:.1f}s")
+        if not persist:
+            return
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(self._retry_after_file, "w", encoding="utf-8") as f:
+                json.dump(self._blocked_until, f)
+        except OSError as e:
+            logger.warning(f"Could not persist Retry-After state: {e}")
+
+
+__all__ = [
+    'PolitenessScheduler',
+    'RobotsCache',
+    'HostBucket',
+    'host_of',
+    'parse_retry_after'
+]
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+HUNTER QUALIFICATION ENGINE
+===========================
+Columnar, vectorized lead qualification
+
+Leads are loaded once into NumPy columns (values, field presence, types,
+coordinates) and every rule is a vector operation over those columns
+producing a boolean mask. A lead qualifies when all masks pass; the
+per-rule masks are kept so a run can report why leads were rejected.
+
+Rules come from the hunter blueprint (apps/biz-ops/blueprints/hunter.json):
+`inputs.min_project_value` plus the optional `inputs.qualification` block
+(required fields, project type allowlist, metro centers and radii).
+"""
+
+import json
+import math
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from spatial_index import GeoIndex, Metro
+
+HUNTER_BLUEPRINT = Path(__file__).parent.parent / "biz-ops" / "blueprints" / "hunter.json"
+
+DEFAULT_MIN_VALUE = 100000
+DEFAULT_REQUIRED_FIELDS = ("location", "contact")
+
+_RADIUS = re.compile(r"(\d+(?:\.\d+)?)\s*-?\s*mile", re.IGNORECASE)
+
+
+class LeadColumns:
+    """
+    Column view of a batch of leads.
+
+    Columns are built on first use and cached, so a rule set only pays for
+    the fields its rules actually read.
+    """
+
+    def __init__(self, leads: Sequence[Dict[str, Any]]):
+        self.leads = leads
+        self.size = len(leads)
+        self._cache: Dict[str, np.ndarray] = {}
+        self._geo_index: Optional[GeoIndex] = None
+
+    def values(self, name: str) -> np.ndarray:
+        """Numeric column (float64); missing or non-numeric values are NaN"""
+        key = f"values:{name}"
+        if key not in self._cache:
+            self._cache[key] = np.fromiter(
+                (_number(lead.get(name)) for lead in self.leads), dtype=np.float64, count=self.size
+            )
+        return self._cache[key]
+
+    def present(self, name: str) -> np.ndarray:
+        """True where the field is set to a non-empty value"""
+        key = f"present:{name}"
+        if key not in self._cache:
+            self._cache[key] = np.fromiter(
+                (bool(lead.get(name)) for lead in self.leads), dtype=bool, count=self.size
+            )
+        return self._cache[key]
+
+    def strings(self, name: str) -> np.ndarray:
+        """Normalized (stripped, lowercase) string column; missing values are ''"""
+        key = f"strings:{name}"
+        if key not in self._cache:
+            self._cache[key] = np.array(
+                [str(lead.get(name) or "").strip().lower() for lead in self.leads], dtype=str
+            ) if self.size else np.array([], dtype=str)
+        return self._cache[key]
+
+    def geo_index(self) -> GeoIndex:
+        """Spatial index over the lat/lng columns, shared by every geo rule"""
+        if self._geo_index is None:
+            self._geo_index = GeoIndex.build(self.values("lat"), self.values("lng"))
+        return self._geo_index
+
+
+def _number(value: Any) -> float:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return math.nan
+
+
+@dataclass
+class Rule:
+    """A named qualification rule; `mask` returns True where a lead passes"""
+    name: str
+
+    def mask(self, columns: LeadColumns) -> np.ndarray:
+        raise NotImplementedError
+
+
+@dataclass
+class MinValue(Rule):
+    column: str = "project_value"
+    minimum: float = DEFAULT_MIN_VALUE
+
+    def mask(self, columns: LeadColumns) -> np.ndarray:
+        # NaN (missing value) compares False, so unpriced leads fail
+        return columns.values(self.column) >= self.minimum
+
+
+@dataclass
+class RequiredField(Rule):
+    column: str = ""
+
+    def mask(self, columns: LeadColumns) -> np.ndarray:
+        return columns.present(self.column)
+
+
+@dataclass
+class AllowedValues(Rule):
+    column: str = "project_type"
+    allowed: List[str] = field(default_factory=list)
+
+    def mask(self, columns: LeadColumns) -> np.ndarray:
+        return np.isin(columns.strings(self.column), [value.strip().lower() for value in self.allowed])
+
+
+@dataclass
+class WithinMetros(Rule):
+    metros: List[Metro] = field(default_factory=list)
+    require_coordinates: bool = False  # Leads without lat/lng pass unless this is set
+
+    def assign(self, columns: LeadColumns) -> np.ndarray:
+        """Per lead, the index of the closest metro containing it (-1 when none)"""
+        return columns.geo_index().assign(self.metros)
+
+    def mask(self, columns: LeadColumns) -> np.ndarray:
+        inside = self.assign(columns) >= 0
+        return inside if self.require_coordinates else inside | ~columns.geo_index().located()
+
+
+@dataclass
+class Qualification:
+    """Outcome of a rule set over a batch of leads"""
+    passed: np.ndarray
+    masks: Dict[str, np.ndarray]
+
+    @property
+    def count(self) -> int:
+        return int(self.passed.sum())
+
+    def failures(self) -> Dict[str, int]:
+        """Leads rejected by each rule (a lead can fail several)"""
+        return {name: int((~mask).sum()) for name, mask in self.masks.items()}
+
+    def positions(self) -> List[int]:
+        """Indices of the leads that passed every rule"""
+        return np.flatnonzero(self.passed).tolist()
+
+    def select(self, leads: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [leads[i] for i in self.positions()]
+
+
+@dataclass
+class RuleSet:
+    """
+    Rules that must all pass for a lead to qualify.
+
+    Usage:
+        rules = RuleSet.from_blueprint()
+        result = rules.evaluate(leads)
+        qualified = result.select(leads)
+    """
+    rules: List[Rule]
+
+    def evaluate(self, leads: Union[Sequence[Dict[str, Any]], LeadColumns]) -> Qualification:
+        """Per-rule masks and their conjunction; pass LeadColumns to reuse built columns"""
+        columns = leads if isinstance(leads, LeadColumns) else LeadColumns(leads)
+        passed = np.ones(columns.size, dtype=bool)
+        masks = {}
+        for rule in self.rules:
+            masks[rule.name] = rule.mask(columns)
+            passed &= masks[rule.name]
+        return Qualification(passed=passed, masks=masks)
+
+    def rule(self, name: str) -> Optional[Rule]:
+        return next((rule for rule in self.rules if rule.name == name), None)
+
+    @classmethod
+    def from_config(cls, inputs: Dict[str, Any]) -> "RuleSet":
+        """Build rules from a blueprint's `inputs` section"""
+        config = inputs.get("qualification", {})
+        rules: List[Rule] = [
+            MinValue("min_value", minimum=float(inputs.get("min_project_value", DEFAULT_MIN_VALUE)))
+        ]
+        rules.extend(
+            RequiredField(f"has_{name}", column=name)
+            for name in config.get("required_fields", DEFAULT_REQUIRED_FIELDS)
+        )
+        if config.get("project_types"):
+            rules.append(AllowedValues("project_type", allowed=list(config["project_types"])))
+
+        # Metros without their own radius use the one in target_area ("100-mile radius")
+        radius = _radius_from_area(inputs.get("target_area"))
+        metros = [Metro.from_dict(metro, radius) for metro in config.get("metros", [])]
+        if metros:
+            rules.append(WithinMetros(
+                "within_metro",
+                metros=metros,
+                require_coordinates=bool(config.get("require_coordinates", False))
+            ))
+        return cls(rules)
+
+    @classmethod
+    def from_blueprint(cls, path: Path = HUNTER_BLUEPRINT) -> "RuleSet":
+        """Rules from the hunter blueprint; the historical defaults when it's missing"""
+        try:
+            with open(path, encoding="utf-8") as f:
+                blueprint = json.load(f)
+        except FileNotFoundError:
+            blueprint = {}
+        return cls.from_config(blueprint.get("inputs", {}))
+
+
+def _radius_from_area(target_area: Optional[str]) -> Optional[float]:
+    """Radius out of a target area like "Orlando, FL (100-mile radius)\""""
+    match = _RADIUS.search(target_area or "")
+    return float(match.group(1)) if match else None
+
+
+__all__ = [
+    'LeadColumns',
+    'Rule',
+    'MinValue',
+    'RequiredField',
+    'AllowedValues',
+    'WithinMetros',
+    'RuleSet',
+    'Qualification',
+    'HUNTER_BLUEPRINT'
+]
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+SHADOW RETRY POLICY
+===================
+Error classification and back-off for scraper retries
+
+Every failed attempt is classified as:
+- retryable or fatal (dead URLs and missing content stop immediately)
+- scoped to the target, the host (back off every request to it) or the
+  instance (retry on a different browser)
+
+Back-off is exponential with full jitter, capped at max_delay_s.
+"""
+
+import random
+import re
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import List, Optional, Tuple
+
+
+class ErrorScope(Enum):
+    """What a failure says is broken"""
+    TARGET = "target"  # This URL only
+    HOST = "host"  # Every URL on the same host
+    INSTANCE = "instance"  # The browser instance that ran the attempt
+
+
+@dataclass(frozen=True)
+class ErrorClass:
+    """Classification of a failed attempt"""
+    name: str
+    retryable: bool
+    scope: ErrorScope
+
+
+class ScrapeError(Exception):
+    """Failed scrape attempt, carrying the HTTP status when there was a response"""
+
+    def __init__(self, message: str, status: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+DNS_FAILURE = ErrorClass("dns_failure", False, ErrorScope.HOST)
+TLS_FAILURE = ErrorClass("tls_failure", False, ErrorScope.HOST)
+CONNECTION_FAILURE = ErrorClass("connection_failure", True, ErrorScope.HOST)
+NAVIGATION_TIMEOUT = ErrorClass("navigation_timeout", True, ErrorScope.HOST)
+SELECTOR_MISS = ErrorClass("selector_miss", False, ErrorScope.TARGET)
+ROBOTS_DISALLOWED = ErrorClass("robots_disallowed", False, ErrorScope.TARGET)
+BROWSER_FAILURE = ErrorClass("browser_failure", True, ErrorScope.INSTANCE)
+THROTTLED = ErrorClass("throttled", True, ErrorScope.HOST)
+SERVER_ERROR = ErrorClass("server_error", True, ErrorScope.HOST)
+SERVER_UNSUPPORTED = ErrorClass("server_unsupported", False, ErrorScope.TARGET)  # 501 / 505: retrying won't help
+CLIENT_ERROR = ErrorClass("client_error", False, ErrorScope.TARGET)
+UNKNOWN = ErrorClass("unknown", True, ErrorScope.INSTANCE)
+
+# Ordered (pattern, class) pairs matched against the error message
+DEFAULT_MESSAGE_RULES: List[Tuple[str, ErrorClass]] = [
+    (r"net::ERR_NAME_NOT_RESOLVED|net::ERR_NAME_RESOLUTION_FAILED|getaddrinfo|ENOTFOUND", DNS_FAILURE),
+    (r"net::ERR_SSL_|net::ERR_CERT_|CERTIFICATE_VERIFY_FAILED", TLS_FAILURE),
+    (r"[Dd]isallowed by robots", ROBOTS_DISALLOWED),
+    (r"waiting for (selector|locator)", SELECTOR_MISS),
+    (r"Target (page, context or browser )?(has been )?closed|Browser has been closed|crash|"
+     r"Connection closed|Execution context was destroyed", BROWSER_FAILURE),
+    (r"ERR_CONNECTION_(REFUSED|RESET|CLOSED|TIMED_OUT)|ERR_TIMED_OUT|ERR_NETWORK_CHANGED|ERR_EMPTY_RESPONSE|"
+     r"ERR_ADDRESS_UNREACHABLE", CONNECTION_FAILURE),
+    (r"Timeout \d+ms exceeded", NAVIGATION_TIMEOUT),
+]
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Retry behaviour for ScraperOrchestrator.scrape().
+    The number of attempts comes from ScraperConfig.retry_attempts.
+    """
+    base_delay_s: float = 1.0
+    max_delay_s: float = 30.0
+    multiplier: float = 2.0
+    switch_instance: bool = True  # Retry on a different instance than the one that failed
+    message_rules: List[Tuple[str, ErrorClass]] = field(
+        default_factory=lambda: list(DEFAULT_MESSAGE_RULES)
+    )
+
+    def __post_init__(self):
+        self._compiled = [(re.compile(pattern), error_class) for pattern, error_class in self.message_rules]
+
+    def classify(self, error: BaseException) -> ErrorClass:
+        """Classify a failed attempt by HTTP status, then by message"""
+        status = getattr(error, "status", None)
+        if status is not None:
+            if status in (429, 503):
+                return THROTTLED
+            if status in (501, 505):
+                return SERVER_UNSUPPORTED
+            if status == 408 or status >= 500:
+                return SERVER_ERROR
+            if 400 <= status < 500:
+                return CLIENT_ERROR
+
+        message = str(error)
+        for pattern, error_class in self._compiled:
+            if pattern.search(message):
+                return error_class
+        return UNKNOWN
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number `attempt` (0-based): full-jitter exponential"""
+        ceiling = min(self.max_delay_s, self.base_delay_s * (self.multiplier ** attempt))
+        return random.uniform(0, ceiling)
+
+
+__all__ = [
+    'RetryPolicy',
+    'ScrapeError',
+    'ErrorClass',
+    'ErrorScope'
+]
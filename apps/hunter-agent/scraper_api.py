@@ -7,21 +7,27 @@ REST API wrapper for the scraper orchestrator
 Provides HTTP endpoints for:
 - Starting/stopping orchestrator
 - Submitting scrape jobs
-- Retrieving results
+- Tracking job progress
+- Retrieving results (paged with a cursor, or streamed as NDJSON/SSE)
+- Coordinating remote workers for distributed jobs (see distributed.py)
 - Monitoring metrics
 
 Compatible with free resources and enterprise deployment
 """
 
+import asyncio
+import itertools
 import json
 import logging
+import os
 import uuid
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 # Conditional imports for API framework
 try:
     from fastapi import BackgroundTasks, FastAPI, HTTPException
+    from fastapi.responses import StreamingResponse
     from pydantic import BaseModel
     HAS_FASTAPI = True
 except ImportError:
@@ -29,6 +35,10 @@ except ImportError:
     # Fallback for basic HTTP server
     from http.server import HTTPServer, BaseHTTPRequestHandler
 
+from distributed import Coordinator, UnknownWorker, result_from_wire
+from job_store import JobStore, MemoryJobStore, SQLiteJobStore
+from politeness import host_of
+from work_queue import WorkQueue, target_to_dict
 from scraper_orchestrator import (ScraperConfig, ScrapeResult, ScraperMode,
                                   ScraperOrchestrator, ScrapeTarget, SiteType)
 
@@ -37,7 +47,62 @@ logger = logging.getLogger('ScraperAPI')
 
 # Global orchestrator instance
 orchestrator: Optional[ScraperOrchestrator] = None
-job_results: Dict[str, List[ScrapeResult]] = {}
+job_updates: Dict[str, asyncio.Condition] = {}
+
+FINISHED_STATUSES = ("completed", "failed", "interrupted")
+
+
+def create_job_store() -> JobStore:
+    """Job store selected by SCRAPER_JOB_STORE (sqlite | memory)"""
+    bounds = {
+        "ttl_hours": float(os.getenv("SCRAPER_JOB_TTL_HOURS", "24")),
+        "max_bytes": int(os.getenv("SCRAPER_JOB_MAX_MB", "512")) * 1024 * 1024,
+        "hot_jobs": int(os.getenv("SCRAPER_JOB_HOT", "8")),
+        "hot_bytes": int(os.getenv("SCRAPER_JOB_HOT_MB", "32")) * 1024 * 1024
+    }
+    if os.getenv("SCRAPER_JOB_STORE", "sqlite") == "memory":
+        return MemoryJobStore(**bounds)
+    path = os.getenv("SCRAPER_JOB_DB", os.path.join(ScraperConfig.cache_dir, "jobs.sqlite3"))
+    return SQLiteJobStore(path, **bounds)
+
+
+job_store: JobStore = create_job_store()
+WORK_QUEUE_DB = os.getenv("SCRAPER_QUEUE_DB", os.path.join(ScraperConfig.cache_dir, "work_queue.sqlite3"))
+coordinator = Coordinator(lease_seconds=float(os.getenv("SCRAPER_LEASE_SECONDS", "120")))
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def result_to_dict(result: ScrapeResult) -> Dict[str, Any]:
+    """JSON-safe view of a scrape result"""
+    return {
+        "target_id": result.target_id,
+        "url": result.url,
+        "success": result.success,
+        "data": result.data,
+        "error": result.error,
+        "items_extracted": result.items_extracted,
+        "execution_time_ms": result.execution_time_ms,
+        "unchanged": result.unchanged
+    }
+
+
+def job_status(job_id: str) -> Optional[Dict[str, Any]]:
+    """Progress counters for a job, or None if it doesn't exist (or was evicted)"""
+    job = job_store.get_job(job_id)
+    if job is None:
+        return None
+    return {
+        "job_id": job_id,
+        "status": job["status"],
+        "total": job["total"],
+        "completed": job["successful"] + job["failed"],
+        "successful": job["successful"],
+        "failed": job["failed"],
+        "submitted_at": job["submitted_at"],
+        "finished_at": job["finished_at"]
+    }
 
 
 if HAS_FASTAPI:
@@ -54,14 +119,37 @@ if HAS_FASTAPI:
         site_type: str = "generic"
         mode: str = "scrape"
         selectors: Optional[Dict[str, str]] = None
-        max_instances: Optional[int] = 10
+        row_selector: Optional[str] = None
+        requires_js: bool = False
+        max_instances: Optional[int] = 10  # Concurrency cap for this job (None: the whole pool)
+        distributed: bool = False  # Hand targets to remote workers instead of the local orchestrator
 
     class OrchestratorConfig(BaseModel):
         """Configuration for orchestrator"""
         max_instances: int = 10
+        min_instances: int = 1
+        autoscale: bool = False
+        change_detection: bool = False
         headless: bool = True
         timeout_seconds: int = 30
 
+    class WorkerRegistration(BaseModel):
+        """Remote worker announcing itself to the coordinator"""
+        hostname: str
+        capacity: int = 20
+
+    class LeaseRequest(BaseModel):
+        """How many targets a worker has room for"""
+        limit: int
+
+    class ResultBatch(BaseModel):
+        """Results for leased targets: [{job_id, task_id, result}]"""
+        results: List[Dict[str, Any]]
+
+    class ReleaseRequest(BaseModel):
+        """Leases handed back unfinished: [{job_id, task_id}]"""
+        leases: List[Dict[str, Any]]
+
     @app.post("/orchestrator/start")
     async def start_orchestrator(config: OrchestratorConfig):
         """Start the scraper orchestrator"""
@@ -72,6 +160,9 @@ if HAS_FASTAPI:
 
         scraper_config = ScraperConfig(
             max_instances=config.max_instances,
+            min_instances=config.min_instances,
+            autoscale=config.autoscale,
+            change_detection=config.change_detection,
             headless=config.headless,
             timeout_seconds=config.timeout_seconds
         )
@@ -107,8 +198,10 @@ if HAS_FASTAPI:
     @app.post("/scrape/submit")
     async def submit_scrape_job(request: ScrapeJobRequest, background_tasks: BackgroundTasks):
         """Submit a scrape job"""
-        if not orchestrator or not orchestrator._running:
+        if not request.distributed and (not orchestrator or not orchestrator._running):
             raise HTTPException(status_code=400, detail="Orchestrator not running. Start it first.")
+        if request.max_instances is not None and request.max_instances < 1:
+            raise HTTPException(status_code=400, detail="max_instances must be at least 1")
 
         job_id = str(uuid.uuid4())
 
@@ -119,46 +212,215 @@ if HAS_FASTAPI:
                 url=url,
                 site_type=SiteType[request.site_type.upper()],
                 mode=ScraperMode[request.mode.upper()],
-                selectors=request.selectors or {}
+                selectors=request.selectors or {},
+                row_selector=request.row_selector,
+                requires_js=request.requires_js
             )
             targets.append(target)
 
-        # Execute scraping in background
-        background_tasks.add_task(execute_scrape_job, job_id, targets)
+        # Duplicate URLs are queued once, so the job expects one result per queued target
+        queue = WorkQueue(WORK_QUEUE_DB, job_id)
+        total = enqueue_interleaved(queue, targets)
+        queue.close()
+
+        job_store.create_job(job_id, total)
+        job_updates[job_id] = asyncio.Condition()
+
+        if request.distributed:
+            await open_distributed_job(job_id, request.max_instances)
+        else:
+            # Execute scraping in background
+            background_tasks.add_task(execute_scrape_job, job_id, request.max_instances)
 
         return {
             "job_id": job_id,
             "status": "submitted",
-            "target_count": len(targets)
+            "target_count": total
         }
 
+    @app.post("/scrape/resume/{job_id}")
+    async def resume_scrape_job(job_id: str, background_tasks: BackgroundTasks, distributed: bool = False):
+        """Resume a job interrupted by a restart, scraping only its unfinished targets"""
+        if not distributed and (not orchestrator or not orchestrator._running):
+            raise HTTPException(status_code=400, detail="Orchestrator not running. Start it first.")
+        job = job_store.get_job(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        if job["status"] != "interrupted":
+            raise HTTPException(status_code=409, detail=f"Job is {job['status']}, not interrupted")
+
+        queue = WorkQueue(WORK_QUEUE_DB, job_id)
+        remaining = queue.unfinished()
+        queue.close()
+
+        job_store.update_job(job_id, status="queued", finished_at=None)
+        job_updates[job_id] = asyncio.Condition()
+        if distributed:
+            await open_distributed_job(job_id)
+        else:
+            background_tasks.add_task(execute_scrape_job, job_id)
+
+        return {"job_id": job_id, "status": "resumed", "remaining": remaining}
+
+    @app.get("/scrape/status/{job_id}")
+    async def get_job_status(job_id: str):
+        """Get progress counts for a scrape job"""
+        status = job_status(job_id)
+        if status is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+
+        return status
+
     @app.get("/scrape/results/{job_id}")
-    async def get_job_results(job_id: str):
-        """Get results for a scrape job"""
-        if job_id not in job_results:
-            raise HTTPException(status_code=404, detail="Job not found or still processing")
+    async def get_job_results(job_id: str, cursor: int = 0, limit: int = DEFAULT_PAGE_SIZE,
+                              include_unchanged: bool = False):
+        """
+        Get one page of results for a scrape job.
+        Results are available as soon as each target finishes; follow
+        `next_cursor` until it is null and the job status is completed.
+        Pages that did not change since the last scrape are left out unless
+        include_unchanged is set, so a page can hold fewer than `limit`.
+        """
+        if cursor < 0 or not 1 <= limit <= MAX_PAGE_SIZE:
+            raise HTTPException(status_code=400, detail=f"cursor must be >= 0 and limit 1-{MAX_PAGE_SIZE}")
+        status = job_status(job_id)
+        if status is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+
+        page = job_store.get_results(job_id, cursor, limit)
+        next_cursor = cursor + len(page)
+        more = next_cursor < status["completed"] or status["status"] not in FINISHED_STATUSES
+
+        return {
+            **status,
+            "cursor": cursor,
+            "next_cursor": next_cursor if more else None,
+            "results": [result_to_dict(r) for r in page if include_unchanged or not r.unchanged]
+        }
 
-        results = job_results[job_id]
+    @app.get("/scrape/stream/{job_id}")
+    async def stream_job_results(job_id: str, cursor: int = 0, format: str = "ndjson",
+                                 include_unchanged: bool = False):
+        """
+        Stream results as they arrive, as NDJSON lines or Server-Sent Events.
+        Unchanged pages are skipped unless include_unchanged is set. The
+        stream ends with the job status: a `done` event, or an NDJSON line
+        with "done": true.
+        """
+        if job_store.get_job(job_id) is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        if format not in ("ndjson", "sse"):
+            raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'sse'")
+
+        async def events() -> AsyncIterator[str]:
+            async for position, result in follow_job(job_id, cursor):
+                if result.unchanged and not include_unchanged:
+                    continue
+                payload = json.dumps({"cursor": position, **result_to_dict(result)}, default=str)
+                if format == "sse":
+                    yield f"id: {position}\nevent: result\ndata: {payload}\n\n"
+                else:
+                    yield payload + "\n"
+
+            # The job can be evicted while a slow client is still reading
+            status = job_status(job_id)
+            if status is None:
+                return
+            summary = json.dumps(status)
+            if format == "sse":
+                yield f"event: done\ndata: {summary}\n\n"
+            else:
+                yield json.dumps({"done": True, **status}) + "\n"
+
+        media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+        return StreamingResponse(events(), media_type=media_type)
+
+    async def follow_job(job_id: str, cursor: int = 0) -> AsyncIterator[tuple]:
+        """Yield (position, result) from the cursor onward until the job finishes or is evicted"""
+        position = cursor
+
+        def finished() -> bool:
+            job = job_store.get_job(job_id)
+            return job is None or job["status"] in FINISHED_STATUSES
+
+        while True:
+            page = job_store.get_results(job_id, position, DEFAULT_PAGE_SIZE)
+            for result in page:
+                yield position, result
+                position += 1
+            if page:
+                continue
+
+            condition = job_updates.get(job_id)
+            if condition is None or finished():
+                return
+
+            async with condition:
+                await condition.wait_for(
+                    lambda: job_store.result_count(job_id) > position or finished()
+                )
+
+    @app.post("/workers/register")
+    async def register_worker(registration: WorkerRegistration):
+        """Register a remote worker; returns its id and the lease length"""
+        return await coordinator.register(registration.hostname, registration.capacity)
 
+    @app.post("/workers/{worker_id}/lease")
+    async def lease_targets(worker_id: str, request: LeaseRequest):
+        """Check out up to `limit` targets from open distributed jobs"""
+        try:
+            leases = await coordinator.lease(worker_id, request.limit)
+        except UnknownWorker:
+            raise HTTPException(status_code=404, detail="Unknown worker, register again")
         return {
-            "job_id": job_id,
-            "total": len(results),
-            "successful": sum(1 for r in results if r.success),
-            "failed": sum(1 for r in results if not r.success),
-            "results": [
-                {
-                    "target_id": r.target_id,
-                    "url": r.url,
-                    "success": r.success,
-                    "data": r.data,
-                    "error": r.error,
-                    "items_extracted": r.items_extracted,
-                    "execution_time_ms": r.execution_time_ms
-                }
-                for r in results
+            "leases": [
+                {"job_id": lease.job_id, "task_id": lease.task_id, "target": target_to_dict(lease.target)}
+                for lease in leases
             ]
         }
 
+    @app.post("/workers/{worker_id}/heartbeat")
+    async def worker_heartbeat(worker_id: str):
+        """Extend every lease the worker holds"""
+        try:
+            return {"extended": await coordinator.heartbeat(worker_id)}
+        except UnknownWorker:
+            raise HTTPException(status_code=404, detail="Unknown worker, register again")
+
+    @app.post("/workers/{worker_id}/results")
+    async def submit_worker_results(worker_id: str, batch: ResultBatch):
+        """Accept results for leased targets"""
+        results = [
+            (item["job_id"], item["task_id"], result_from_wire(item["result"]))
+            for item in batch.results
+        ]
+        try:
+            return await coordinator.complete(worker_id, results)
+        except UnknownWorker:
+            raise HTTPException(status_code=404, detail="Unknown worker, register again")
+
+    @app.post("/workers/{worker_id}/release")
+    async def release_leases(worker_id: str, request: ReleaseRequest):
+        """Hand unfinished leases back without counting an attempt"""
+        try:
+            await coordinator.release(worker_id, [(item["job_id"], item["task_id"]) for item in request.leases])
+        except UnknownWorker:
+            raise HTTPException(status_code=404, detail="Unknown worker, register again")
+        return {"status": "released"}
+
+    @app.delete("/workers/{worker_id}")
+    async def unregister_worker(worker_id: str):
+        """Forget a worker, returning its leases to their queues"""
+        if worker_id not in coordinator.workers:
+            raise HTTPException(status_code=404, detail="Unknown worker")
+        await coordinator.unregister(worker_id)
+        return {"status": "unregistered"}
+
+    @app.get("/workers")
+    async def list_workers():
+        """Registered workers and open distributed jobs"""
+        return coordinator.status()
+
     @app.get("/health")
     async def health_check():
         """Health check endpoint"""
@@ -168,15 +430,68 @@ if HAS_FASTAPI:
             "timestamp": datetime.utcnow().isoformat()
         }
 
-    async def execute_scrape_job(job_id: str, targets: List[ScrapeTarget]):
-        """Execute a scrape job (background task)"""
+    async def execute_scrape_job(job_id: str, max_instances: Optional[int] = None):
+        """
+        Execute a queued scrape job (background task), publishing each result as it lands.
+        Targets come from the job's durable work queue so an interrupted job can resume.
+        """
+        condition = job_updates[job_id]
+        job_store.update_job(job_id, status="running")
+        queue = WorkQueue(WORK_QUEUE_DB, job_id)
+
         try:
-            results = await orchestrator.scrape_parallel(targets)
-            job_results[job_id] = results
-            logger.info(f"Job {job_id} completed: {len(results)} results")
+            async for task_id, result in orchestrator.scrape_queue_items(queue, max_in_flight=max_instances):
+                # A result redelivered after a restart is already stored under its task_id
+                if job_store.append_result(job_id, result, task_id):
+                    async with condition:
+                        condition.notify_all()
+
+            job_store.update_job(job_id, status="completed", finished_at=datetime.utcnow().isoformat())
+            queue.purge()
+            logger.info(f"Job {job_id} completed: {job_store.result_count(job_id)} results")
+        except asyncio.CancelledError:
+            # Shutdown: the queue keeps the unfinished targets for /scrape/resume
+            logger.warning(f"Job {job_id} interrupted")
+            job_store.update_job(job_id, status="interrupted", finished_at=datetime.utcnow().isoformat())
+            raise
         except Exception as e:
             logger.error(f"Job {job_id} failed: {e}")
-            job_results[job_id] = []
+            job_store.update_job(job_id, status="failed", finished_at=datetime.utcnow().isoformat())
+        finally:
+            queue.close()
+            async with condition:
+                condition.notify_all()
+            job_updates.pop(job_id, None)
+
+    def enqueue_interleaved(queue: WorkQueue, targets: List[ScrapeTarget]) -> int:
+        """Enqueue round-robin across hosts (the queue hands targets out in order); returns how many were new"""
+        by_host: Dict[str, List[ScrapeTarget]] = {}
+        for target in targets:
+            by_host.setdefault(host_of(target.url), []).append(target)
+        rounds = itertools.zip_longest(*by_host.values())
+        return queue.enqueue(target for round_ in rounds for target in round_ if target is not None)
+
+    async def open_distributed_job(job_id: str, max_instances: Optional[int] = None):
+        """Hand a queued job to remote workers; results arrive through /workers/{id}/results"""
+        condition = job_updates[job_id]
+        queue = WorkQueue(WORK_QUEUE_DB, job_id)
+        job_store.update_job(job_id, status="running")
+
+        async def on_result(task_id: int, result: ScrapeResult):
+            if job_store.append_result(job_id, result, task_id):
+                async with condition:
+                    condition.notify_all()
+
+        async def on_done():
+            job_store.update_job(job_id, status="completed", finished_at=datetime.utcnow().isoformat())
+            queue.purge()
+            queue.close()
+            logger.info(f"Distributed job {job_id} completed: {job_store.result_count(job_id)} results")
+            async with condition:
+                condition.notify_all()
+            job_updates.pop(job_id, None)
+
+        await coordinator.add_job(job_id, queue, on_result, on_done, max_instances)
 
 else:
     # Basic HTTP server fallback (for minimal dependencies)
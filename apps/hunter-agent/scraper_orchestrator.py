@@ -7,6 +7,16 @@ Integrated from InfinityXOneSystems/lead-sniper-system
 Features:
 - Asyncio-based parallel browser instances
 - Configurable pool (1-100+ instances)
+- Shared-browser pooling: many BrowserContext workers per Chromium process
+- Per-host politeness: rate limiting, robots.txt, Retry-After
+- Request interception profiles (block images, fonts, trackers)
+- Batched in-page extraction (one evaluate call per page)
+- Bounded-concurrency streaming over arbitrarily large target sets
+- Error-class-aware retries with jittered exponential back-off
+- Self-healing pool: health checks, crash recovery, instance recycling
+- Elastic autoscaling between min/max instances on queue depth
+- HTTP fast path: static HTML/JSON targets skip the browser entirely
+- Change detection: conditional requests and content hashes flag unchanged pages
 - Resource-efficient scaling
 - Free resources compatible (GitHub Actions)
 - Enterprise team ready
@@ -15,13 +25,28 @@ Based on lead-sniper-system/src/scrapers/headless_orchestrator.py
 """
 
 import asyncio
+import fnmatch
 import hashlib
 import logging
+import os
 import random
+import re
+import socket
+import time
+from collections import deque
+from contextlib import aclosing
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, AsyncIterable, AsyncIterator, Deque, Dict, Iterable, List, Optional, Set, Tuple, Union
+from urllib.parse import urlsplit
+
+from change_cache import ChangeCache, document_hash, spec_hash
+from extraction import EXTRACT_SCRIPT, compile_spec, count_items, parse_field
+from http_fetcher import HAS_HTTPX, HttpFetcher
+from politeness import PolitenessScheduler, host_of, parse_retry_after
+from retry_policy import ErrorScope, RetryPolicy, ScrapeError
 
 logger = logging.getLogger('ScraperOrchestrator')
 
@@ -46,17 +71,111 @@ class SiteType(Enum):
     GENERIC = "generic"
 
 
+@dataclass
+class InterceptionProfile:
+    """
+    Request interception rules applied to every worker context.
+    Pages are only read as text, so heavy assets and trackers can be dropped.
+    """
+    blocked_resource_types: List[str] = field(
+        default_factory=lambda: ['image', 'media', 'font']
+    )
+    blocked_domains: List[str] = field(default_factory=lambda: [
+        'google-analytics.com',
+        'googletagmanager.com',
+        'doubleclick.net',
+        'facebook.net',
+        'hotjar.com',
+        'newrelic.com',
+        'nr-data.net'
+    ])
+    blocked_url_patterns: List[str] = field(default_factory=list)  # fnmatch globs on the full URL
+    # Per-site exceptions: URL globs or domains that are always loaded
+    allowlist: Dict[SiteType, List[str]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self._blocked_types = frozenset(self.blocked_resource_types)
+        self._blocked_urls = _compile_globs(self.blocked_url_patterns)
+        self._allowed = {
+            site_type: (
+                _compile_globs([p for p in entries if _is_glob(p)]),
+                [d for d in entries if not _is_glob(d)]
+            )
+            for site_type, entries in self.allowlist.items()
+        }
+
+    def blocks(self, url: str, resource_type: str, site_type: Optional[SiteType] = None) -> bool:
+        """Whether a request should be aborted"""
+        host = (urlsplit(url).hostname or '').lower()
+
+        if site_type in self._allowed:
+            patterns, domains = self._allowed[site_type]
+            if (patterns and patterns.match(url)) or _domain_match(host, domains):
+                return False
+
+        if resource_type in self._blocked_types:
+            return True
+        if _domain_match(host, self.blocked_domains):
+            return True
+        return bool(self._blocked_urls and self._blocked_urls.match(url))
+
+
+def _is_glob(pattern: str) -> bool:
+    """Allowlist entries containing wildcards or a scheme are URL globs, the rest domains"""
+    return '*' in pattern or '?' in pattern or '://' in pattern
+
+
+def _compile_globs(patterns: List[str]) -> Optional[re.Pattern]:
+    """Fold fnmatch globs into a single regex"""
+    if not patterns:
+        return None
+    return re.compile('|'.join(f'(?:{fnmatch.translate(p)})' for p in patterns))
+
+
+def _domain_match(host: str, domains: List[str]) -> bool:
+    """Host equals or is a subdomain of any listed domain"""
+    return any(host == d or host.endswith('.' + d) for d in domains)
+
+
 @dataclass
 class ScraperConfig:
     """Configuration for headless scraper orchestrator"""
     max_instances: int = 10  # Default to 10 for free resources
+    min_instances: int = 1  # Autoscaling floor
+    autoscale: bool = False  # Grow with queued scrapes, shrink when idle
+    autoscale_interval_s: float = 5.0
+    autoscale_step: int = 5  # Instances added or removed per autoscaler tick
+    scale_down_idle_s: float = 60.0  # Idle time before shrinking
+    autoscale_max_latency_ms: float = 0  # Don't grow while scrape latency exceeds this (0 = ignore)
+    memory_ceiling_mb: int = 0  # Don't grow past this total browser memory (0 = no ceiling)
+    start_batch_size: int = 5  # Standalone browsers launched together at start
     headless: bool = True
     timeout_seconds: int = 30
     retry_attempts: int = 3
-    rate_limit_ms: int = 1000
+    retry_policy: RetryPolicy = field(default_factory=RetryPolicy)
+    rate_limit_ms: int = 1000  # Minimum spacing between requests to one host
+    rate_limit_burst: int = 1  # Requests a host may receive back-to-back
+    respect_robots_txt: bool = True
+    robots_cache_ttl_hours: int = 24
+    cache_dir: str = str(Path(__file__).parent / ".cache")
     user_agent_rotation: bool = True
     stealth_mode: bool = True
     screenshot_on_error: bool = False  # Disabled for resource efficiency
+    http_fast_path: bool = True  # Try a plain HTTP fetch before opening a browser page
+    http_max_connections: int = 100
+    change_detection: bool = False  # Flag results whose extracted data matches the previous scrape
+    in_flight_per_instance: int = 2  # Streaming scrapes keep max_instances * this in flight
+    interception: Optional[InterceptionProfile] = None  # None = load every resource
+    # Page readiness: networkidle | load | domcontentloaded | selector (first extraction selector)
+    wait_strategy: str = 'networkidle'
+    shared_browsers: int = 0  # 0 = one browser per instance, N = N shared browsers hosting contexts
+    context_max_pages: int = 100  # Recycle a worker context after this many pages (0 = never)
+    health_check_interval_s: float = 30.0  # Supervisor tick (0 = no supervisor)
+    health_check_timeout_s: float = 5.0
+    instance_max_navigations: int = 0  # Replace an instance after this many pages (0 = never)
+    instance_max_rss_mb: int = 0  # Browser memory ceiling before recycling (0 = no limit)
+    max_consecutive_failures: int = 3  # Instance-scoped failures in a row before replacement
+    dead_host_ttl_s: float = 600.0  # How long a host stays skipped after a DNS/TLS failure
 
 
 @dataclass
@@ -65,9 +184,12 @@ class ScrapeTarget:
     url: str
     site_type: SiteType
     mode: ScraperMode
-    selectors: Dict[str, str] = field(default_factory=dict)
+    selectors: Dict[str, str] = field(default_factory=dict)  # See extraction.py for syntax
     form_data: Optional[Dict[str, str]] = None
     output_format: str = "json"
+    wait_selector: Optional[str] = None  # Readiness selector for the 'selector' wait strategy
+    row_selector: Optional[str] = None  # When set, selectors are read per matching row
+    requires_js: bool = False  # Skip the HTTP fast path and always use a browser page
 
 
 @dataclass
@@ -81,6 +203,198 @@ class ScrapeResult:
     items_extracted: int = 0
     execution_time_ms: float = 0
     timestamp: datetime = field(default_factory=lambda: datetime.utcnow())
+    unchanged: bool = False  # Same data as the previous scrape of this URL (change_detection)
+
+
+def _launch_options(config: ScraperConfig, browser_id: str) -> Dict[str, Any]:
+    """Chromium launch options shared by standalone and pooled browsers"""
+    return {
+        'headless': config.headless,
+        'args': [
+            '--disable-blink-features=AutomationControlled',
+            '--disable-dev-shm-usage',
+            '--no-sandbox',
+            '--disable-setuid-sandbox',
+            '--disable-gpu',  # Resource efficiency
+            '--disable-software-rasterizer',
+            # Inert switch that lets get_metrics() find this browser's processes
+            _browser_tag(browser_id)
+        ]
+    }
+
+
+def _browser_tag(browser_id: str) -> str:
+    """Command-line marker identifying a browser launched by this process"""
+    return f"--construct-iq-browser={os.getpid()}-{browser_id}"
+
+
+# Process trees of the tagged browsers: tag -> [root pid, descendants...].
+# Found with a full /proc scan, which runs only when a browser is new (at most
+# every _MISSING_RESCAN_S) or, on kernels without /proc/<pid>/task/<tid>/children,
+# every _TREE_RESCAN_S to pick up new renderers. Otherwise each call reads just
+# the known trees.
+_BROWSER_TREES: Dict[str, List[int]] = {}
+_HAS_PROC_CHILDREN = os.path.exists(f'/proc/self/task/{os.getpid()}/children')
+_MISSING_RESCAN_S = 5.0
+_TREE_RESCAN_S = 30.0
+_last_scan = float('-inf')
+
+
+def _browser_memory(browser_ids: List[str]) -> Dict[str, Optional[int]]:
+    """
+    Resident memory (bytes) of each tagged browser, renderers included.
+    Reads /proc directly; returns None per browser where that is unavailable.
+    """
+    usage: Dict[str, Optional[int]] = {browser_id: None for browser_id in browser_ids}
+    if not browser_ids or not os.path.isdir('/proc'):
+        return usage
+
+    tags = {_browser_tag(browser_id): browser_id for browser_id in browser_ids}
+    live = {tag: tag in _BROWSER_TREES and _has_arg(_BROWSER_TREES[tag][0], tag) for tag in tags}
+    since_scan = time.monotonic() - _last_scan
+    if (not all(live.values()) and since_scan >= _MISSING_RESCAN_S) or \
+            (not _HAS_PROC_CHILDREN and since_scan >= _TREE_RESCAN_S):
+        _scan_browser_trees(set(tags))
+        live = {tag: tag in _BROWSER_TREES for tag in tags}
+
+    for tag, browser_id in tags.items():
+        if not live[tag]:
+            continue
+        tree = _BROWSER_TREES[tag]
+        for pid in (_process_tree(tree[0]) if _HAS_PROC_CHILDREN else tree):
+            rss = _process_rss(pid)
+            if rss is not None:
+                usage[browser_id] = (usage[browser_id] or 0) + rss
+    return usage
+
+
+def _has_arg(pid: int, arg: str) -> bool:
+    """True if process `pid` is alive with `arg` on its command line (guards against pid reuse)"""
+    try:
+        with open(f'/proc/{pid}/cmdline', 'rb') as f:
+            return arg in f.read().decode(errors='replace').split('\0')
+    except OSError:
+        return False
+
+
+def _scan_browser_trees(tags: Set[str]):
+    """Full /proc scan: record the process tree of every tagged browser"""
+    global _last_scan
+    _last_scan = time.monotonic()
+    parents: Dict[int, int] = {}
+    roots: Dict[int, str] = {}
+
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        pid = int(entry)
+        try:
+            with open(f'/proc/{pid}/stat', 'rb') as f:
+                stat = f.read().decode(errors='replace')
+            # ppid is the second field after the parenthesised command name
+            parents[pid] = int(stat.rsplit(')', 1)[1].split()[1])
+            with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                args = f.read().decode(errors='replace').split('\0')
+        except (OSError, IndexError, ValueError):
+            continue
+        for arg in args:
+            if arg in tags:
+                roots[pid] = arg
+                break
+
+    trees: Dict[str, List[int]] = {tag: [pid] for pid, tag in roots.items()}
+    for pid in parents:
+        if pid in roots:
+            continue
+        # Walk up to the nearest tagged ancestor (renderers, GPU, utility processes)
+        cursor, seen = parents.get(pid), {pid}
+        while cursor and cursor not in seen:
+            if cursor in roots:
+                trees[roots[cursor]].append(pid)
+                break
+            seen.add(cursor)
+            cursor = parents.get(cursor)
+
+    # Forget rescanned browsers that are gone and any whose root process exited
+    for tag in [tag for tag, tree in _BROWSER_TREES.items() if tag in tags or tree[0] not in parents]:
+        del _BROWSER_TREES[tag]
+    _BROWSER_TREES.update(trees)
+
+
+def _process_tree(root: int) -> List[int]:
+    """A process and its descendants, read from /proc/<pid>/task/<tid>/children"""
+    tree, pending = [], [root]
+    while pending:
+        pid = pending.pop()
+        tree.append(pid)
+        try:
+            for task in os.listdir(f'/proc/{pid}/task'):
+                with open(f'/proc/{pid}/task/{task}/children') as f:
+                    pending.extend(int(child) for child in f.read().split())
+        except (OSError, ValueError):
+            continue  # Exited meanwhile
+    return tree
+
+
+def _process_rss(pid: int) -> Optional[int]:
+    """Resident set size of a single process in bytes"""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 Chrome/120.0.0.0 Safari/537.36"
+]
+
+TargetSource = Union[Iterable[ScrapeTarget], AsyncIterable[ScrapeTarget]]
+
+
+class BrowserHost:
+    """
+    Shared Chromium process hosting many lightweight BrowserContext workers.
+    One driver and one browser serve every HeadlessInstance assigned to it.
+    """
+
+    def __init__(self, host_id: str, config: ScraperConfig):
+        self.host_id = host_id
+        self.config = config
+        self.browser = None
+        self.contexts = 0
+        self._playwright = None
+
+    async def start(self):
+        """Launch the shared browser"""
+        try:
+            from playwright.async_api import async_playwright
+
+            self._playwright = await async_playwright().start()
+            self.browser = await self._playwright.chromium.launch(
+                **_launch_options(self.config, self.host_id)
+            )
+            logger.debug(f"Browser host {self.host_id} started")
+
+        except ImportError:
+            logger.warning(f"Playwright not available for {self.host_id}, using mock mode")
+
+    async def close(self):
+        """Shut down the shared browser and its driver"""
+        try:
+            if self.browser:
+                await self.browser.close()
+            if self._playwright:
+                await self._playwright.stop()
+            self.browser = None
+            logger.debug(f"Browser host {self.host_id} closed")
+        except Exception as e:
+            logger.error(f"Cleanup error for {self.host_id}: {e}")
 
 
 class HeadlessInstance:
@@ -89,54 +403,49 @@ class HeadlessInstance:
     Optimized for resource efficiency and GitHub Actions
     """
 
-    def __init__(self, instance_id: str, config: ScraperConfig):
+    def __init__(self, instance_id: str, config: ScraperConfig, host: Optional[BrowserHost] = None):
         self.instance_id = instance_id
         self.config = config
+        self.host = host
         self.browser = None
+        self.context = None
         self.page = None
+        self.pages_served = 0
+        self.navigations = 0
+        self.consecutive_failures = 0
+        self.context_recycles = 0
+        self.last_status: Optional[int] = None
+        self.last_retry_after: Optional[str] = None
+        self.last_etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self.requests_blocked = 0
+        self._site_type: Optional[SiteType] = None
         self._active = False
         self._playwright = None
 
         # User agent pool for rotation
-        self.user_agents = [
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/120.0.0.0 Safari/537.36",
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 Chrome/120.0.0.0 Safari/537.36",
-            "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 Chrome/120.0.0.0 Safari/537.36"
-        ]
+        self.user_agents = list(USER_AGENTS)
 
     async def initialize(self):
         """Initialize the browser instance"""
         try:
-            from playwright.async_api import async_playwright
-
-            self._playwright = await async_playwright().start()
-
-            # Launch browser with resource-efficient settings
-            launch_options = {
-                'headless': self.config.headless,
-                'args': [
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-dev-shm-usage',
-                    '--no-sandbox',
-                    '--disable-setuid-sandbox',
-                    '--disable-gpu',  # Resource efficiency
-                    '--disable-software-rasterizer'
-                ]
-            }
-
-            self.browser = await self._playwright.chromium.launch(**launch_options)
-
-            # Create context with random user agent
-            context_options = {'viewport': {'width': 1280, 'height': 720}}
-            if self.config.user_agent_rotation:
-                context_options['user_agent'] = random.choice(self.user_agents)
+            if self.host is not None:
+                # Pooled mode - borrow the shared browser, own only a context
+                self.browser = self.host.browser
+                if self.browser is None:
+                    logger.warning(f"Shared browser unavailable for {self.instance_id}, using mock mode")
+                    self._active = True
+                    return
+            else:
+                from playwright.async_api import async_playwright
 
-            self.context = await self.browser.new_context(**context_options)
-            self.page = await self.context.new_page()
+                self._playwright = await async_playwright().start()
+                self.browser = await self._playwright.chromium.launch(
+                    **_launch_options(self.config, self.instance_id)
+                )
 
-            # Apply stealth mode
-            if self.config.stealth_mode:
-                await self._apply_stealth()
+            await self._open_context()
 
             self._active = True
             logger.debug(f"Instance {self.instance_id} initialized")
@@ -148,6 +457,65 @@ class HeadlessInstance:
             logger.error(f"Failed to initialize {self.instance_id}: {e}")
             raise
 
+    async def _open_context(self):
+        """Create a fresh browser context and page for this worker"""
+        # Create context with random user agent
+        context_options = {'viewport': {'width': 1280, 'height': 720}}
+        if self.config.user_agent_rotation:
+            context_options['user_agent'] = random.choice(self.user_agents)
+
+        self.context = await self.browser.new_context(**context_options)
+        if self.config.interception is not None:
+            await self.context.route('**/*', self._intercept)
+        self.page = await self.context.new_page()
+
+        # Apply stealth mode
+        if self.config.stealth_mode:
+            await self._apply_stealth()
+
+        self.pages_served = 0
+        if self.host is not None:
+            self.host.contexts += 1
+
+    async def ping(self, timeout: float = 5.0) -> bool:
+        """Check the browser is still connected and the page still answers"""
+        if not self.page:
+            return self._active  # Mock mode
+        try:
+            if not self.browser.is_connected():
+                return False
+            await asyncio.wait_for(self.page.evaluate('1'), timeout)
+            return True
+        except Exception:
+            return False
+
+    async def _intercept(self, route):
+        """Abort requests the interception profile rules out"""
+        request = route.request
+        if self.config.interception.blocks(request.url, request.resource_type, self._site_type):
+            self.requests_blocked += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _close_context(self):
+        """Close the worker's page and context, leaving the browser running"""
+        if self.page:
+            await self.page.close()
+            self.page = None
+        if self.context:
+            await self.context.close()
+            self.context = None
+            if self.host is not None:
+                self.host.contexts -= 1
+
+    async def recycle_context(self):
+        """Replace the context to release memory held by long-lived pages"""
+        await self._close_context()
+        await self._open_context()
+        self.context_recycles += 1
+        logger.debug(f"Instance {self.instance_id} recycled its context")
+
     async def _apply_stealth(self):
         """Apply stealth mode to avoid detection"""
         if self.page:
@@ -163,31 +531,44 @@ class HeadlessInstance:
                 });
             """)
 
-    async def navigate(self, url: str) -> bool:
+    async def navigate(self, url: str, site_type: Optional[SiteType] = None,
+                       wait_selector: Optional[str] = None) -> bool:
         """Navigate to a URL"""
         try:
             if self.page:
-                await self.page.goto(url, timeout=self.config.timeout_seconds * 1000)
-                await self.page.wait_for_load_state('networkidle')
+                if self.config.context_max_pages and self.pages_served >= self.config.context_max_pages:
+                    await self.recycle_context()
+                self.pages_served += 1
+                self.navigations += 1
+                self._site_type = site_type
+                self.last_error = None
+
+                timeout_ms = self.config.timeout_seconds * 1000
+                strategy = self.config.wait_strategy
+                wait_until = 'domcontentloaded' if strategy == 'selector' else strategy
+
+                response = await self.page.goto(url, timeout=timeout_ms, wait_until=wait_until)
+                self.last_status = response.status if response else None
+                self.last_retry_after = response.headers.get('retry-after') if response else None
+                self.last_etag = response.headers.get('etag') if response else None
+                self.last_modified = response.headers.get('last-modified') if response else None
+
+                if strategy == 'selector' and wait_selector:
+                    await self.page.wait_for_selector(wait_selector, state='attached', timeout=timeout_ms)
                 return True
             return True  # Mock mode
         except Exception as e:
             logger.error(f"Navigation error for {self.instance_id}: {e}")
+            self.last_error = str(e)
             return False
 
     async def extract(self, selectors: Dict[str, str]) -> Dict[str, Any]:
-        """Extract data using selectors"""
+        """Extract data using selectors (one in-page call for all fields)"""
         results = {}
 
         try:
             if self.page:
-                for key, selector in selectors.items():
-                    try:
-                        element = await self.page.query_selector(selector)
-                        if element:
-                            results[key] = await element.text_content()
-                    except Exception:
-                        results[key] = None
+                results = await self.page.evaluate(EXTRACT_SCRIPT, compile_spec(selectors))
             else:
                 # Mock mode - return empty results
                 for key in selectors:
@@ -198,23 +579,25 @@ class HeadlessInstance:
 
         return results
 
-    async def extract_all(self, selector: str, item_selectors: Dict[str, str]) -> List[Dict]:
-        """Extract multiple items"""
+    async def rendered_hash(self) -> Optional[str]:
+        """Hash of the rendered document, so an identical page can skip extraction (None in mock mode)"""
+        try:
+            if self.page:
+                return document_hash(await self.page.content())
+        except Exception as e:
+            logger.debug(f"Could not hash page for {self.instance_id}: {e}")
+        return None
+
+    async def extract_all(self, selector: str, item_selectors: Dict[str, str],
+                          limit: Optional[int] = None) -> List[Dict]:
+        """Extract multiple items (every row and field in one in-page call)"""
         items = []
 
         try:
             if self.page:
-                elements = await self.page.query_selector_all(selector)
-                for element in elements:
-                    item = {}
-                    for key, sub_selector in item_selectors.items():
-                        try:
-                            sub_element = await element.query_selector(sub_selector)
-                            if sub_element:
-                                item[key] = await sub_element.text_content()
-                        except Exception:
-                            item[key] = None
-                    items.append(item)
+                items = await self.page.evaluate(
+                    EXTRACT_SCRIPT, compile_spec(item_selectors, selector, limit)
+                )
         except Exception as e:
             logger.error(f"Extract all error for {self.instance_id}: {e}")
 
@@ -223,14 +606,13 @@ class HeadlessInstance:
     async def cleanup(self):
         """Clean up browser resources"""
         try:
-            if self.page:
-                await self.page.close()
-            if hasattr(self, 'context') and self.context:
-                await self.context.close()
-            if self.browser:
-                await self.browser.close()
-            if self._playwright:
-                await self._playwright.stop()
+            await self._close_context()
+            if self.host is None:
+                if self.browser:
+                    await self.browser.close()
+                if self._playwright:
+                    await self._playwright.stop()
+            self.browser = None
             self._active = False
             logger.debug(f"Instance {self.instance_id} cleaned up")
         except Exception as e:
@@ -252,152 +634,773 @@ class ScraperOrchestrator:
     def __init__(self, config: Optional[ScraperConfig] = None):
         self.config = config or ScraperConfig()
         self.instances: Dict[str, HeadlessInstance] = {}
+        self.hosts: List[BrowserHost] = []
         self._instance_pool: asyncio.Queue = asyncio.Queue()
+        self.politeness = PolitenessScheduler(self.config)
+        self.fetcher: Optional[HttpFetcher] = None
+        self.changes: Optional[ChangeCache] = None
         self._running = False
         self._metrics = {
             'total_scrapes': 0,
             'successful_scrapes': 0,
             'failed_scrapes': 0,
             'items_extracted': 0,
+            'errors_by_class': {},
+            'instances_replaced': 0,
+            'fast_path_hits': 0,
+            'fast_path_fallbacks': 0,
+            'unchanged_results': 0,
+            'not_modified_responses': 0,
+            'extractions_skipped': 0,
+            'health_checks': 0,
             'start_time': None
         }
+        self._dead_hosts: Dict[str, Tuple[str, float]] = {}  # host -> (error class, monotonic expiry)
+        self._target_size = 0
+        self._instance_seq = 0
+        self._starting = 0
+        self._supervisor: Optional[asyncio.Task] = None
+        self._autoscaler: Optional[asyncio.Task] = None
+        self._waiting = 0
+        self._idle_since: Optional[float] = None
+        self._latency_ewma_ms: Optional[float] = None
+        self._background: Set[asyncio.Task] = set()
         logger.info(f"ScraperOrchestrator initialized (max_instances={self.config.max_instances})")
 
     async def start(self, num_instances: int = None):
         """Start the orchestrator with specified number of instances"""
-        num_instances = num_instances or self.config.max_instances
+        num_instances = num_instances or (
+            self.config.min_instances if self.config.autoscale else self.config.max_instances
+        )
+        self._target_size = num_instances
         self._running = True
         self._metrics['start_time'] = datetime.utcnow()
 
-        logger.info(f"Starting {num_instances} headless instances...")
+        if self.config.http_fast_path:
+            if HAS_HTTPX:
+                self.fetcher = HttpFetcher(self.config, USER_AGENTS)
+            else:
+                logger.warning("httpx not available, HTTP fast path disabled")
+        if self.config.change_detection:
+            self.changes = ChangeCache(os.path.join(self.config.cache_dir, "changes.sqlite3"))
 
-        # Initialize instances in parallel (batches for resource efficiency)
-        batch_size = 5
-        for i in range(0, num_instances, batch_size):
-            batch_tasks = []
-            for j in range(i, min(i + batch_size, num_instances)):
-                instance_id = f"scraper-{j:04d}"
-                instance = HeadlessInstance(instance_id, self.config)
-                batch_tasks.append(self._init_instance(instance))
+        logger.info(f"Starting {num_instances} headless instances...")
 
-            await asyncio.gather(*batch_tasks, return_exceptions=True)
-            await asyncio.sleep(0.5)  # Brief pause between batches
+        if self.config.shared_browsers > 0:
+            await self._start_hosts()
+
+            # Contexts are cheap - open them all at once across the shared browsers
+            await asyncio.gather(
+                *[self._init_instance(self._new_instance()) for _ in range(num_instances)],
+                return_exceptions=True
+            )
+        else:
+            # Initialize instances in parallel (batches for resource efficiency)
+            batch_size = max(1, self.config.start_batch_size)
+            for i in range(0, num_instances, batch_size):
+                batch_tasks = []
+                for _ in range(i, min(i + batch_size, num_instances)):
+                    batch_tasks.append(self._init_instance(self._new_instance()))
+
+                await asyncio.gather(*batch_tasks, return_exceptions=True)
+                await asyncio.sleep(0.5)  # Brief pause between batches
 
         logger.info(f"Orchestrator started with {len(self.instances)} instances")
 
+        if self.config.health_check_interval_s > 0:
+            self._supervisor = asyncio.ensure_future(self._supervise())
+        if self.config.autoscale:
+            self._autoscaler = asyncio.ensure_future(self._autoscale())
+
+    async def _start_hosts(self):
+        """Launch the shared browsers that host pooled worker contexts"""
+        hosts = [
+            BrowserHost(f"browser-{k:02d}", self.config)
+            for k in range(self.config.shared_browsers)
+        ]
+        results = await asyncio.gather(*[host.start() for host in hosts], return_exceptions=True)
+
+        for host, result in zip(hosts, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to start browser host {host.host_id}: {result}")
+            else:
+                self.hosts.append(host)
+
+        if not self.hosts:
+            raise RuntimeError("No shared browser could be started")
+
+        logger.info(f"Started {len(self.hosts)} shared browsers")
+
+    def _new_instance(self) -> HeadlessInstance:
+        """Create an instance, assigned round-robin to a shared browser when pooling"""
+        index = self._instance_seq
+        self._instance_seq += 1
+        host = self.hosts[index % len(self.hosts)] if self.hosts else None
+        return HeadlessInstance(f"scraper-{index:04d}", self.config, host)
+
     async def _init_instance(self, instance: HeadlessInstance):
         """Initialize a single instance and add to pool"""
+        self._starting += 1
         try:
             await instance.initialize()
             self.instances[instance.instance_id] = instance
             await self._instance_pool.put(instance.instance_id)
         except Exception as e:
             logger.error(f"Failed to initialize instance {instance.instance_id}: {e}")
+        finally:
+            self._starting -= 1
+
+    def _spawn(self, coro):
+        """Run a background coroutine, keeping a reference until it finishes"""
+        task = asyncio.ensure_future(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def _recycle_reason(self, instance: HeadlessInstance) -> Optional[str]:
+        """Why an instance should be replaced, judged from its own counters"""
+        if self.config.max_consecutive_failures and \
+                instance.consecutive_failures >= self.config.max_consecutive_failures:
+            return f"{instance.consecutive_failures} consecutive failures"
+        if self.config.instance_max_navigations and instance.navigations >= self.config.instance_max_navigations:
+            return f"{instance.navigations} navigations"
+        return None
+
+    def _release_instance(self, instance_id: str):
+        """Return an instance to the pool, or replace it if it has worn out"""
+        instance = self.instances.get(instance_id)
+        if instance is None:
+            return
+        reason = self._recycle_reason(instance)
+        if reason:
+            self._spawn(self._replace_instance(instance_id, reason))
+        elif len(self.instances) > self._target_size:
+            self._spawn(self._retire_instance(instance_id))
+        else:
+            self._instance_pool.put_nowait(instance_id)
+
+    async def _retire_instance(self, instance_id: str) -> bool:
+        """Remove an instance from service and close it"""
+        instance = self.instances.pop(instance_id, None)
+        if instance is None:
+            return False
+        await instance.cleanup()
+        return True
+
+    async def _replace_instance(self, instance_id: str, reason: str):
+        """Retire an instance and start a fresh one in its place"""
+        logger.info(f"Replacing {instance_id}: {reason}")
+        if not await self._retire_instance(instance_id):
+            return
+
+        self._metrics['instances_replaced'] += 1
+        if self._running and len(self.instances) + self._starting < self._target_size:
+            await self._init_instance(self._new_instance())
+
+    def _fill_pool(self):
+        """Start instances until the pool reaches its target size"""
+        missing = self._target_size - len(self.instances) - self._starting
+        for _ in range(max(0, missing)):
+            self._spawn(self._init_instance(self._new_instance()))
+
+    def _resize(self, size: int):
+        """Set a new pool size: start instances or retire idle ones"""
+        size = max(self.config.min_instances, min(self.config.max_instances, size))
+        if size == self._target_size:
+            return
+
+        logger.info(f"Autoscaling pool {self._target_size} -> {size} instances")
+        self._target_size = size
+        self._fill_pool()
+
+        # Busy instances above the target are retired by _release_instance when they come back
+        excess = len(self.instances) - size
+        while excess > 0 and not self._instance_pool.empty():
+            instance_id = self._instance_pool.get_nowait()
+            if instance_id in self.instances:
+                self._spawn(self._retire_instance(instance_id))
+                excess -= 1
+
+    async def _autoscale(self):
+        """Background autoscaler"""
+        while self._running:
+            await asyncio.sleep(self.config.autoscale_interval_s)
+            try:
+                self._autoscale_tick(time.monotonic())
+            except Exception as e:
+                logger.error(f"Autoscaler tick failed: {e}")
+
+    def _autoscale_tick(self, now: float):
+        """Grow while scrapes queue for instances and latency is healthy; shrink when idle"""
+        size = len(self.instances) + self._starting
+        step = max(1, self.config.autoscale_step)
+
+        if self._waiting > 0:
+            self._idle_since = None
+            if size >= self.config.max_instances:
+                return
+            if self.config.autoscale_max_latency_ms and self._latency_ewma_ms is not None \
+                    and self._latency_ewma_ms > self.config.autoscale_max_latency_ms:
+                # Slow hosts, not a short pool - more browsers won't help
+                return
+            step = min(step, self._waiting)
+            if self.config.memory_ceiling_mb and self.instances:
+                known = [b['rss_mb'] for b in self._browser_metrics() if b['rss_mb'] is not None]
+                if known:
+                    total = sum(known)
+                    per_instance = total / len(self.instances)
+                    headroom = self.config.memory_ceiling_mb - total
+                    step = min(step, int(headroom // per_instance) if per_instance else step)
+                    if step <= 0:
+                        return
+            self._resize(size + step)
+
+        elif not self._instance_pool.empty() and size > self.config.min_instances:
+            if self._idle_since is None:
+                self._idle_since = now
+            elif now - self._idle_since >= self.config.scale_down_idle_s:
+                self._resize(size - step)
+                self._idle_since = now
+        else:
+            self._idle_since = None
+
+    async def _supervise(self):
+        """Background health supervisor"""
+        while self._running:
+            await asyncio.sleep(self.config.health_check_interval_s)
+            try:
+                await self._health_check()
+            except Exception as e:
+                logger.error(f"Health check failed: {e}")
+
+    async def _health_check(self):
+        """Restart crashed browsers, replace sick or bloated instances, refill the pool"""
+        self._metrics['health_checks'] += 1
+
+        for host in self.hosts:
+            if host.browser is not None and not host.browser.is_connected():
+                logger.warning(f"Shared browser {host.host_id} disconnected, restarting")
+                await host.close()
+                host.contexts = 0
+                await host.start()
+
+        over_limit: Set[str] = set()
+        if self.config.instance_max_rss_mb:
+            limit = self.config.instance_max_rss_mb * 1024 * 1024
+            over_limit = {b['browser_id'] for b in self._browser_metrics()
+                          if b['rss_mb'] is not None and b['rss_mb'] * 1024 * 1024 > limit}
+
+        # Check idle instances one at a time so the rest of the pool stays available
+        for _ in range(self._instance_pool.qsize()):
+            try:
+                instance_id = self._instance_pool.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            instance = self.instances.get(instance_id)
+            if instance is None:
+                continue
+
+            reason = self._recycle_reason(instance)
+            if reason is None and not await instance.ping(self.config.health_check_timeout_s):
+                reason = "unresponsive"
+            if reason is None and instance.host is None and instance_id in over_limit:
+                reason = "memory limit"
+
+            if reason is None and instance.host is not None and instance.host.host_id in over_limit:
+                # A shared browser can't be replaced under its workers; shed their contexts instead
+                try:
+                    await instance.recycle_context()
+                except Exception as e:
+                    reason = f"context recycle failed: {e}"
+
+            if reason:
+                self._spawn(self._replace_instance(instance_id, reason))
+            else:
+                self._instance_pool.put_nowait(instance_id)
+
+        # Replace instances that failed to initialize or were lost
+        self._fill_pool()
 
     async def stop(self):
         """Stop the orchestrator and cleanup all instances"""
         self._running = False
 
+        for task in (self._supervisor, self._autoscaler):
+            if task:
+                task.cancel()
+        self._supervisor = None
+        self._autoscaler = None
+        for task in list(self._background):
+            task.cancel()
+
         cleanup_tasks = [
             instance.cleanup()
             for instance in self.instances.values()
         ]
         await asyncio.gather(*cleanup_tasks, return_exceptions=True)
+        await asyncio.gather(*[host.close() for host in self.hosts], return_exceptions=True)
+
+        if self.fetcher:
+            await self.fetcher.close()
+            self.fetcher = None
+        if self.changes is not None:
+            self.changes.close()
+            self.changes = None
 
         self.instances.clear()
+        self.hosts.clear()
         logger.info("Orchestrator stopped")
 
+    async def _checkout_instance(self, avoid: Set[str]) -> str:
+        """
+        Take an instance from the pool, preferring one not in `avoid`.
+        Falls back to an avoided instance rather than waiting when it is the
+        only one free; ids of retired instances are dropped.
+        """
+        while True:
+            self._waiting += 1
+            try:
+                instance_id = await self._instance_pool.get()
+            finally:
+                self._waiting -= 1
+            skipped = []
+            while (instance_id not in self.instances or instance_id in avoid) and not self._instance_pool.empty():
+                if instance_id in self.instances:
+                    skipped.append(instance_id)
+                instance_id = self._instance_pool.get_nowait()
+
+            if instance_id in self.instances:
+                for other in skipped:
+                    self._instance_pool.put_nowait(other)
+                return instance_id
+
+            if skipped:
+                for other in skipped[1:]:
+                    self._instance_pool.put_nowait(other)
+                return skipped[0]
+
+    def _dead_host(self, host: str) -> Optional[str]:
+        """Error class that marked the host unreachable, until its TTL runs out"""
+        entry = self._dead_hosts.get(host)
+        if entry is None:
+            return None
+        if time.monotonic() >= entry[1]:
+            # Transient resolver or TLS trouble shouldn't skip the host for the process lifetime
+            del self._dead_hosts[host]
+            return None
+        return entry[0]
+
+    def _record_latency(self, elapsed_ms: float):
+        """Exponentially weighted scrape latency used by the autoscaler"""
+        if self._latency_ewma_ms is None:
+            self._latency_ewma_ms = elapsed_ms
+        else:
+            self._latency_ewma_ms = 0.8 * self._latency_ewma_ms + 0.2 * elapsed_ms
+
+    async def _scrape_fast_path(self, target: ScrapeTarget, target_id: str,
+                                start_time: datetime) -> Optional[ScrapeResult]:
+        """
+        Try the target over plain HTTP. Returns a result when the fast path
+        settled it (data found, or a fatal HTTP error), None to use a browser.
+        """
+        conditional = None
+        known_document = None
+        if self.changes is not None:
+            spec = spec_hash(target.selectors, target.row_selector)
+            conditional = self.changes.conditional_headers(target.url, spec)
+            known_document = self.changes.known_document(target.url, spec)
+
+        await self.politeness.acquire(target.url)
+        try:
+            outcome = await self.fetcher.fetch(target.url, target.selectors, target.row_selector,
+                                               conditional, known_document)
+        except Exception as e:
+            logger.debug(f"Fast path failed for {target.url}: {e}")
+            self._metrics['fast_path_fallbacks'] += 1
+            return None
+
+        if outcome.status >= 400:
+            error = ScrapeError(f"HTTP {outcome.status}", status=outcome.status,
+                                retry_after=parse_retry_after(outcome.retry_after))
+            error_class = self.config.retry_policy.classify(error)
+            if not error_class.retryable:
+                errors = self._metrics['errors_by_class']
+                errors[error_class.name] = errors.get(error_class.name, 0) + 1
+                return self._failed(target_id, target, start_time, f"{error_class.name}: {error}")
+            if error.retry_after:
+                self.politeness.defer(target.url, error.retry_after)
+            self._metrics['fast_path_fallbacks'] += 1
+            return None
+
+        if outcome.status == 304 or outcome.same_document:
+            # Not modified, or the same body as last time: reuse the stored extraction without parsing anything
+            state = self.changes.not_modified(target.url) if self.changes is not None else None
+            if state is None:
+                self._metrics['fast_path_fallbacks'] += 1
+                return None
+            if outcome.status == 304:
+                self._metrics['not_modified_responses'] += 1
+            self._metrics['extractions_skipped'] += 1
+            outcome.data = state.data
+            unchanged = True
+        elif not outcome.found:
+            self._metrics['fast_path_fallbacks'] += 1
+            return None
+        else:
+            unchanged = self._unchanged(target, outcome.data, outcome.etag, outcome.last_modified,
+                                        outcome.document_hash)
+
+        items = count_items(outcome.data)
+        execution_time = (datetime.utcnow() - start_time).total_seconds() * 1000
+        self._metrics['total_scrapes'] += 1
+        self._metrics['successful_scrapes'] += 1
+        self._metrics['items_extracted'] += items
+        self._metrics['fast_path_hits'] += 1
+        self._metrics['unchanged_results'] += int(unchanged)
+        self._record_latency(execution_time)
+
+        return ScrapeResult(
+            target_id=target_id,
+            url=target.url,
+            success=True,
+            data=outcome.data,
+            items_extracted=items,
+            execution_time_ms=execution_time,
+            unchanged=unchanged
+        )
+
+    def _unchanged(self, target: ScrapeTarget, data: Any, etag: Optional[str],
+                   last_modified: Optional[str], document: Optional[str] = None) -> bool:
+        """Record a fresh extraction; True when it matches the previous scrape"""
+        if self.changes is None:
+            return False
+        spec = spec_hash(target.selectors, target.row_selector)
+        return not self.changes.record(target.url, spec, data, etag, last_modified, document)
+
+    def _failed(self, target_id: str, target: ScrapeTarget, start_time: datetime, error: str) -> ScrapeResult:
+        """Record and build a failed result"""
+        self._metrics['total_scrapes'] += 1
+        self._metrics['failed_scrapes'] += 1
+        return ScrapeResult(
+            target_id=target_id,
+            url=target.url,
+            success=False,
+            error=error,
+            execution_time_ms=(datetime.utcnow() - start_time).total_seconds() * 1000
+        )
+
     async def scrape(self, target: ScrapeTarget) -> ScrapeResult:
-        """Execute a single scrape operation with auto-retry"""
+        """Execute a single scrape operation with classified, backed-off retries"""
         start_time = datetime.utcnow()
         target_id = hashlib.md5(target.url.encode()).hexdigest()[:12]
+        policy = self.config.retry_policy
+        host = host_of(target.url)
+
+        dead = self._dead_host(host)
+        if dead:
+            return self._failed(target_id, target, start_time, f"{dead}: host unreachable")
+
+        if not await self.politeness.allowed(target.url):
+            return self._failed(target_id, target, start_time, "robots_disallowed: Disallowed by robots.txt")
+
+        if self.fetcher and not target.requires_js:
+            result = await self._scrape_fast_path(target, target_id, start_time)
+            if result is not None:
+                return result
+
+        wait_selector = target.wait_selector or target.row_selector
+        if not wait_selector and target.selectors:
+            wait_selector = parse_field('', next(iter(target.selectors.values())))['selector'] or None
+
+        tried: Set[str] = set()
+        error_message = "No attempts made"
 
         for attempt in range(self.config.retry_attempts):
-            # Get an available instance
-            instance_id = await self._instance_pool.get()
-            instance = self.instances.get(instance_id)
+            # Wait for the host's rate limit (and any back-off) before occupying an instance
+            await self.politeness.acquire(target.url)
 
-            if not instance:
-                await self._instance_pool.put(instance_id)
-                continue
+            instance_id = await self._checkout_instance(tried if policy.switch_instance else set())
+            instance = self.instances[instance_id]
 
             try:
                 # Navigate to URL
-                nav_success = await instance.navigate(target.url)
+                nav_success = await instance.navigate(target.url, target.site_type, wait_selector)
                 if not nav_success:
-                    raise Exception("Navigation failed")
+                    raise ScrapeError(instance.last_error or "Navigation failed")
+                if instance.last_status is not None and instance.last_status >= 400:
+                    raise ScrapeError(
+                        f"HTTP {instance.last_status}",
+                        status=instance.last_status,
+                        retry_after=parse_retry_after(instance.last_retry_after)
+                    )
 
-                # Extract data
-                if target.selectors:
-                    data = await instance.extract(target.selectors)
+                # An identical rendered page reuses the stored extraction
+                state = None
+                document = None
+                if self.changes is not None:
+                    document = await instance.rendered_hash()
+                    spec = spec_hash(target.selectors, target.row_selector)
+                    state = self.changes.same_document(target.url, spec, document)
+
+                if state is not None:
+                    self._metrics['extractions_skipped'] += 1
+                    data = state.data
+                    unchanged = True
                 else:
-                    data = {}
+                    # Extract data
+                    if target.row_selector:
+                        data = await instance.extract_all(target.row_selector, target.selectors)
+                    elif target.selectors:
+                        data = await instance.extract(target.selectors)
+                    else:
+                        data = {}
+                    unchanged = self._unchanged(target, data, instance.last_etag, instance.last_modified, document)
+                items = count_items(data)
 
                 execution_time = (datetime.utcnow() - start_time).total_seconds() * 1000
 
                 self._metrics['total_scrapes'] += 1
                 self._metrics['successful_scrapes'] += 1
-                self._metrics['items_extracted'] += len(data)
+                self._metrics['items_extracted'] += items
+                self._metrics['unchanged_results'] += int(unchanged)
+                self._record_latency(execution_time)
 
                 result = ScrapeResult(
                     target_id=target_id,
                     url=target.url,
                     success=True,
                     data=data,
-                    items_extracted=len(data),
-                    execution_time_ms=execution_time
+                    items_extracted=items,
+                    execution_time_ms=execution_time,
+                    unchanged=unchanged
                 )
 
-                await self._instance_pool.put(instance_id)
+                instance.consecutive_failures = 0
                 return result
 
             except Exception as e:
-                logger.warning(f"Scrape attempt {attempt + 1} failed for {target.url}: {e}")
-                await self._instance_pool.put(instance_id)
-
-                if attempt == self.config.retry_attempts - 1:
-                    # Final attempt failed
-                    execution_time = (datetime.utcnow() - start_time).total_seconds() * 1000
-                    self._metrics['total_scrapes'] += 1
-                    self._metrics['failed_scrapes'] += 1
-
-                    return ScrapeResult(
-                        target_id=target_id,
-                        url=target.url,
-                        success=False,
-                        error=str(e),
-                        execution_time_ms=execution_time
-                    )
+                error = e
+                error_class = policy.classify(e)
+                if error_class.scope is ErrorScope.INSTANCE:
+                    instance.consecutive_failures += 1
+
+            finally:
+                # Also reached when the scrape is cancelled (CancelledError is not an Exception)
+                self._release_instance(instance_id)
+
+            tried.add(instance_id)
+            errors = self._metrics['errors_by_class']
+            errors[error_class.name] = errors.get(error_class.name, 0) + 1
+            error_message = f"{error_class.name}: {error}"
+            logger.warning(f"Scrape attempt {attempt + 1} failed for {target.url}: {error_message}")
+
+            if not error_class.retryable:
+                if error_class.scope is ErrorScope.HOST:
+                    # Skip the host's other targets rather than burning browser time on them
+                    self._dead_hosts[host] = (error_class.name, time.monotonic() + self.config.dead_host_ttl_s)
+                break
+            if attempt == self.config.retry_attempts - 1:
+                break
+
+            delay = policy.backoff(attempt)
+            if error_class.scope is ErrorScope.HOST:
+                # Back off the whole host; acquire() makes every target on it wait
+                retry_after = getattr(error, 'retry_after', None)
+                if retry_after:
+                    self.politeness.defer(target.url, max(delay, retry_after))
+                else:
+                    self.politeness.defer(target.url, delay, persist=False)
+            else:
+                await asyncio.sleep(delay)
+
+        return self._failed(target_id, target, start_time, error_message)
+
+    def _in_flight_limit(self) -> int:
+        """Scrapes to keep in flight; sized for the largest pool when autoscaling"""
+        pool_size = self.config.max_instances if self.config.autoscale else len(self.instances)
+        return max(1, pool_size or self.config.max_instances) * self.config.in_flight_per_instance
+
+    @staticmethod
+    def _error_result(index: int, target: ScrapeTarget, error: BaseException) -> ScrapeResult:
+        """Result standing in for a scrape task that raised"""
+        return ScrapeResult(
+            target_id=f"error-{index}",
+            url=target.url,
+            success=False,
+            error=str(error)
+        )
 
-                await asyncio.sleep(1)  # Brief pause before retry
+    async def _scrape_indexed(self, targets: TargetSource) -> AsyncIterator[Tuple[int, ScrapeResult]]:
+        """
+        Producer/consumer core behind scrape_stream() and scrape_parallel().
+        Reads at most `limit` targets ahead and keeps at most `limit` in flight,
+        admitting from the host with the fewest in-flight scrapes so one
+        portal's backlog doesn't starve the rest. Yields (input index, result).
+        """
+        limit = self._in_flight_limit()
+        # Plain iterables are read inline; async sources are pulled as a task so
+        # a slow producer never holds back results that have already finished
+        source = None if hasattr(targets, '__aiter__') else iter(targets)
+        async_source = targets.__aiter__() if source is None else None
+        pull: Optional[asyncio.Future] = None
+        backlog: Dict[str, Deque[Tuple[int, ScrapeTarget]]] = {}
+        host_load: Dict[str, int] = {}
+        in_flight: Dict[asyncio.Future, Tuple[int, ScrapeTarget, str]] = {}
+        buffered = 0
+        next_index = 0
+        exhausted = False
+
+        try:
+            while True:
+                # Top up the lookahead window
+                while not exhausted and buffered < limit:
+                    if source is not None:
+                        target = next(source, None)
+                        if target is None:
+                            exhausted = True
+                            break
+                    else:
+                        if pull is None:
+                            pull = asyncio.ensure_future(async_source.__anext__())
+                        if not pull.done():
+                            break
+                        try:
+                            target = pull.result()
+                        except StopAsyncIteration:
+                            exhausted = True
+                            break
+                        finally:
+                            pull = None
+                    backlog.setdefault(host_of(target.url), deque()).append((next_index, target))
+                    next_index += 1
+                    buffered += 1
+
+                # Admit from the least-loaded host, rotating ties
+                while len(in_flight) < limit and buffered:
+                    host = min(backlog, key=lambda h: host_load.get(h, 0))
+                    index, target = backlog[host].popleft()
+                    buffered -= 1
+                    queued = backlog.pop(host)
+                    if queued:
+                        backlog[host] = queued
+                    host_load[host] = host_load.get(host, 0) + 1
+                    in_flight[asyncio.ensure_future(self.scrape(target))] = (index, target, host)
+
+                if not in_flight and pull is None:
+                    break
+
+                waiting = list(in_flight) + ([pull] if pull is not None else [])
+                done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task is pull:
+                        continue  # Picked up by the next top-up
+                    index, target, host = in_flight.pop(task)
+                    host_load[host] -= 1
+                    if not host_load[host]:
+                        del host_load[host]
+                    if task.exception() is not None:
+                        yield index, self._error_result(index, target, task.exception())
+                    else:
+                        yield index, task.result()
+        finally:
+            # Consumer stopped early - cancel orphaned scrapes and wait for them
+            # to hand their instances back before the stream closes
+            for task in in_flight:
+                task.cancel()
+            if pull is not None:
+                pull.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+
+    async def scrape_stream(self, targets: TargetSource) -> AsyncIterator[ScrapeResult]:
+        """
+        Scrape an iterable or async iterable of targets with bounded concurrency,
+        yielding results as they finish. Memory stays flat regardless of job size.
+        """
+        # Close the core as soon as this stream is closed, not when it is garbage collected
+        async with aclosing(self._scrape_indexed(targets)) as results:
+            async for _, result in results:
+                yield result
 
     async def scrape_parallel(self, targets: List[ScrapeTarget]) -> List[ScrapeResult]:
         """Execute multiple scrapes in parallel"""
         logger.info(f"Starting parallel scrape of {len(targets)} targets")
 
-        results = await asyncio.gather(
-            *[self.scrape(target) for target in targets],
-            return_exceptions=True
-        )
-
-        # Convert exceptions to results
-        final_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                final_results.append(ScrapeResult(
-                    target_id=f"error-{i}",
-                    url=targets[i].url,
-                    success=False,
-                    error=str(result)
-                ))
-            else:
-                final_results.append(result)
+        final_results: List[Optional[ScrapeResult]] = [None] * len(targets)
+        async for index, result in self._scrape_indexed(targets):
+            final_results[index] = result
 
         success_count = sum(1 for r in final_results if r.success)
         logger.info(f"Parallel scrape complete: {success_count}/{len(targets)} succeeded")
 
         return final_results
 
+    async def scrape_queue(self, queue, worker_id: Optional[str] = None,
+                           lease_seconds: float = 120,
+                           max_in_flight: Optional[int] = None) -> AsyncIterator[ScrapeResult]:
+        """
+        Drain a durable WorkQueue, yielding each result before checkpointing it.
+        A restarted process calling this on the same queue resumes only the
+        targets that were never acked.
+        """
+        async with aclosing(self.scrape_queue_items(queue, worker_id, lease_seconds, max_in_flight)) as items:
+            async for _, result in items:
+                yield result
+
+    async def scrape_queue_items(self, queue, worker_id: Optional[str] = None,
+                                 lease_seconds: float = 120,
+                                 max_in_flight: Optional[int] = None) -> AsyncIterator[Tuple[int, ScrapeResult]]:
+        """
+        scrape_queue, yielding (task_id, result). Delivery is at-least-once: a
+        result yielded just before a crash comes again on resume with the same
+        task_id, so consumers can drop the repeat. max_in_flight caps this
+        drain's concurrency below the pool size.
+        """
+        worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        in_flight_limit = self._in_flight_limit()
+        if max_in_flight is not None:
+            in_flight_limit = max(1, min(in_flight_limit, max_in_flight))
+        in_flight: Dict[asyncio.Future, Any] = {}
+
+        async def renew_leases():
+            while True:
+                await asyncio.sleep(lease_seconds / 3)
+                queue.extend([lease.task_id for lease in in_flight.values()], lease_seconds)
+
+        heartbeat = asyncio.ensure_future(renew_leases())
+        logger.info(f"Worker {worker_id} draining queue {queue.name}")
+
+        try:
+            while True:
+                room = in_flight_limit - len(in_flight)
+                if room > 0:
+                    for lease in queue.lease(worker_id, room, lease_seconds):
+                        in_flight[asyncio.ensure_future(self.scrape(lease.target))] = lease
+                    # Targets dead-lettered by expired leases still get their (failed) result
+                    for task_id, result in queue.dead_letters():
+                        yield task_id, result
+                        queue.ack_dead_letter(task_id, result)
+                if not in_flight:
+                    break
+
+                done, _ = await asyncio.wait(list(in_flight), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    lease = in_flight[task]
+                    if task.exception() is not None:
+                        result = self._error_result(lease.task_id, lease.target, task.exception())
+                    else:
+                        result = task.result()
+                    yield lease.task_id, result
+                    # Ack only once the consumer has taken the result (at-least-once delivery)
+                    queue.ack(lease.task_id, result)
+                    del in_flight[task]
+        finally:
+            heartbeat.cancel()
+            for task in in_flight:
+                task.cancel()
+            # Let cancelled scrapes return their instances before the leases go back
+            await asyncio.gather(*in_flight, return_exceptions=True)
+            # Hand unfinished leases straight back instead of waiting for expiry
+            queue.release([lease.task_id for lease in in_flight.values()])
+
     def get_metrics(self) -> Dict:
         """Get orchestrator metrics"""
         uptime = None
@@ -411,14 +1414,44 @@ class ScraperOrchestrator:
             'pool_available': self._instance_pool.qsize(),
             'success_rate': (
                 self._metrics['successful_scrapes'] / max(1, self._metrics['total_scrapes'])
-            ) * 100
+            ) * 100,
+            'context_recycles': sum(i.context_recycles for i in self.instances.values()),
+            'requests_blocked': sum(i.requests_blocked for i in self.instances.values()),
+            'dead_hosts': sum(1 for host in list(self._dead_hosts) if self._dead_host(host)),
+            'target_instances': self._target_size,
+            'waiting_scrapes': self._waiting,
+            'latency_ewma_ms': self._latency_ewma_ms,
+            'browsers': self._browser_metrics()
         }
 
+    def _browser_metrics(self) -> List[Dict]:
+        """Per-browser context count and resident memory"""
+        if self.hosts:
+            browsers = [(host.host_id, host.contexts) for host in self.hosts]
+        else:
+            browsers = [
+                (instance.instance_id, 1 if instance.context else 0)
+                for instance in self.instances.values()
+                if instance.browser
+            ]
+
+        memory = _browser_memory([browser_id for browser_id, _ in browsers])
+        return [
+            {
+                'browser_id': browser_id,
+                'contexts': contexts,
+                'rss_mb': round(memory[browser_id] / (1024 * 1024), 1) if memory[browser_id] is not None else None
+            }
+            for browser_id, contexts in browsers
+        ]
+
 
 # Export main classes
 __all__ = [
     'ScraperOrchestrator',
     'ScraperConfig',
+    'BrowserHost',
+    'InterceptionProfile',
     'ScrapeTarget',
     'ScrapeResult',
     'ScraperMode',
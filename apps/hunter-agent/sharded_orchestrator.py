@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+SHADOW SHARDED ORCHESTRATOR
+===========================
+Multi-process front end for ScraperOrchestrator
+
+One asyncio loop tops out at a single core for Python-side parsing, JSON
+handling and Playwright message decoding. ShardedOrchestrator starts N
+worker processes, each running its own ScraperOrchestrator and instance
+pool, and routes every target to a shard by a stable hash of its host.
+
+Features:
+- Same scrape / scrape_stream / scrape_parallel surface as ScraperOrchestrator
+- Host affinity: a host's rate limit, robots.txt and Retry-After state live in one shard
+- The pool (instances, shared browsers, HTTP connections) is split across shards
+- Results stream back in completion order; metrics are merged into one view
+
+Shards push their metrics every METRICS_INTERVAL_S, so get_metrics() is
+synchronous like ScraperOrchestrator's and returns the latest merged
+snapshot (at most that old).
+"""
+
+import asyncio
+import itertools
+import logging
+import math
+import multiprocessing
+import os
+import zlib
+from contextlib import aclosing
+from dataclasses import replace
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from politeness import host_of
+from scraper_orchestrator import (ScrapeResult, ScraperConfig, ScraperOrchestrator,
+                                  ScrapeTarget, TargetSource)
+
+logger = logging.getLogger('ShardedOrchestrator')
+
+METRICS_INTERVAL_S = 1.0  # How often each shard reports its metrics
+
+# Counters that add up across shards in get_metrics()
+SUMMED_METRICS = (
+    'total_scrapes', 'successful_scrapes', 'failed_scrapes', 'items_extracted',
+    'instances_replaced', 'fast_path_hits', 'fast_path_fallbacks', 'health_checks',
+    'unchanged_results', 'not_modified_responses', 'extractions_skipped',
+    'active_instances', 'pool_available', 'context_recycles', 'requests_blocked',
+    'dead_hosts', 'target_instances', 'waiting_scrapes'
+)
+
+
+def shard_config(config: ScraperConfig, shards: int) -> ScraperConfig:
+    """Per-shard copy of the config with the pool budget split evenly"""
+    def split(value: int) -> int:
+        return max(1, math.ceil(value / shards)) if value > 0 else value
+
+    return replace(
+        config,
+        max_instances=split(config.max_instances),
+        min_instances=min(split(config.min_instances), split(config.max_instances)),
+        shared_browsers=split(config.shared_browsers),
+        http_max_connections=split(config.http_max_connections)
+    )
+
+
+def merge_metrics(shard_metrics: List[Dict]) -> Dict:
+    """Combine per-shard get_metrics() dicts into one orchestrator-shaped view"""
+    merged: Dict[str, Any] = {key: 0 for key in SUMMED_METRICS}
+    errors: Dict[str, int] = {}
+    browsers: List[Dict] = []
+    latencies = []
+    start_times = []
+    uptimes = []
+
+    for shard_id, metrics in enumerate(shard_metrics):
+        for key in SUMMED_METRICS:
+            merged[key] += metrics.get(key) or 0
+        for name, count in metrics.get('errors_by_class', {}).items():
+            errors[name] = errors.get(name, 0) + count
+        for browser in metrics.get('browsers', []):
+            browsers.append({**browser, 'shard': shard_id})
+        if metrics.get('latency_ewma_ms') is not None:
+            latencies.append(metrics['latency_ewma_ms'])
+        if metrics.get('start_time') is not None:
+            start_times.append(metrics['start_time'])
+        if metrics.get('uptime_seconds') is not None:
+            uptimes.append(metrics['uptime_seconds'])
+
+    merged.update({
+        'errors_by_class': errors,
+        'start_time': min(start_times) if start_times else None,
+        'uptime_seconds': max(uptimes) if uptimes else None,
+        'success_rate': (merged['successful_scrapes'] / max(1, merged['total_scrapes'])) * 100,
+        'latency_ewma_ms': sum(latencies) / len(latencies) if latencies else None,
+        'browsers': browsers,
+        'shards': len(shard_metrics)
+    })
+    return merged
+
+
+def _shard_main(shard_id: int, config: ScraperConfig, inbox, outbox):
+    """Worker process entry point"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format=f'%(asctime)s - shard-{shard_id} - %(name)s - %(levelname)s - %(message)s'
+    )
+    asyncio.run(_run_shard(shard_id, config, inbox, outbox))
+
+
+async def _run_shard(shard_id: int, config: ScraperConfig, inbox, outbox):
+    """
+    Run one orchestrator over everything routed to this shard. The inbox is
+    consumed as a single long-lived target stream; metrics are reported on a
+    timer so they keep flowing even when the shard is busy.
+    """
+    loop = asyncio.get_running_loop()
+    orchestrator = ScraperOrchestrator(config)
+    try:
+        await orchestrator.start()
+    except Exception as e:
+        outbox.put(('failed', shard_id, str(e)))
+        return
+    outbox.put(('ready', shard_id, os.getpid()))
+
+    # Local stream index -> (caller's stream id, caller's index)
+    keys: Dict[int, Tuple[int, int]] = {}
+
+    async def targets() -> AsyncIterator[ScrapeTarget]:
+        local_index = itertools.count()
+        while True:
+            message = await loop.run_in_executor(None, inbox.get)
+            if message is None:
+                return
+            stream_id, index, target = message
+            keys[next(local_index)] = (stream_id, index)
+            yield target
+
+    async def report_metrics():
+        while True:
+            outbox.put(('metrics', shard_id, orchestrator.get_metrics()))
+            await asyncio.sleep(METRICS_INTERVAL_S)
+
+    reporter = asyncio.ensure_future(report_metrics())
+    try:
+        async for local_index, result in orchestrator._scrape_indexed(targets()):
+            stream_id, index = keys.pop(local_index)
+            outbox.put(('result', stream_id, (index, result)))
+    finally:
+        reporter.cancel()
+        outbox.put(('metrics', shard_id, orchestrator.get_metrics()))
+        await orchestrator.stop()
+
+
+class ShardedOrchestrator:
+    """
+    Scrape across several processes, one ScraperOrchestrator per shard.
+
+    Usage:
+        sharded = ShardedOrchestrator(ScraperConfig(max_instances=32), shards=8)
+        await sharded.start()
+        async for result in sharded.scrape_stream(targets):
+            ...
+        metrics = sharded.get_metrics()
+        await sharded.stop()
+    """
+
+    # How often a stream waiting on results checks that every shard is alive
+    LIVENESS_INTERVAL_S = 5.0
+    # How often start() checks for shards that died before reporting ready
+    STARTUP_POLL_S = 0.5
+
+    def __init__(self, config: Optional[ScraperConfig] = None, shards: Optional[int] = None):
+        self.config = config or ScraperConfig()
+        self.shards = max(1, shards or os.cpu_count() or 1)
+        self.shard_config = shard_config(self.config, self.shards)
+        self._context = multiprocessing.get_context('spawn')
+        self._processes: List[Any] = []
+        self._inboxes: List[Any] = []
+        self._outbox = None
+        self._reader: Optional[asyncio.Task] = None
+        self._streams: Dict[int, asyncio.Queue] = {}
+        self._stream_ids = itertools.count()
+        self._shard_metrics: Dict[int, Dict] = {}
+        self._metrics_at: Optional[datetime] = None
+        self._ready: Dict[int, asyncio.Future] = {}
+        self._running = False
+
+        logger.info(f"ShardedOrchestrator initialized (shards={self.shards}, "
+                    f"max_instances per shard={self.shard_config.max_instances})")
+
+    def shard_for(self, url: str) -> int:
+        """Stable shard index for a URL's host (crc32, unlike hash(), is the same in every process)"""
+        return zlib.crc32(host_of(url).encode()) % self.shards
+
+    async def start(self):
+        """Spawn the shard processes and wait until every orchestrator is up"""
+        loop = asyncio.get_running_loop()
+        self._outbox = self._context.Queue()
+        self._ready = {shard_id: loop.create_future() for shard_id in range(self.shards)}
+        self._shard_metrics = {}
+        self._reader = asyncio.ensure_future(self._read_outbox())
+
+        for shard_id in range(self.shards):
+            inbox = self._context.Queue()
+            process = self._context.Process(
+                target=_shard_main,
+                args=(shard_id, self.shard_config, inbox, self._outbox),
+                name=f"scraper-shard-{shard_id}",
+                daemon=True
+            )
+            process.start()
+            self._inboxes.append(inbox)
+            self._processes.append(process)
+
+        logger.info(f"Starting {self.shards} shard processes...")
+        try:
+            # A shard that dies before reporting (import error, crash during
+            # launch) never answers, so keep checking the processes while waiting
+            pending = set(self._ready.values())
+            while pending:
+                done, pending = await asyncio.wait(pending, timeout=self.STARTUP_POLL_S)
+                for future in done:
+                    future.result()
+                if pending:
+                    self._check_shards()
+        except BaseException:
+            await self.stop()
+            raise
+        self._running = True
+        logger.info(f"Sharded orchestrator started with {self.shards} shards")
+
+    async def stop(self):
+        """Drain and stop every shard"""
+        self._running = False
+        for inbox in self._inboxes:
+            inbox.put(None)
+
+        loop = asyncio.get_running_loop()
+        for process in self._processes:
+            await loop.run_in_executor(None, process.join, 30)
+            if process.is_alive():
+                logger.warning(f"{process.name} did not exit, terminating")
+                process.terminate()
+
+        if self._outbox is not None:
+            self._outbox.put(None)
+        if self._reader is not None:
+            await self._reader
+        self._processes.clear()
+        self._inboxes.clear()
+        self._reader = None
+        logger.info("Sharded orchestrator stopped")
+
+    async def _read_outbox(self):
+        """Route messages from every shard to the stream or future awaiting them"""
+        loop = asyncio.get_running_loop()
+        while True:
+            message = await loop.run_in_executor(None, self._outbox.get)
+            if message is None:
+                return
+            kind, key, payload = message
+
+            if kind == 'result':
+                stream = self._streams.get(key)
+                if stream is not None:
+                    stream.put_nowait(payload)
+            elif kind == 'metrics':
+                self._shard_metrics[key] = payload
+                self._metrics_at = datetime.utcnow()
+            elif kind == 'ready':
+                logger.info(f"Shard {key} ready (pid {payload})")
+                self._ready[key].set_result(payload)
+            elif kind == 'failed':
+                self._ready[key].set_exception(RuntimeError(f"Shard {key} failed to start: {payload}"))
+
+    def _check_shards(self):
+        """Raise if a shard process has died; its targets would never come back"""
+        for process in self._processes:
+            if process.exitcode is not None:
+                raise RuntimeError(f"{process.name} exited with code {process.exitcode}")
+
+    async def _scrape_indexed(self, targets: TargetSource) -> AsyncIterator[Tuple[int, ScrapeResult]]:
+        """
+        Fan targets out to their shards and yield (input index, result) as shards
+        finish them. At most one full pool's worth of targets is outstanding, so
+        large and async sources are streamed rather than queued up front.
+        """
+        if not self._running:
+            raise RuntimeError("ShardedOrchestrator is not running")
+
+        stream_id = next(self._stream_ids)
+        results: asyncio.Queue = asyncio.Queue()
+        self._streams[stream_id] = results
+        limit = self.shards * self.shard_config.max_instances * self.shard_config.in_flight_per_instance
+        source = None if hasattr(targets, '__aiter__') else iter(targets)
+        async_source = targets.__aiter__() if source is None else None
+        pull: Optional[asyncio.Future] = None
+        receive: Optional[asyncio.Future] = None
+        outstanding = 0
+        next_index = 0
+        exhausted = False
+
+        try:
+            while True:
+                while not exhausted and outstanding < limit:
+                    if source is not None:
+                        target = next(source, None)
+                        if target is None:
+                            exhausted = True
+                            break
+                    else:
+                        if pull is None:
+                            pull = asyncio.ensure_future(async_source.__anext__())
+                        if not pull.done():
+                            break
+                        try:
+                            target = pull.result()
+                        except StopAsyncIteration:
+                            exhausted = True
+                            break
+                        finally:
+                            pull = None
+                    self._inboxes[self.shard_for(target.url)].put((stream_id, next_index, target))
+                    next_index += 1
+                    outstanding += 1
+
+                if not outstanding and pull is None:
+                    break
+
+                if outstanding and receive is None:
+                    receive = asyncio.ensure_future(results.get())
+                waiting = [task for task in (receive, pull) if task is not None]
+                done, _ = await asyncio.wait(waiting, timeout=self.LIVENESS_INTERVAL_S,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    self._check_shards()
+                elif receive in done:
+                    index, result = receive.result()
+                    receive = None
+                    outstanding -= 1
+                    yield index, result
+        finally:
+            for task in (receive, pull):
+                if task is not None:
+                    task.cancel()
+            del self._streams[stream_id]
+
+    async def scrape(self, target: ScrapeTarget) -> ScrapeResult:
+        """Scrape a single target on its host's shard"""
+        results = [result async for _, result in self._scrape_indexed([target])]
+        return results[0]
+
+    async def scrape_stream(self, targets: TargetSource) -> AsyncIterator[ScrapeResult]:
+        """Scrape targets across all shards, yielding results as they finish"""
+        async with aclosing(self._scrape_indexed(targets)) as results:
+            async for _, result in results:
+                yield result
+
+    async def scrape_parallel(self, targets: List[ScrapeTarget]) -> List[ScrapeResult]:
+        """Execute multiple scrapes across all shards, returning results in input order"""
+        logger.info(f"Starting sharded scrape of {len(targets)} targets over {self.shards} shards")
+
+        final_results: List[Optional[ScrapeResult]] = [None] * len(targets)
+        async for index, result in self._scrape_indexed(targets):
+            final_results[index] = result
+
+        successful = sum(1 for r in final_results if r.success)
+        logger.info(f"Sharded scrape complete: {successful}/{len(targets)} successful")
+        return final_results
+
+    def get_metrics(self) -> Dict:
+        """
+        Latest metrics from every shard, merged; per-shard dicts are under
+        'per_shard'. Shards report every METRICS_INTERVAL_S, so this never
+        waits on them.
+        """
+        per_shard = [self._shard_metrics[shard_id] for shard_id in sorted(self._shard_metrics)]
+        merged = merge_metrics(per_shard)
+        merged['per_shard'] = per_shard
+        merged['collected_at'] = self._metrics_at
+        return merged
+
+
+__all__ = [
+    'ShardedOrchestrator',
+    'merge_metrics',
+    'shard_config'
+]
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+HUNTER SPATIAL INDEX
+====================
+Radius, bounding-box and nearest-N queries over lead coordinates
+
+Points are bucketed into geohash cells (see geo.GeoGrid) and stored sorted
+by cell key (row * cols + col), so the cells of one grid row covering a
+query box are a contiguous key range found with two binary searches. Only
+points in those cells are checked exactly, which keeps region queries over
+a multi-state corpus to a handful of searchsorted calls plus a small
+vectorized distance filter.
+
+The index persists to a single .npz file.
+
+Usage:
+    python spatial_index.py build --store data/lead-store -o data/geo/leads.npz
+    python spatial_index.py query data/geo/leads.npz --lat 28.5383 --lng -81.3792 --miles 100
+"""
+
+import argparse
+import json
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from geo import EARTH_RADIUS_MILES, MILES_PER_DEGREE, GeoGrid
+
+
+def haversine_miles_vector(lat: np.ndarray, lng: np.ndarray, center_lat: float, center_lng: float) -> np.ndarray:
+    """Great-circle distance in miles from every point to one center"""
+    phi1 = np.radians(lat)
+    phi2 = math.radians(center_lat)
+    a = (np.sin((phi2 - phi1) / 2) ** 2
+         + np.cos(phi1) * math.cos(phi2) * np.sin(np.radians(center_lng - lng) / 2) ** 2)
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+
+
+@dataclass(frozen=True)
+class Metro:
+    """A search center and the radius targeted around it"""
+    name: str
+    lat: float
+    lng: float
+    radius_miles: float
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], radius_miles: Optional[float] = None) -> "Metro":
+        return cls(
+            name=data.get("name", f"{data['lat']},{data['lng']}"),
+            lat=float(data["lat"]),
+            lng=float(data["lng"]),
+            radius_miles=float(data.get("radius_miles", radius_miles or 0))
+        )
+
+
+class GeoIndex:
+    """
+    Static spatial index over points.
+
+    Query results are positions into the arrays the index was built from
+    (points without coordinates are skipped, not renumbered), so they can
+    be used directly as masks or to pick leads. Optional `ids` (e.g. lead
+    fingerprints) are kept in that same order.
+    """
+
+    def __init__(self, keys: np.ndarray, positions: np.ndarray, lat: np.ndarray, lng: np.ndarray,
+                 size: int, precision: int = 4, ids: Optional[np.ndarray] = None):
+        self.keys = keys
+        self.positions = positions
+        self.lat = lat
+        self.lng = lng
+        self.size = size
+        self.ids = ids
+        self.grid = GeoGrid(precision)
+        self._rows_per_degree = self.grid.rows / 180.0
+        self._cols_per_degree = self.grid.cols / 360.0
+
+    @classmethod
+    def build(cls, lat: Sequence[float], lng: Sequence[float], precision: int = 4,
+              ids: Optional[Sequence[str]] = None) -> "GeoIndex":
+        """Index points; NaN or out-of-range coordinates are left out"""
+        lat = np.asarray(lat, dtype=np.float64)
+        lng = np.asarray(lng, dtype=np.float64)
+        with np.errstate(invalid="ignore"):
+            valid = (np.abs(lat) <= 90) & (np.abs(lng) <= 180)
+        positions = np.flatnonzero(valid)
+
+        index = cls(np.empty(0, np.int64), positions, lat[positions], lng[positions], len(lat), precision)
+        keys = index._cell_keys(index.lat, index.lng)
+        order = np.argsort(keys, kind="stable")
+        index.keys = keys[order]
+        index.positions = positions[order]
+        index.lat = index.lat[order]
+        index.lng = index.lng[order]
+        if ids is not None:
+            index.ids = np.asarray(ids, dtype=str)
+        return index
+
+    @classmethod
+    def from_leads(cls, leads: Sequence[Dict[str, Any]], precision: int = 4,
+                   ids: Optional[Sequence[str]] = None) -> "GeoIndex":
+        lat = np.fromiter((_coordinate(lead.get("lat")) for lead in leads), np.float64, count=len(leads))
+        lng = np.fromiter((_coordinate(lead.get("lng")) for lead in leads), np.float64, count=len(leads))
+        return cls.build(lat, lng, precision, ids)
+
+    def _cell_keys(self, lat: np.ndarray, lng: np.ndarray) -> np.ndarray:
+        rows = np.minimum(((lat + 90.0) * self._rows_per_degree).astype(np.int64), self.grid.rows - 1)
+        cols = np.minimum(((lng + 180.0) * self._cols_per_degree).astype(np.int64), self.grid.cols - 1)
+        return rows * self.grid.cols + cols
+
+    def _candidates(self, lat_lo: float, lat_hi: float, lng_lo: float, lng_hi: float) -> np.ndarray:
+        """Slots (into the sorted arrays) of points in cells overlapping a box"""
+        row_lo, col_lo = self.grid.cell(max(lat_lo, -90.0), max(lng_lo, -180.0))
+        row_hi, col_hi = self.grid.cell(min(lat_hi, 90.0), min(lng_hi, 180.0))
+        rows = np.arange(row_lo, row_hi + 1, dtype=np.int64) * self.grid.cols
+        starts = np.searchsorted(self.keys, rows + col_lo, side="left")
+        ends = np.searchsorted(self.keys, rows + col_hi, side="right")
+        spans = [(start, end) for start, end in zip(starts.tolist(), ends.tolist()) if end > start]
+        if not spans:
+            return np.empty(0, dtype=np.int64)
+        if len(spans) == 1:
+            return np.arange(*spans[0])
+        return np.concatenate([np.arange(start, end) for start, end in spans])
+
+    def within_radius(self, lat: float, lng: float, miles: float,
+                      sort: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """(positions, distances in miles) of points within `miles` of a center"""
+        d_lat = miles / MILES_PER_DEGREE
+        d_lng = d_lat / max(math.cos(math.radians(min(abs(lat) + d_lat, 90.0))), 1e-6)
+        if d_lng >= 180.0:
+            slots = np.arange(len(self.keys))
+        else:
+            slots = self._candidates(lat - d_lat, lat + d_lat, lng - d_lng, lng + d_lng)
+
+        distances = haversine_miles_vector(self.lat[slots], self.lng[slots], lat, lng)
+        inside = distances <= miles
+        slots, distances = slots[inside], distances[inside]
+        if sort:
+            order = np.argsort(distances, kind="stable")
+            slots, distances = slots[order], distances[order]
+        return self.positions[slots], distances
+
+    def within_bbox(self, lat_lo: float, lat_hi: float, lng_lo: float, lng_hi: float) -> np.ndarray:
+        """Positions of points inside a lat/lng box (lng_lo > lng_hi wraps the antimeridian)"""
+        if lng_lo > lng_hi:
+            return np.concatenate([self.within_bbox(lat_lo, lat_hi, lng_lo, 180.0),
+                                   self.within_bbox(lat_lo, lat_hi, -180.0, lng_hi)])
+        slots = self._candidates(lat_lo, lat_hi, lng_lo, lng_hi)
+        lat, lng = self.lat[slots], self.lng[slots]
+        inside = (lat >= lat_lo) & (lat <= lat_hi) & (lng >= lng_lo) & (lng <= lng_hi)
+        return self.positions[slots[inside]]
+
+    def nearest(self, lat: float, lng: float, n: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """(positions, distances) of the n points closest to a center, nearest first"""
+        if n <= 0 or not len(self.keys):
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        # Grow the search radius until it holds n points; everything within
+        # that radius was checked, so the n closest among them are exact
+        miles = MILES_PER_DEGREE * 180.0 / self.grid.rows
+        while True:
+            positions, distances = self.within_radius(lat, lng, miles)
+            if len(positions) >= n or miles >= math.pi * EARTH_RADIUS_MILES:
+                break
+            miles *= 2
+        order = np.argsort(distances, kind="stable")[:n]
+        return positions[order], distances[order]
+
+    def assign(self, metros: Sequence[Metro]) -> np.ndarray:
+        """Per point, the index of the closest metro whose radius contains it (-1 when none)"""
+        assigned = np.full(self.size, -1, dtype=np.int64)
+        best = np.full(self.size, np.inf)
+        for number, metro in enumerate(metros):
+            positions, distances = self.within_radius(metro.lat, metro.lng, metro.radius_miles)
+            closer = distances < best[positions]
+            assigned[positions[closer]] = number
+            best[positions[closer]] = distances[closer]
+        return assigned
+
+    def located(self) -> np.ndarray:
+        """True for points that have usable coordinates"""
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.positions] = True
+        return mask
+
+    def save(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays = {
+            "keys": self.keys, "positions": self.positions, "lat": self.lat, "lng": self.lng,
+            "meta": np.array([self.size, self.grid.precision], dtype=np.int64)
+        }
+        if self.ids is not None:
+            arrays["ids"] = self.ids
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path: Path) -> "GeoIndex":
+        with np.load(path, allow_pickle=False) as data:
+            size, precision = (int(value) for value in data["meta"])
+            return cls(data["keys"], data["positions"], data["lat"], data["lng"], size, precision,
+                       data["ids"] if "ids" in data.files else None)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+def _coordinate(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def load_lead_files(paths: Sequence[Path]) -> List[Dict[str, Any]]:
+    leads = []
+    for path in paths:
+        with open(path) as f:
+            leads.extend(json.load(f).get("leads", []))
+    return leads
+
+
+def main(argv=None):
+    """Build or query an on-disk lead index"""
+    parser = argparse.ArgumentParser(description="Hunter spatial index")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Index the leads in the lead store or raw-leads JSON files")
+    build.add_argument("files", nargs="*", type=Path)
+    build.add_argument("--store", type=Path, help="Lead store directory (reads only lat, lng, fingerprint)")
+    build.add_argument("-o", "--output", type=Path, required=True)
+    build.add_argument("--precision", type=int, default=4)
+
+    query = commands.add_parser("query", help="Radius or nearest-N query against a saved index")
+    query.add_argument("index", type=Path)
+    query.add_argument("--lat", type=float, required=True)
+    query.add_argument("--lng", type=float, required=True)
+    query.add_argument("--miles", type=float, help="Radius; omit for a nearest-N query")
+    query.add_argument("--limit", type=int, default=10)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        if args.store:
+            from lead_store import LeadStore
+
+            leads = LeadStore(args.store).read(["fingerprint", "lat", "lng"], latest=True)
+            ids = [lead["fingerprint"] for lead in leads]
+        else:
+            from lead_index import lead_fingerprint
+
+            leads = load_lead_files(args.files)
+            ids = [lead_fingerprint(lead) for lead in leads]
+        index = GeoIndex.from_leads(leads, args.precision, ids=ids)
+        index.save(args.output)
+        print(f"Indexed {len(index)}/{len(leads)} leads with coordinates -> {args.output}")
+        return
+
+    index = GeoIndex.load(args.index)
+    if args.miles is not None:
+        positions, distances = index.within_radius(args.lat, args.lng, args.miles, sort=True)
+        print(f"{len(positions)} leads within {args.miles:g} miles")
+    else:
+        positions, distances = index.nearest(args.lat, args.lng, args.limit)
+    for position, distance in list(zip(positions.tolist(), distances.tolist()))[:args.limit]:
+        label = index.ids[position] if index.ids is not None else position
+        print(f"  {label}\t{distance:.1f} mi")
+
+
+__all__ = [
+    'GeoIndex',
+    'Metro',
+    'haversine_miles_vector'
+]
+
+
+if __name__ == "__main__":
+    main()
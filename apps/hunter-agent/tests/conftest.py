@@ -0,0 +1,47 @@
+"""Shared fixtures for the hunter-agent tests (modules are imported by bare name)"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scraper_orchestrator import (HeadlessInstance, ScraperConfig, ScraperMode,  # noqa: E402
+                                  ScraperOrchestrator, ScrapeTarget, SiteType)
+
+
+class SlowInstance(HeadlessInstance):
+    """Browserless instance whose navigations take `delay` seconds"""
+
+    def __init__(self, instance_id: str, config: ScraperConfig, delay: float = 0.0):
+        super().__init__(instance_id, config)
+        self.delay = delay
+
+    async def navigate(self, url, site_type=None, wait_selector=None) -> bool:
+        self.navigations += 1
+        await asyncio.sleep(self.delay)
+        return True
+
+
+def make_orchestrator(tmp_path, instances: int = 2, delay: float = 0.0, **options) -> ScraperOrchestrator:
+    """Orchestrator with a pool of SlowInstances and no network access"""
+    config = ScraperConfig(
+        max_instances=instances,
+        respect_robots_txt=False,
+        rate_limit_ms=0,
+        http_fast_path=False,
+        health_check_interval_s=0,
+        cache_dir=str(tmp_path),
+        **options
+    )
+    orchestrator = ScraperOrchestrator(config)
+    orchestrator._target_size = instances
+    for k in range(instances):
+        instance = SlowInstance(f"scraper-{k:04d}", config, delay)
+        orchestrator.instances[instance.instance_id] = instance
+        orchestrator._instance_pool.put_nowait(instance.instance_id)
+    return orchestrator
+
+
+def target(url: str) -> ScrapeTarget:
+    return ScrapeTarget(url=url, site_type=SiteType.PERMITS, mode=ScraperMode.SCRAPE, selectors={'title': 'h1'})
@@ -0,0 +1,116 @@
+import asyncio
+import json
+import sqlite3
+
+import pytest
+
+import http_fetcher
+from change_cache import ChangeCache, document_hash, spec_hash
+from conftest import SlowInstance, make_orchestrator, target
+from main import leads_from_results
+from scraper_orchestrator import ScrapeResult, ScrapeTarget, ScraperMode, SiteType
+
+
+class StaticPageInstance(SlowInstance):
+    """Browserless instance that renders the same document every time and counts extractions"""
+
+    extractions = 0
+
+    async def rendered_hash(self):
+        return document_hash("<h1>Permit 42</h1>")
+
+    async def extract(self, selectors):
+        StaticPageInstance.extractions += 1
+        return {'title': 'Permit 42'}
+
+
+def test_same_document_needs_the_same_spec_and_hash(tmp_path):
+    cache = ChangeCache(str(tmp_path / "changes.sqlite3"))
+    spec = spec_hash({'title': 'h1'}, None)
+    cache.record("https://example.com/a", spec, {'title': 'A'}, document=document_hash("<h1>A</h1>"))
+
+    state = cache.same_document("https://example.com/a", spec, document_hash("<h1>A</h1>"))
+    assert state is not None and state.data == {'title': 'A'}
+    assert cache.same_document("https://example.com/a", spec, document_hash("<h1>B</h1>")) is None
+    assert cache.same_document("https://example.com/a", spec_hash({'title': 'h2'}, None),
+                               document_hash("<h1>A</h1>")) is None
+    assert cache.same_document("https://example.com/a", spec, None) is None
+
+
+def test_caches_from_before_document_hashes_are_migrated(tmp_path):
+    path = str(tmp_path / "changes.sqlite3")
+    db = sqlite3.connect(path)
+    db.execute("CREATE TABLE pages (url TEXT PRIMARY KEY, spec TEXT NOT NULL, content_hash TEXT NOT NULL, "
+               "etag TEXT, last_modified TEXT, checked_at REAL NOT NULL, data BLOB NOT NULL)")
+    db.commit()
+    db.close()
+
+    cache = ChangeCache(path)
+    cache.record("https://example.com/a", "spec", {'title': 'A'}, document="abc")
+    assert cache.known_document("https://example.com/a", "spec") == "abc"
+
+
+def test_browser_path_skips_extraction_for_an_identical_page(tmp_path):
+    async def scenario():
+        orchestrator = make_orchestrator(tmp_path, instances=1)
+        instance = StaticPageInstance("static", orchestrator.config)
+        orchestrator.instances = {instance.instance_id: instance}
+        orchestrator._instance_pool.get_nowait()
+        orchestrator._instance_pool.put_nowait(instance.instance_id)
+        orchestrator.changes = ChangeCache(str(tmp_path / "changes.sqlite3"))
+
+        first = await orchestrator.scrape(target("https://example.com/permits"))
+        second = await orchestrator.scrape(target("https://example.com/permits"))
+        return first, second, orchestrator.get_metrics()
+
+    StaticPageInstance.extractions = 0
+    first, second, metrics = asyncio.run(scenario())
+    assert not first.unchanged
+    assert second.unchanged and second.data == {'title': 'Permit 42'}
+    assert StaticPageInstance.extractions == 1
+    assert metrics['extractions_skipped'] == 1
+
+
+def test_fast_path_skips_extraction_for_an_identical_body(tmp_path, monkeypatch):
+    if not http_fetcher.HAS_HTTPX:
+        pytest.skip("httpx not installed")
+    httpx = http_fetcher.httpx
+    body = json.dumps({'title': 'Permit 42'})
+    extractions = []
+    extract_json = http_fetcher.extract_json
+
+    def counting_extract(*args):
+        extractions.append(args)
+        return extract_json(*args)
+
+    monkeypatch.setattr(http_fetcher, "extract_json", counting_extract)
+
+    async def scenario():
+        orchestrator = make_orchestrator(tmp_path, instances=1)
+        orchestrator.changes = ChangeCache(str(tmp_path / "changes.sqlite3"))
+        orchestrator.fetcher = http_fetcher.HttpFetcher(orchestrator.config, ["test-agent"])
+        orchestrator.fetcher._client = httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, text=body, headers={'content-type': 'application/json'})
+        ))
+        api = ScrapeTarget(url="https://example.com/permits.json", site_type=SiteType.PERMITS,
+                           mode=ScraperMode.EXTRACT, selectors={'title': 'title'})
+        try:
+            first = await orchestrator.scrape(api)
+            second = await orchestrator.scrape(api)
+        finally:
+            await orchestrator.fetcher.close()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first.success and not first.unchanged
+    assert second.unchanged and second.data == {'title': 'Permit 42'}
+    assert len(extractions) == 1
+
+
+def test_unchanged_and_failed_pages_never_become_leads():
+    results = [
+        ScrapeResult("a", "https://example.com/a", True, data=[{"project_name": "Tower"}, {"project_name": None}]),
+        ScrapeResult("b", "https://example.com/b", True, data=[{"project_name": "Clinic"}], unchanged=True),
+        ScrapeResult("c", "https://example.com/c", False, error="HTTP 500"),
+    ]
+    assert leads_from_results(results) == [{"project_name": "Tower", "source": "https://example.com/a"}]
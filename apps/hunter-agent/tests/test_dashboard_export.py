@@ -0,0 +1,36 @@
+import gzip
+import json
+
+from dashboard_export import export_dashboard, lead_city
+
+
+def row(lead_id: str, day: str, value: float, location: str, lat: float = 28.54, lng: float = -81.38) -> dict:
+    return {"id": lead_id, "project_name": lead_id, "project_value": value, "location": location,
+            "project_type": "Commercial", "lat": lat, "lng": lng, "county": "Orange County", "day": day}
+
+
+def test_lead_city_comes_from_the_address():
+    assert lead_city({"location": "450 S Orange Ave, Orlando, FL 32801", "county": "Orange County"}) == "Orlando, FL"
+    assert lead_city({"location": "Orlando area"}) == "Unknown"
+
+
+def test_export_writes_shards_and_city_aggregates(tmp_path):
+    rows = [
+        row("tower", "2026-02-20", 2500000, "450 S Orange Ave, Orlando, FL 32801"),
+        row("clinic", "2026-02-20", 900000, "1 Main St, Kissimmee, FL 34741", lat=28.29, lng=-81.41),
+        row("arena", "2026-02-21", 4000000, "400 W Church St, Orlando, FL 32801"),
+    ]
+    result = export_dashboard(rows, tmp_path)
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+
+    assert manifest["count"] == 3
+    assert [(city["name"], city["count"]) for city in manifest["cities"]] == [("Orlando, FL", 2), ("Kissimmee, FL", 1)]
+    assert [day["date"] for day in manifest["days"]] == ["2026-02-21", "2026-02-20"]
+
+    shard = json.loads(gzip.decompress((tmp_path / manifest["by_value"][0]["shard"]).read_bytes()))
+    ids = [dict(zip(shard["fields"], values))["id"] for values in shard["rows"]]
+    assert ids == ["arena", "tower", "clinic"]
+
+    # Re-exporting the same rows leaves every shard untouched
+    assert result.rewritten == result.shards
+    assert export_dashboard(rows, tmp_path).rewritten == 0
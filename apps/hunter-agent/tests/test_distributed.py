@@ -0,0 +1,102 @@
+import asyncio
+
+from conftest import make_orchestrator, target
+from distributed import Coordinator, LocalBroker, RemoteWorker
+from work_queue import WorkQueue
+
+
+async def open_job(coordinator: Coordinator, queue: WorkQueue, results: list, done: asyncio.Event):
+    async def on_result(task_id, result):
+        results.append(result)
+
+    async def on_done():
+        done.set()
+
+    await coordinator.add_job("job-1", queue, on_result, on_done)
+
+
+def test_worker_drains_a_job(tmp_path):
+    async def scenario():
+        coordinator = Coordinator(lease_seconds=30)
+        queue = WorkQueue(str(tmp_path / "queue.sqlite3"), "job-1")
+        queue.enqueue([target(f"https://host{k}.example/") for k in range(7)])
+        results, done = [], asyncio.Event()
+        await open_job(coordinator, queue, results, done)
+
+        worker = RemoteWorker(LocalBroker(coordinator), make_orchestrator(tmp_path, instances=2),
+                              batch_size=3, flush_interval_s=0.05, poll_interval_s=0.01)
+        await asyncio.wait_for(worker.run(exit_when_idle=True), timeout=10)
+
+        assert done.is_set()
+        assert len(results) == 7
+        assert worker.results_sent == 7
+        assert queue.stats()['done'] == 7
+
+    asyncio.run(scenario())
+
+
+def test_interrupted_worker_returns_instances_and_unfinished_leases(tmp_path):
+    async def scenario():
+        coordinator = Coordinator(lease_seconds=30)
+        queue = WorkQueue(str(tmp_path / "queue.sqlite3"), "job-1")
+        queue.enqueue([target(f"https://host{k}.example/") for k in range(4)])
+        results, done = [], asyncio.Event()
+        await open_job(coordinator, queue, results, done)
+
+        orchestrator = make_orchestrator(tmp_path, instances=2, delay=10)
+        worker = RemoteWorker(LocalBroker(coordinator), orchestrator, capacity=4, poll_interval_s=0.01)
+        run = asyncio.ensure_future(worker.run())
+        await asyncio.sleep(0.1)
+        run.cancel()
+        await asyncio.gather(run, return_exceptions=True)
+
+        assert orchestrator._instance_pool.qsize() == 2
+        stats = queue.stats()
+        assert stats['leased'] == 0 and stats['pending'] == 4
+        assert not coordinator.workers
+
+    asyncio.run(scenario())
+
+
+def test_coordinator_caps_leases_per_job(tmp_path):
+    async def scenario():
+        coordinator = Coordinator(lease_seconds=30)
+        queue = WorkQueue(str(tmp_path / "queue.sqlite3"), "job-1")
+        queue.enqueue([target(f"https://host{k}.example/") for k in range(5)])
+
+        async def ignore(*args):
+            pass
+
+        await coordinator.add_job("job-1", queue, ignore, ignore, max_in_flight=2)
+        worker_id = (await coordinator.register("host", capacity=10))['worker_id']
+
+        first = await coordinator.lease(worker_id, 10)
+        assert len(first) == 2
+        assert await coordinator.lease(worker_id, 10) == []
+
+        await coordinator.complete(worker_id, [(lease.job_id, lease.task_id, None) for lease in first[:1]])
+        assert len(await coordinator.lease(worker_id, 10)) == 1
+
+    asyncio.run(scenario())
+
+
+def test_target_lost_with_its_worker_still_gets_a_result(tmp_path):
+    async def scenario():
+        coordinator = Coordinator(lease_seconds=30, worker_timeout_s=30)
+        queue = WorkQueue(str(tmp_path / "queue.sqlite3"), "job-1", max_attempts=1)
+        queue.enqueue([target("https://kills-workers.example/")])
+        results, done = [], asyncio.Event()
+        await open_job(coordinator, queue, results, done)
+
+        lost = (await coordinator.register("lost", 1))['worker_id']
+        assert len(await coordinator.lease(lost, 1)) == 1
+        coordinator.workers[lost].last_seen -= 60  # Missed its heartbeats
+
+        other = (await coordinator.register("other", 1))['worker_id']
+        assert await coordinator.lease(other, 1) == []
+
+        assert done.is_set()
+        [result] = results
+        assert not result.success and result.error.startswith("dead_lettered: worker")
+
+    asyncio.run(scenario())
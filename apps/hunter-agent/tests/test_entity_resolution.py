@@ -0,0 +1,40 @@
+from entity_resolution import EntityResolver, normalize_address, normalize_developer
+
+
+def test_normalization():
+    assert normalize_developer("Tavistock Development Company, LLC") == normalize_developer("Tavistock Development Co")
+    assert normalize_address("6900 Tavistock Lakes Boulevard, Orlando, FL 32827") == \
+        normalize_address("6900 Tavistock Lakes Blvd, Orlando FL 32827")
+
+
+def test_clusters_the_same_project_reported_by_different_sources():
+    leads = [
+        {"project_name": "Lake Nona Medical Plaza", "developer": "Tavistock Development Company LLC",
+         "location": "6900 Tavistock Lakes Boulevard, Orlando, FL 32827", "lat": 28.3852, "lng": -81.2765,
+         "source": "permits"},
+        {"project_name": "Downtown Orlando Mixed-Use Tower", "developer": "CNL Real Estate",
+         "location": "450 S Orange Ave, Orlando, FL 32801", "lat": 28.5383, "lng": -81.3792,
+         "source": "permits"},
+        {"project_name": "Lake Nona Medical Plz", "developer": "Tavistock Development",
+         "location": "6900 Tavistock Lakes Blvd, Orlando, FL 32827", "lat": 28.3853, "lng": -81.2766,
+         "source": "google_maps"},
+        # Same street, different project and developer
+        {"project_name": "Lake Nona Town Center Garage", "developer": "Orlando Parking Group",
+         "location": "6800 Tavistock Lakes Blvd, Orlando, FL 32827", "lat": 28.3790, "lng": -81.2700,
+         "source": "county"},
+    ]
+
+    resolver = EntityResolver()
+    clusters = sorted(sorted(group) for group in resolver.cluster(leads))
+    assert clusters == [[0, 2], [1], [3]]
+    assert resolver.stats["merged"] == 1
+
+    merged = resolver.resolve(leads)
+    assert len(merged) == 3
+    plaza = next(lead for lead in merged if "provenance" in lead)
+    assert {record["source"] for record in plaza["provenance"]} == {"permits", "google_maps"}
+
+
+def test_unlocated_leads_with_different_names_stay_apart():
+    leads = [{"project_name": f"Project {name}", "developer": "Acme"} for name in ("Alpha", "Beta", "Gamma")]
+    assert len(EntityResolver().cluster(leads)) == 3
@@ -0,0 +1,83 @@
+import asyncio
+
+from conftest import make_orchestrator
+from extraction import EXTRACT_SCRIPT, compile_spec, extract_html, extract_json, found_anything, parse_field
+
+
+class RecordingPage:
+    """Stands in for a Playwright page and records evaluate() calls"""
+
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+
+    async def evaluate(self, script, spec):
+        self.calls.append((script, spec))
+        return self.result
+
+
+def test_selector_suffixes_choose_how_the_match_is_read():
+    assert parse_field('no', 'td.permit-no') == {'key': 'no', 'selector': 'td.permit-no', 'read': 'text', 'attr': None}
+    assert parse_field('desc', 'td.desc::inner_text')['read'] == 'inner_text'
+    assert parse_field('link', 'a.details::href') == {'key': 'link', 'selector': 'a.details', 'read': 'href',
+                                                      'attr': None}
+    photo = parse_field('photo', 'img.photo::attr("data-src")')
+    assert photo == {'key': 'photo', 'selector': 'img.photo', 'read': 'attr', 'attr': 'data-src'}
+    assert parse_field('id', '::attr(data-id)') == {'key': 'id', 'selector': '', 'read': 'attr', 'attr': 'data-id'}
+
+
+def test_compiled_spec_carries_rows_limit_and_fields():
+    spec = compile_spec({'no': 'td.no', 'link': 'a::href'}, 'tr.permit', 25)
+    assert spec['rows'] == 'tr.permit' and spec['limit'] == 25
+    fields = [(f['key'], f['selector'], f['read']) for f in spec['fields']]
+    assert fields == [('no', 'td.no', 'text'), ('link', 'a', 'href')]
+    assert compile_spec({})['rows'] is None
+
+
+def test_every_field_and_row_is_read_in_one_page_call(tmp_path):
+    async def scenario():
+        orchestrator = make_orchestrator(tmp_path, instances=1)
+        [instance] = orchestrator.instances.values()
+
+        instance.page = RecordingPage({'no': 'P-1', 'value': '$5', 'link': 'https://a.example/1'})
+        fields = await instance.extract({'no': 'td.no', 'value': 'td.value', 'link': 'a::href'})
+        single = instance.page.calls
+
+        instance.page = RecordingPage([{'no': 'P-1'}, {'no': 'P-2'}])
+        rows = await instance.extract_all('tr.permit', {'no': 'td.no', 'value': 'td.value'}, limit=10)
+        return fields, single, rows, instance.page.calls
+
+    fields, single, rows, multi = asyncio.run(scenario())
+    assert fields == {'no': 'P-1', 'value': '$5', 'link': 'https://a.example/1'}
+    assert len(single) == 1 and single[0][0] == EXTRACT_SCRIPT
+    assert rows == [{'no': 'P-1'}, {'no': 'P-2'}]
+    assert len(multi) == 1 and multi[0][1]['rows'] == 'tr.permit' and multi[0][1]['limit'] == 10
+
+
+def test_static_html_gives_the_browser_output_shape():
+    html = """
+        <table>
+          <tr class="permit" data-id="7"><td class="no">P-1</td><td>  New
+              tower </td><td><a href="/permits/1">details</a></td></tr>
+          <tr class="permit" data-id="8"><td class="no">P-2</td></tr>
+        </table>
+    """
+    selectors = {'no': 'td.no', 'desc': 'td:nth-child(2)::inner_text', 'link': 'a::href', 'id': '::attr(data-id)'}
+    rows = extract_html(html, "https://county.example/search", selectors, 'tr.permit')
+    assert rows == [
+        {'no': 'P-1', 'desc': 'New tower', 'link': 'https://county.example/permits/1', 'id': '7'},
+        {'no': 'P-2', 'id': '8'},
+    ]
+    assert extract_html(html, "https://county.example/", {'no': 'td.no'}) == {'no': 'P-1'}
+    assert extract_html(html, "https://county.example/", {'no': 'td.no'}, 'tr.permit', limit=1) == [{'no': 'P-1'}]
+
+
+def test_json_bodies_use_dotted_paths():
+    payload = {'results': [{'permit': {'no': 'P-1'}, 'value': 5}, {'permit': {'no': 'P-2'}}], 'total': 2}
+    selectors = {'first': 'results.0.permit.no', 'last': 'results.-1.permit.no',
+                 'total': 'total', 'missing': 'results.9.value'}
+    assert extract_json(payload, selectors) == {'first': 'P-1', 'last': 'P-2', 'total': 2}
+    rows = extract_json(payload, {'no': 'permit.no', 'value': 'value'}, 'results')
+    assert rows == [{'no': 'P-1', 'value': 5}, {'no': 'P-2'}]
+    assert extract_json(payload, {'no': 'permit.no'}, 'total') == []
+    assert not found_anything({'no': None, 'value': ''}) and found_anything([{}])
@@ -0,0 +1,122 @@
+import asyncio
+import json
+
+import httpx
+
+from github_publisher import publish_leads
+from retry_policy import RetryPolicy
+
+REPO = "/repos/InfinityXOneSystems/construct-iq-360/issues"
+
+
+class FakeGitHub:
+    """In-process stand-in for the issues API, served through httpx.MockTransport"""
+
+    def __init__(self, fail_titles=(), post_errors=()):
+        self.issues = []
+        self.fail_titles = set(fail_titles)
+        # Per POST: "after" creates the issue then answers 502, "before" answers 502 without creating it
+        self.post_errors = list(post_errors)
+        self.calls = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.calls.append((request.method, request.url.path))
+        if request.method == "GET" and request.url.path == REPO:
+            return httpx.Response(200, json=self.issues)
+        if request.method == "POST" and request.url.path == REPO:
+            payload = json.loads(request.content)
+            if payload["title"] in self.fail_titles:
+                return httpx.Response(422, json={"message": "Validation Failed"})
+            error = self.post_errors.pop(0) if self.post_errors else None
+            if error == "before":
+                return httpx.Response(502, json={"message": "Bad Gateway"})
+            issue = {**payload, "number": len(self.issues) + 1, "state": "open"}
+            self.issues.append(issue)
+            if error == "after":
+                return httpx.Response(502, json={"message": "Bad Gateway"})
+            return httpx.Response(201, json=issue)
+        if request.method == "PATCH":
+            number = int(request.url.path.rsplit("/", 1)[1])
+            issue = self.issues[number - 1]
+            issue.update(json.loads(request.content))
+            return httpx.Response(200, json=issue)
+        return httpx.Response(404, json={"message": "Not Found"})
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handler)
+
+
+def lead(name: str, value: int = 500000) -> dict:
+    return {"project_name": name, "developer": "Acme", "project_value": value,
+            "location": "1 Main St, Orlando, FL 32801", "contact": "a@acme.test"}
+
+
+def publish(github: FakeGitHub, leads, cache_path):
+    return asyncio.run(publish_leads(leads, "token", cache_path, transport=github.transport()))
+
+
+def test_publishes_only_the_delta(tmp_path):
+    github = FakeGitHub()
+    cache = tmp_path / "issues.json"
+    leads = [lead("Tower"), lead("Clinic")]
+
+    report = publish(github, leads, cache)
+    assert (report.created, report.updated, report.unchanged) == (2, 0, 0)
+    assert report.published == leads
+
+    report = publish(github, [lead("Tower"), lead("Clinic", 900000)], cache)
+    assert (report.created, report.updated, report.unchanged) == (0, 1, 1)
+    assert len(github.issues) == 2
+
+
+def test_failed_leads_are_not_reported_as_published(tmp_path):
+    github = FakeGitHub(fail_titles={"[LEAD] Acme - Clinic"})
+    leads = [lead("Tower"), lead("Clinic")]
+
+    report = publish(github, leads, tmp_path / "issues.json")
+    assert [lead["project_name"] for lead in report.published] == ["Tower"]
+    assert [lead["project_name"] for lead in report.failed] == ["Clinic"]
+
+
+def test_create_that_failed_after_landing_is_not_duplicated(tmp_path, monkeypatch):
+    monkeypatch.setattr(RetryPolicy, "backoff", lambda self, attempt: 0)
+    github = FakeGitHub(post_errors=["after"])
+
+    report = publish(github, [lead("Tower")], tmp_path / "issues.json")
+    assert report.created == 1 and report.failed == []
+    assert len(github.issues) == 1
+    assert [method for method, _ in github.calls].count("POST") == 1
+
+
+def test_create_that_failed_before_landing_is_retried(tmp_path, monkeypatch):
+    monkeypatch.setattr(RetryPolicy, "backoff", lambda self, attempt: 0)
+    github = FakeGitHub(post_errors=["before"])
+
+    report = publish(github, [lead("Tower")], tmp_path / "issues.json")
+    assert report.created == 1 and report.failed == []
+    assert len(github.issues) == 1
+    assert [method for method, _ in github.calls].count("POST") == 2
+
+    # The cached issue number is the one GitHub assigned, so the next change is an update
+    report = publish(github, [lead("Tower", 900000)], tmp_path / "issues.json")
+    assert (report.created, report.updated) == (0, 1)
+
+
+def test_nothing_is_published_when_the_sync_fails(tmp_path):
+    def down(request):
+        return httpx.Response(404, json={"message": "Not Found"})
+
+    leads = [lead("Tower")]
+    report = asyncio.run(publish_leads(leads, "token", tmp_path / "issues.json",
+                                       transport=httpx.MockTransport(down)))
+    assert report.published == []
+    assert report.failed == leads
+
+
+def test_leads_skipped_without_a_token_stay_unpublished(tmp_path, monkeypatch):
+    from main import create_github_issues
+
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    published, counts = create_github_issues([lead("Tower")], tmp_path / "issues.json")
+    assert published == []
+    assert counts == {"created": 0, "updated": 0, "unchanged": 0}
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+import http_fetcher
+from conftest import make_orchestrator, target
+from scraper_orchestrator import ScrapeTarget, ScraperMode, SiteType
+
+PAGES = {
+    '/static': (200, 'text/html', '<h1>Permit 42</h1>'),
+    '/shell': (200, 'text/html', '<div id="app"></div>'),
+    '/pdf': (200, 'application/pdf', '%PDF-1.7'),
+    '/gone': (404, 'text/html', 'Not found'),
+    '/busy': (503, 'text/html', 'Try later'),
+}
+
+
+def run_fast_path(tmp_path, *targets):
+    """Scrape the targets with the fast path against PAGES; returns results and browser navigations"""
+    if not http_fetcher.HAS_HTTPX:
+        pytest.skip("httpx not installed")
+    httpx = http_fetcher.httpx
+
+    def respond(request):
+        status, content_type, body = PAGES[request.url.path]
+        return httpx.Response(status, text=body, headers={'content-type': content_type})
+
+    async def scenario():
+        orchestrator = make_orchestrator(tmp_path, instances=1, retry_attempts=1)
+        orchestrator.fetcher = http_fetcher.HttpFetcher(orchestrator.config, ["test-agent"])
+        orchestrator.fetcher._client = httpx.AsyncClient(transport=httpx.MockTransport(respond))
+        try:
+            results = [await orchestrator.scrape(t) for t in targets]
+        finally:
+            await orchestrator.fetcher.close()
+        [instance] = orchestrator.instances.values()
+        return results, instance.navigations, orchestrator.get_metrics()
+
+    return asyncio.run(scenario())
+
+
+def test_static_page_never_opens_a_browser(tmp_path):
+    [result], navigations, metrics = run_fast_path(tmp_path, target("https://county.example/static"))
+    assert result.success and result.data == {'title': 'Permit 42'}
+    assert navigations == 0
+    assert metrics['fast_path_hits'] == 1
+
+
+def test_falls_back_to_the_browser_when_the_fast_path_cannot_answer(tmp_path):
+    js_only = ScrapeTarget(url="https://county.example/static", site_type=SiteType.PERMITS,
+                           mode=ScraperMode.SCRAPE, selectors={'title': 'h1'}, requires_js=True)
+    targets = [target("https://county.example/shell"), target("https://county.example/pdf"),
+               target("https://county.example/busy"), js_only]
+    results, navigations, metrics = run_fast_path(tmp_path, *targets)
+    assert navigations == 4
+    assert metrics['fast_path_hits'] == 0 and metrics['fast_path_fallbacks'] == 3
+
+
+def test_fatal_http_errors_are_reported_without_a_browser(tmp_path):
+    [result], navigations, _ = run_fast_path(tmp_path, target("https://county.example/gone"))
+    assert not result.success and "404" in result.error
+    assert navigations == 0
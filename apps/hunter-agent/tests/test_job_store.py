@@ -0,0 +1,146 @@
+import asyncio
+import json
+
+import pytest
+
+from conftest import make_orchestrator, target
+from job_store import JobStore, MemoryJobStore, SQLiteJobStore
+from scraper_orchestrator import ScrapeResult
+from work_queue import WorkQueue
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryJobStore()
+    return SQLiteJobStore(str(tmp_path / "jobs.sqlite3"))
+
+
+def result(url: str, success: bool = True) -> ScrapeResult:
+    return ScrapeResult(target_id=url, url=url, success=success, data={'title': url})
+
+
+def test_results_round_trip_in_order(store):
+    store.create_job("job", total=3)
+    for i in range(3):
+        store.append_result("job", result(f"https://example.com/{i}", success=i != 1))
+
+    job = store.get_job("job")
+    assert (job["successful"], job["failed"]) == (2, 1)
+    assert [r.url for r in store.get_results("job", cursor=1, limit=5)] == [
+        "https://example.com/1", "https://example.com/2"
+    ]
+
+
+def test_evicted_job_ignores_late_updates_and_results(store):
+    store.create_job("job", total=1)
+    store.delete_job("job")
+
+    store.update_job("job", status="completed")
+    store.append_result("job", result("https://example.com/late"))
+
+    assert store.get_job("job") is None
+    assert store.result_count("job") == 0
+
+
+def test_redelivered_task_is_stored_once(store):
+    store.create_job("job", total=2)
+    assert store.append_result("job", result("https://example.com/a"), task_id=1)
+    assert not store.append_result("job", result("https://example.com/a"), task_id=1)
+    assert store.append_result("job", result("https://example.com/b"), task_id=2)
+
+    assert store.result_count("job") == 2
+    assert store.get_job("job")["successful"] == 2
+
+
+def test_hot_results_stay_within_the_byte_budget(tmp_path):
+    store = SQLiteJobStore(str(tmp_path / "jobs.sqlite3"), hot_bytes=2048)
+    store.create_job("small", total=2)
+    store.create_job("large", total=50)
+    for i in range(2):
+        store.append_result("small", result(f"https://example.com/small/{i}"))
+    for i in range(50):
+        store.append_result("large", result(f"https://example.com/large/{i}"))
+
+    # The large job outgrew the budget on its own and is read back from SQLite
+    assert list(store._hot) == []
+    assert store._hot_total == 0
+    assert [r.url for r in store.get_results("large", cursor=48)] == [
+        "https://example.com/large/48", "https://example.com/large/49"
+    ]
+    assert len(store.get_results("small")) == 2
+
+
+def test_backends_implement_the_whole_interface():
+    with pytest.raises(TypeError):
+        JobStore()
+
+
+def test_follow_job_ends_when_the_job_is_evicted(monkeypatch):
+    monkeypatch.setenv("SCRAPER_JOB_STORE", "memory")
+    scraper_api = pytest.importorskip("scraper_api")
+    if not scraper_api.HAS_FASTAPI:
+        pytest.skip("FastAPI not installed")
+    monkeypatch.setattr(scraper_api, "job_store", MemoryJobStore())
+
+    async def scenario():
+        scraper_api.job_store.create_job("job", total=2)
+        condition = asyncio.Condition()
+        monkeypatch.setitem(scraper_api.job_updates, "job", condition)
+
+        async def follow():
+            return [position async for position, _ in scraper_api.follow_job("job")]
+
+        follower = asyncio.ensure_future(follow())
+        await asyncio.sleep(0)
+        scraper_api.job_store.delete_job("job")
+        async with condition:
+            condition.notify_all()
+        return await asyncio.wait_for(follower, timeout=5)
+
+    assert asyncio.run(scenario()) == []
+    assert scraper_api.job_status("job") is None
+
+
+@pytest.fixture
+def api(monkeypatch, tmp_path):
+    monkeypatch.setenv("SCRAPER_JOB_STORE", "memory")
+    scraper_api = pytest.importorskip("scraper_api")
+    if not scraper_api.HAS_FASTAPI:
+        pytest.skip("FastAPI not installed")
+    monkeypatch.setattr(scraper_api, "job_store", MemoryJobStore())
+    monkeypatch.setattr(scraper_api, "WORK_QUEUE_DB", str(tmp_path / "queue.sqlite3"))
+    return scraper_api
+
+
+def test_cancelled_job_is_left_resumable(api, tmp_path, monkeypatch):
+    monkeypatch.setattr(api, "orchestrator", make_orchestrator(tmp_path, instances=1, delay=10))
+    queue = WorkQueue(api.WORK_QUEUE_DB, "job")
+    queue.enqueue([target("https://slow.example/")])
+    queue.close()
+
+    async def scenario():
+        api.job_store.create_job("job", total=1)
+        monkeypatch.setitem(api.job_updates, "job", asyncio.Condition())
+        task = asyncio.ensure_future(api.execute_scrape_job("job"))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+    assert api.job_status("job")["status"] == "interrupted"
+    assert WorkQueue(api.WORK_QUEUE_DB, "job").unfinished() == 1
+
+
+def test_ndjson_stream_ends_with_a_done_line(api):
+    async def scenario():
+        api.job_store.create_job("job", total=1)
+        api.job_store.append_result("job", result("https://example.com/a"))
+        api.job_store.update_job("job", status="completed")
+        response = await api.stream_job_results("job")
+        return [json.loads(line) async for line in response.body_iterator]
+
+    lines = asyncio.run(scenario())
+    assert [line.get("url") for line in lines[:-1]] == ["https://example.com/a"]
+    assert lines[-1]["done"] and lines[-1]["status"] == "completed"
@@ -0,0 +1,35 @@
+from lead_index import LeadIndex, lead_fingerprint
+
+
+def lead(name: str, value: int = 500000) -> dict:
+    return {"project_name": name, "developer": "Acme", "project_value": value,
+            "location": "1 Main St, Orlando, FL 32801", "source": "permits", "permit_date": "2026-02-19"}
+
+
+def test_partition_splits_new_changed_and_unchanged(tmp_path):
+    index = LeadIndex(tmp_path / "seen.json")
+    index.mark([lead("Tower"), lead("Clinic")])
+
+    new, changed, unchanged = index.partition([lead("Tower"), lead("Clinic", 900000), lead("Arena"), lead("Arena")])
+    assert [item["project_name"] for item in new] == ["Arena"]
+    assert [item["project_name"] for item in changed] == ["Clinic"]
+    assert [item["project_name"] for item in unchanged] == ["Tower"]
+
+
+def test_unpublished_leads_are_retried_but_stored_once(tmp_path):
+    path = tmp_path / "seen.json"
+    index = LeadIndex(path)
+    first_run = [lead("Tower")]
+
+    # Stored but never published (no token): not marked seen
+    assert index.unstored(first_run) == first_run
+    index.mark_stored(first_run)
+    index.save()
+
+    index = LeadIndex.load(path)
+    new, _, _ = index.partition([lead("Tower")])
+    assert [lead_fingerprint(item) for item in new] == [lead_fingerprint(lead("Tower"))]
+    assert index.unstored(new) == []
+
+    # A changed version is stored again
+    assert index.unstored([lead("Tower", 900000)]) == [lead("Tower", 900000)]
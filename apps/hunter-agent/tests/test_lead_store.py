@@ -0,0 +1,80 @@
+import lead_store
+from lead_store import LeadStore
+
+
+def lead(name: str, value: float, project_type: str = "Commercial", **extra) -> dict:
+    return {"project_name": name, "developer": "Acme", "project_value": value,
+            "project_type": project_type, "permit_date": "2026-02-19", "qualified": True,
+            "lat": 28.5, "lng": -81.4, **extra}
+
+
+def test_round_trip_keeps_schema_and_extra_fields(tmp_path):
+    store = LeadStore(tmp_path)
+    original = lead("Tower", 2500000, notes={"phase": 2}, tags=["hospital"])
+    store.append([original], partition="2026-02-19")
+
+    reopened = LeadStore(tmp_path)
+    assert len(reopened) == 1
+    assert reopened.read() == [{**original, "project_value": 2500000.0}]
+
+
+def test_latest_keeps_the_newest_version_of_each_lead(tmp_path):
+    store = LeadStore(tmp_path)
+    store.append([lead("Tower", 1000000)], partition="2026-02-19")
+    store.append([lead("Tower", 1000000, contact="new@acme.test")], partition="2026-02-20")
+
+    rows = store.read(latest=True)
+    assert len(rows) == 1
+    assert rows[0]["contact"] == "new@acme.test"
+
+
+def test_predicates_skip_segments_from_the_manifest(tmp_path, monkeypatch):
+    store = LeadStore(tmp_path)
+    store.append([lead("Shed", 50000), lead("Kiosk", 80000, "Retail")], partition="2026-02-19")
+    store.append([lead("Tower", 2500000), lead("Clinic", 900000, "Medical Office")], partition="2026-02-20")
+    store.append([lead("Arena", 4000000, "Retail")], partition="2026-02-21")
+
+    opened = []
+    segment_class = lead_store._Segment
+
+    def counting_segment(path, rows):
+        opened.append(path.parent.name)
+        return segment_class(path, rows)
+
+    monkeypatch.setattr(lead_store, "_Segment", counting_segment)
+
+    rows = store.read(columns=["project_name"], where=["project_value>=1000000"])
+    assert [row["project_name"] for row in rows] == ["Tower", "Arena"]
+    assert opened == ["date=2026-02-20", "date=2026-02-21"]
+
+    opened.clear()
+    rows = store.read(columns=["project_name"], where=[("project_type", "==", "Medical Office")])
+    assert [row["project_name"] for row in rows] == ["Clinic"]
+    assert opened == ["date=2026-02-20"]
+
+    opened.clear()
+    rows = store.read(columns=["project_name", "date"], where=[("date", ">=", "2026-02-21")])
+    assert rows == [{"project_name": "Arena", "date": "2026-02-21"}]
+    assert opened == ["date=2026-02-21"]
+
+
+def test_latest_filters_the_newest_version_only(tmp_path):
+    store = LeadStore(tmp_path)
+    store.append([lead("Tower", 2500000)], partition="2026-02-19")
+    store.append([lead("Tower", 2500000, qualified=False)], partition="2026-02-20")
+
+    # The old version matched; the current one doesn't, so the lead is left out
+    assert store.read(columns=["project_name"], where=["qualified==true"], latest=True) == []
+    assert store.read(columns=["project_name"], where=["qualified==true"]) == [{"project_name": "Tower"}]
+
+
+def test_bool_predicates_are_coerced():
+    assert lead_store.parse_predicate("qualified==false") == ("qualified", "==", False)
+    assert lead_store.parse_predicate("qualified == True") == ("qualified", "==", True)
+
+
+def test_bool_predicates_match(tmp_path):
+    store = LeadStore(tmp_path)
+    store.append([lead("Tower", 2500000), lead("Shed", 50000, qualified=False)], partition="2026-02-19")
+    assert store.read(columns=["project_name"], where=["qualified==false"]) == [{"project_name": "Shed"}]
+    assert store.read(columns=["project_name"], where=[("qualified", "==", "true")]) == [{"project_name": "Tower"}]
@@ -0,0 +1,41 @@
+import asyncio
+import os
+import time
+
+from conftest import target
+from politeness import RobotsCache
+from scraper_api import enqueue_interleaved
+from work_queue import WorkQueue
+
+
+def test_enqueue_interleaves_hosts(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.sqlite3"), "test")
+    urls = ["https://a.example/1", "https://a.example/2", "https://a.example/3",
+            "https://b.example/1", "https://c.example/1", "https://c.example/2"]
+    assert enqueue_interleaved(queue, [target(url) for url in urls]) == 6
+
+    order = [lease.target.url for lease in queue.lease("worker", 10)]
+    assert order == ["https://a.example/1", "https://b.example/1", "https://c.example/1",
+                     "https://a.example/2", "https://c.example/2", "https://a.example/3"]
+
+
+def test_robots_rules_come_from_the_disk_cache_within_the_ttl(tmp_path):
+    cache = RobotsCache(tmp_path)
+    cache.cache_dir.mkdir(parents=True)
+    (cache.cache_dir / "a.example.txt").write_text("User-agent: *\nDisallow: /private\n")
+    fetched = []
+    cache._fetch = lambda robots_url: fetched.append(robots_url) or "User-agent: *\nDisallow:\n"
+
+    parser = asyncio.run(cache.get("https://a.example/private/page"))
+    assert not parser.can_fetch("*", "https://a.example/private/page")
+    assert fetched == []
+
+    # An expired cache file is fetched again and rewritten
+    stale = time.time() - 2 * cache.ttl_seconds
+    os.utime(cache.cache_dir / "a.example.txt", (stale, stale))
+    fresh = RobotsCache(tmp_path)
+    fresh._fetch = cache._fetch
+    parser = asyncio.run(fresh.get("https://a.example/private/page"))
+    assert parser.can_fetch("*", "https://a.example/private/page")
+    assert fetched == ["https://a.example/robots.txt"]
+    assert "Disallow:\n" in (cache.cache_dir / "a.example.txt").read_text()
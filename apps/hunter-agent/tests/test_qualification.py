@@ -0,0 +1,47 @@
+from main import qualify_leads
+from qualification import LeadColumns, RuleSet
+
+
+def lead(name: str, value=250000, **fields) -> dict:
+    return {"project_name": name, "project_value": value, "location": "Orlando, FL",
+            "contact": "gc@example.com", "project_type": "Commercial", **fields}
+
+
+def test_rules_reject_cheap_incomplete_and_off_type_leads():
+    rules = RuleSet.from_config({"min_project_value": 100000,
+                                 "qualification": {"project_types": ["Commercial", "Mixed Use"]}})
+    leads = [
+        lead("tower"),
+        lead("shed", value=5000),
+        lead("unpriced", value="TBD"),
+        lead("flag", value=True),
+        lead("anonymous", contact=""),
+        lead("condos", project_type=" mixed use "),
+        lead("house", project_type="Residential"),
+    ]
+    result = rules.evaluate(leads)
+
+    assert [leads[i]["project_name"] for i in result.positions()] == ["tower", "condos"]
+    assert result.failures() == {"min_value": 3, "has_location": 0, "has_contact": 1, "project_type": 1}
+
+
+def test_columns_are_built_once_per_field():
+    columns = LeadColumns([lead("a"), lead("b", value=None)])
+    values = columns.values("project_value")
+    assert columns.values("project_value") is values
+    assert values[0] == 250000 and values[1] != values[1]  # NaN
+    assert LeadColumns([]).strings("project_type").size == 0
+
+
+def test_missing_blueprint_falls_back_to_the_historical_rules(tmp_path):
+    rules = RuleSet.from_blueprint(tmp_path / "missing.json")
+    assert [rule.name for rule in rules.rules] == ["min_value", "has_location", "has_contact"]
+    assert rules.rule("min_value").minimum == 100000
+
+
+def test_qualified_leads_carry_the_checks_they_passed():
+    rules = RuleSet.from_config({"min_project_value": 100000})
+    qualified = qualify_leads([lead("tower"), lead("shed", value=5000)], rules)
+    assert [q["project_name"] for q in qualified] == ["tower"]
+    assert qualified[0]["qualified"] is True
+    assert qualified[0]["min_value_check"] == "PASS ($250,000 >= $100,000)"
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from conftest import make_orchestrator, target
+from retry_policy import ErrorScope, RetryPolicy, ScrapeError
+
+
+@pytest.mark.parametrize("status", range(500, 600))
+def test_every_5xx_is_classified(status):
+    error_class = RetryPolicy().classify(ScrapeError(f"HTTP {status}", status=status))
+    assert error_class.name in ("throttled", "server_error", "server_unsupported")
+    assert error_class.scope is not ErrorScope.INSTANCE
+
+
+def test_status_classes():
+    policy = RetryPolicy()
+    assert policy.classify(ScrapeError("HTTP 503", status=503)).name == "throttled"
+    assert not policy.classify(ScrapeError("HTTP 501", status=501)).retryable
+    assert policy.classify(ScrapeError("HTTP 404", status=404)).name == "client_error"
+    assert policy.classify(Exception("net::ERR_NAME_NOT_RESOLVED")).name == "dns_failure"
+
+
+def test_message_rules_only_match_their_own_errors():
+    policy = RetryPolicy()
+    assert policy.classify(Exception("net::ERR_CERT_DATE_INVALID at https://x.example")).name == "tls_failure"
+    assert policy.classify(Exception("net::ERR_SSL_PROTOCOL_ERROR")).name == "tls_failure"
+    assert policy.classify(Exception("net::ERR_ADDRESS_UNREACHABLE")).name == "connection_failure"
+
+    # Mentions SSL, but isn't a TLS failure: still retried
+    unrelated = policy.classify(Exception("Proxy returned an error while fetching the SSL landing page"))
+    assert unrelated.name != "tls_failure"
+    assert unrelated.retryable
+
+
+def test_backoff_stays_under_the_cap():
+    policy = RetryPolicy(base_delay_s=1.0, max_delay_s=4.0)
+    assert all(0 <= policy.backoff(attempt) <= 4.0 for attempt in range(10))
+
+
+def test_dead_host_expires_after_its_ttl(tmp_path):
+    async def scenario():
+        orchestrator = make_orchestrator(tmp_path, instances=1, dead_host_ttl_s=60)
+        instance = orchestrator.instances["scraper-0000"]
+
+        async def unresolvable(url, site_type=None, wait_selector=None):
+            instance.last_error = "net::ERR_NAME_NOT_RESOLVED"
+            return False
+
+        instance.navigate = unresolvable
+        first = await orchestrator.scrape(target("https://flaky.example/a"))
+        assert first.error.startswith("dns_failure")
+
+        # Other targets on the host are skipped while the entry is live...
+        skipped = await orchestrator.scrape(target("https://flaky.example/b"))
+        assert skipped.error == "dns_failure: host unreachable"
+        assert orchestrator.get_metrics()['dead_hosts'] == 1
+
+        # ...and tried again once it expires
+        del instance.navigate
+        name, _ = orchestrator._dead_hosts["flaky.example"]
+        orchestrator._dead_hosts["flaky.example"] = (name, 0.0)
+        assert (await orchestrator.scrape(target("https://flaky.example/c"))).success
+        assert orchestrator.get_metrics()['dead_hosts'] == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,245 @@
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+import scraper_orchestrator
+from conftest import SlowInstance, make_orchestrator, target
+
+
+def test_stopping_a_stream_early_returns_its_instances(tmp_path):
+    async def scenario():
+        orchestrator = make_orchestrator(tmp_path, instances=2, delay=0.05)
+        targets = [target(f"https://example{k}.com/permits") for k in range(8)]
+
+        stream = orchestrator.scrape_stream(targets)
+        first = await stream.__anext__()
+        await stream.aclose()
+
+        assert first.success
+        assert len(orchestrator.instances) == 2
+        assert orchestrator._instance_pool.qsize() == 2
+
+        # The pool still serves new work instead of hanging on leaked instances
+        result = await asyncio.wait_for(orchestrator.scrape(target("https://example.com/next")), timeout=5)
+        assert result.success
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_scrape_releases_its_instance(tmp_path):
+    async def scenario():
+        orchestrator = make_orchestrator(tmp_path, instances=1, delay=10)
+        task = asyncio.ensure_future(orchestrator.scrape(target("https://example.com/slow")))
+        await asyncio.sleep(0.05)
+        assert orchestrator._instance_pool.qsize() == 0
+
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        assert orchestrator._instance_pool.qsize() == 1
+
+    asyncio.run(scenario())
+
+
+def test_scrape_parallel_keeps_input_order(tmp_path):
+    async def scenario():
+        orchestrator = make_orchestrator(tmp_path, instances=3)
+        targets = [target(f"https://host{k % 2}.example/{k}") for k in range(10)]
+        results = await orchestrator.scrape_parallel(targets)
+        assert [r.url for r in results] == [t.url for t in targets]
+        assert all(r.success for r in results)
+        assert orchestrator._instance_pool.qsize() == 3
+
+    asyncio.run(scenario())
+
+
+def test_browser_memory_scans_proc_only_for_new_browsers(monkeypatch):
+    if not os.path.isdir('/proc'):
+        pytest.skip("needs /proc")
+    monkeypatch.setattr(scraper_orchestrator, "_BROWSER_TREES", {})
+    monkeypatch.setattr(scraper_orchestrator, "_last_scan", float('-inf'))
+    scans = []
+    scan = scraper_orchestrator._scan_browser_trees
+    monkeypatch.setattr(scraper_orchestrator, "_scan_browser_trees", lambda tags: scans.append(tags) or scan(tags))
+
+    # A fake "browser" with one child process, tagged the way launches are
+    browser = subprocess.Popen([sys.executable, "-c", "import subprocess, sys, time; "
+                                "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)']); "
+                                "time.sleep(30)", scraper_orchestrator._browser_tag("browser-0")])
+    try:
+        time.sleep(0.5)
+        first = scraper_orchestrator._browser_memory(["browser-0"])["browser-0"]
+        second = scraper_orchestrator._browser_memory(["browser-0"])["browser-0"]
+        assert first and second
+        assert len(scans) == 1
+        assert len(scraper_orchestrator._BROWSER_TREES[scraper_orchestrator._browser_tag("browser-0")]) == 2
+    finally:
+        for pid in scraper_orchestrator._BROWSER_TREES.get(scraper_orchestrator._browser_tag("browser-0"), [])[1:]:
+            os.kill(pid, 9)
+        browser.kill()
+        browser.wait()
+
+
+def test_interception_profile_blocks_assets_and_trackers_outside_the_allowlist():
+    records = scraper_orchestrator.SiteType.COUNTY_RECORDS
+    profile = scraper_orchestrator.InterceptionProfile(
+        blocked_url_patterns=['*/ads/*'],
+        allowlist={records: ['tiles.example.com', 'https://maps.example.com/*.png']}
+    )
+    blocks = profile.blocks
+
+    assert blocks("https://site.example/logo.png", 'image')
+    assert blocks("https://www.google-analytics.com/collect", 'xhr')
+    assert blocks("https://site.example/ads/banner.js", 'script')
+    assert not blocks("https://site.example/permits", 'document')
+    assert not blocks("https://notdoubleclick.net/app.js", 'script')
+
+    assert not blocks("https://a.tiles.example.com/1/2/3.png", 'image', records)
+    assert not blocks("https://maps.example.com/legend.png", 'image', records)
+    assert blocks("https://maps.example.com/legend.png", 'image', scraper_orchestrator.SiteType.PERMITS)
+
+
+def test_intercepted_requests_are_aborted_and_counted(tmp_path):
+    class Route:
+        def __init__(self, url, resource_type):
+            self.request = type('Request', (), {'url': url, 'resource_type': resource_type})()
+            self.outcome = None
+
+        async def abort(self):
+            self.outcome = 'aborted'
+
+        async def continue_(self):
+            self.outcome = 'continued'
+
+    async def scenario():
+        orchestrator = make_orchestrator(tmp_path, instances=1,
+                                         interception=scraper_orchestrator.InterceptionProfile())
+        [instance] = orchestrator.instances.values()
+        image, page = Route("https://a.example/x.jpg", 'image'), Route("https://a.example/", 'document')
+        await instance._intercept(image)
+        await instance._intercept(page)
+        return image.outcome, page.outcome, orchestrator.get_metrics()['requests_blocked']
+
+    assert asyncio.run(scenario()) == ('aborted', 'continued', 1)
+
+
+def test_navigation_waits_for_the_first_extraction_selector(tmp_path):
+    waits = []
+
+    async def scenario():
+        orchestrator = make_orchestrator(tmp_path, instances=1)
+        [instance] = orchestrator.instances.values()
+        navigate = instance.navigate
+
+        async def recording_navigate(url, site_type=None, wait_selector=None):
+            waits.append((site_type, wait_selector))
+            return await navigate(url, site_type, wait_selector)
+
+        instance.navigate = recording_navigate
+        await orchestrator.scrape(target("https://example.com/a"))
+        custom = target("https://example.com/b")
+        custom.wait_selector = 'table.results'
+        await orchestrator.scrape(custom)
+
+    asyncio.run(scenario())
+    permits = scraper_orchestrator.SiteType.PERMITS
+    assert waits == [(permits, 'h1'), (permits, 'table.results')]
+
+
+def replacing_with_slow_instances(orchestrator):
+    """Make replacements SlowInstances too, so no browser is launched"""
+    def new_instance():
+        orchestrator._instance_seq += 1
+        return SlowInstance(f"fresh-{orchestrator._instance_seq:04d}", orchestrator.config)
+    orchestrator._new_instance = new_instance
+    orchestrator._running = True
+
+
+def test_worn_out_instances_are_replaced(tmp_path):
+    async def scenario():
+        orchestrator = make_orchestrator(tmp_path, instances=1, instance_max_navigations=2)
+        replacing_with_slow_instances(orchestrator)
+
+        for k in range(3):
+            assert (await orchestrator.scrape(target(f"https://example.com/{k}"))).success
+        await asyncio.gather(*orchestrator._background)
+        return orchestrator
+
+    orchestrator = asyncio.run(scenario())
+    assert orchestrator.get_metrics()['instances_replaced'] == 1
+    assert list(orchestrator.instances) == ["fresh-0001"]
+    assert orchestrator._instance_pool.qsize() == 1
+
+
+def test_health_check_replaces_unresponsive_and_lost_instances(tmp_path):
+    async def scenario():
+        orchestrator = make_orchestrator(tmp_path, instances=3)
+        replacing_with_slow_instances(orchestrator)
+        sick, failing, lost = orchestrator.instances.values()
+
+        async def no_answer(timeout=5.0):
+            return False
+
+        sick.ping = no_answer
+        failing.consecutive_failures = orchestrator.config.max_consecutive_failures
+        del orchestrator.instances[lost.instance_id]  # e.g. it never finished initializing
+
+        await orchestrator._health_check()
+        await asyncio.gather(*orchestrator._background)
+        return orchestrator
+
+    orchestrator = asyncio.run(scenario())
+    assert orchestrator.get_metrics()['instances_replaced'] == 2
+    assert sorted(orchestrator.instances) == ["fresh-0001", "fresh-0002", "fresh-0003"]
+    assert orchestrator._instance_pool.qsize() == 3
+
+
+def test_autoscaler_grows_while_scrapes_wait(tmp_path):
+    async def scenario():
+        orchestrator = make_orchestrator(tmp_path, instances=1, delay=0.05, autoscale=True,
+                                         min_instances=1, autoscale_step=2)
+        orchestrator.config.max_instances = 4
+        replacing_with_slow_instances(orchestrator)
+        scrapes = [asyncio.ensure_future(orchestrator.scrape(target(f"https://example{k}.com/"))) for k in range(4)]
+        await asyncio.sleep(0.01)
+        assert orchestrator._waiting == 3
+
+        # Slow hosts rather than a short pool: stay put
+        orchestrator._latency_ewma_ms = 5000
+        orchestrator.config.autoscale_max_latency_ms = 1000
+        orchestrator._autoscale_tick(0)
+        assert orchestrator._target_size == 1
+
+        orchestrator._latency_ewma_ms = 100
+        orchestrator._autoscale_tick(0)
+        assert orchestrator._target_size == 3
+        results = await asyncio.gather(*scrapes)
+        await asyncio.gather(*orchestrator._background)
+        return orchestrator, results
+
+    orchestrator, results = asyncio.run(scenario())
+    assert all(result.success for result in results)
+    assert len(orchestrator.instances) == 3
+
+
+def test_autoscaler_shrinks_after_the_pool_stays_idle(tmp_path):
+    async def scenario():
+        orchestrator = make_orchestrator(tmp_path, instances=4, autoscale=True, min_instances=1,
+                                         autoscale_step=2, scale_down_idle_s=60)
+        orchestrator._autoscale_tick(0)
+        orchestrator._autoscale_tick(30)
+        assert len(orchestrator.instances) == 4
+
+        orchestrator._autoscale_tick(60)
+        await asyncio.gather(*orchestrator._background)
+        assert len(orchestrator.instances) == 2 and orchestrator._instance_pool.qsize() == 2
+
+        for now in (120, 180, 240):
+            orchestrator._autoscale_tick(now)
+        await asyncio.gather(*orchestrator._background)
+        assert len(orchestrator.instances) == 1 and orchestrator._instance_pool.qsize() == 1
+
+    asyncio.run(scenario())
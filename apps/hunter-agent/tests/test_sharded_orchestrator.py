@@ -0,0 +1,39 @@
+import asyncio
+import os
+
+import pytest
+
+import sharded_orchestrator
+from scraper_orchestrator import ScraperConfig
+from sharded_orchestrator import ShardedOrchestrator
+
+
+def _die_on_start(shard_id, config, inbox, outbox):
+    """Shard entry point that crashes before reporting ready or failed"""
+    os._exit(3)
+
+
+def test_start_raises_when_a_shard_dies_before_ready(monkeypatch):
+    monkeypatch.setattr(sharded_orchestrator, '_shard_main', _die_on_start)
+    sharded = ShardedOrchestrator(ScraperConfig(max_instances=2), shards=2)
+
+    async def scenario():
+        with pytest.raises(RuntimeError, match="exited with code 3"):
+            await asyncio.wait_for(sharded.start(), timeout=30)
+
+    asyncio.run(scenario())
+    assert not sharded._running
+    assert sharded._processes == []
+
+
+def test_get_metrics_is_sync_and_merges_latest_reports():
+    sharded = ShardedOrchestrator(ScraperConfig(max_instances=4), shards=2)
+    assert sharded.get_metrics()['total_scrapes'] == 0
+
+    sharded._shard_metrics[1] = {'total_scrapes': 3, 'successful_scrapes': 3}
+    sharded._shard_metrics[0] = {'total_scrapes': 1, 'successful_scrapes': 0}
+    metrics = sharded.get_metrics()
+
+    assert metrics['total_scrapes'] == 4
+    assert metrics['success_rate'] == 75.0
+    assert [shard['total_scrapes'] for shard in metrics['per_shard']] == [1, 3]
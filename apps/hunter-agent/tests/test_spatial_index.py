@@ -0,0 +1,60 @@
+import numpy as np
+
+from qualification import LeadColumns, RuleSet
+from spatial_index import GeoIndex, Metro, haversine_miles_vector
+
+ORLANDO = Metro("Orlando, FL", 28.5383, -81.3792, 100)
+TAMPA = Metro("Tampa, FL", 27.9506, -82.4572, 100)
+
+
+def random_points(count: int = 5000, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(24, 32, count), rng.uniform(-88, -79, count)
+
+
+def test_radius_query_matches_a_full_scan():
+    lat, lng = random_points()
+    index = GeoIndex.build(lat, lng)
+    for metro in (ORLANDO, TAMPA, Metro("edge", 31.9, -79.1, 250)):
+        positions, distances = index.within_radius(metro.lat, metro.lng, metro.radius_miles, sort=True)
+        expected = np.flatnonzero(haversine_miles_vector(lat, lng, metro.lat, metro.lng) <= metro.radius_miles)
+        assert sorted(positions.tolist()) == expected.tolist()
+        assert np.all(np.diff(distances) >= 0)
+
+
+def test_bbox_and_nearest_match_a_full_scan():
+    lat, lng = random_points()
+    index = GeoIndex.build(lat, lng)
+
+    inside = index.within_bbox(27.0, 28.0, -82.0, -81.0)
+    expected = np.flatnonzero((lat >= 27.0) & (lat <= 28.0) & (lng >= -82.0) & (lng <= -81.0))
+    assert sorted(inside.tolist()) == expected.tolist()
+
+    positions, _ = index.nearest(ORLANDO.lat, ORLANDO.lng, 25)
+    distances = haversine_miles_vector(lat, lng, ORLANDO.lat, ORLANDO.lng)
+    assert positions.tolist() == np.argsort(distances, kind="stable")[:25].tolist()
+
+
+def test_points_without_coordinates_keep_their_positions(tmp_path):
+    index = GeoIndex.from_leads([{"lat": 28.54, "lng": -81.38}, {"lat": None}, {"lat": "28.0", "lng": "-82.4"}],
+                                ids=["a", "b", "c"])
+    assert len(index) == 2 and index.located().tolist() == [True, False, True]
+    assert index.assign([ORLANDO, TAMPA]).tolist() == [0, -1, 1]
+
+    index.save(tmp_path / "leads.npz")
+    loaded = GeoIndex.load(tmp_path / "leads.npz")
+    assert loaded.within_radius(TAMPA.lat, TAMPA.lng, 10)[0].tolist() == [2]
+    assert loaded.ids.tolist() == ["a", "b", "c"]
+
+
+def test_metro_rule_takes_its_radius_from_the_target_area():
+    orlando = {"name": "Orlando, FL", "lat": 28.5383, "lng": -81.3792}
+    rules = RuleSet.from_config({"target_area": "Orlando, FL (60-mile radius)",
+                                 "qualification": {"required_fields": [], "metros": [orlando]}})
+    within = rules.rule("within_metro")
+    assert within.metros[0].radius_miles == 60
+
+    columns = LeadColumns([{"lat": 28.6, "lng": -81.2}, {"lat": 25.76, "lng": -80.19}, {"project_name": "x"}])
+    assert within.mask(columns).tolist() == [True, False, True]
+    within.require_coordinates = True
+    assert within.mask(columns).tolist() == [True, False, False]
@@ -0,0 +1,92 @@
+import asyncio
+
+from conftest import make_orchestrator, target
+from work_queue import WorkQueue
+
+
+def make_queue(tmp_path, **options) -> WorkQueue:
+    return WorkQueue(str(tmp_path / "queue.sqlite3"), "test", **options)
+
+
+def test_enqueue_is_idempotent(tmp_path):
+    queue = make_queue(tmp_path)
+    assert queue.enqueue([target("https://a.example/1"), target("https://a.example/2")]) == 2
+    assert queue.enqueue([target("https://a.example/2"), target("https://a.example/3")]) == 1
+    assert queue.stats()['pending'] == 3
+
+
+def test_expired_lease_is_handed_out_again(tmp_path):
+    queue = make_queue(tmp_path)
+    queue.enqueue([target("https://a.example/1")])
+
+    [first] = queue.lease("worker-a", 10, lease_seconds=-1)  # Expires immediately
+    [second] = queue.lease("worker-b", 10)
+    assert second.task_id == first.task_id
+    assert second.attempts == 2
+    assert queue.lease("worker-c", 10) == []
+
+
+def test_target_whose_leases_keep_expiring_is_dead_lettered(tmp_path):
+    queue = make_queue(tmp_path, max_attempts=3)
+    queue.enqueue([target("https://hangs.example/")])
+
+    for attempt in range(1, 4):
+        [lease] = queue.lease("worker", 10, lease_seconds=-1)
+        assert lease.attempts == attempt
+
+    assert queue.lease("worker", 10) == []
+    assert queue.stats()['dead'] == 1
+    assert queue.unfinished() == 0
+
+
+def test_nack_dead_letters_after_max_attempts(tmp_path):
+    queue = make_queue(tmp_path, max_attempts=2)
+    queue.enqueue([target("https://a.example/1")])
+    [lease] = queue.lease("worker", 1)
+    queue.nack(lease.task_id, "boom")
+    assert queue.stats()['pending'] == 1
+    [lease] = queue.lease("worker", 1)
+    queue.nack(lease.task_id, "boom")
+    assert queue.stats()['dead'] == 1
+
+
+def test_dead_letters_are_reported_once_as_failed_results(tmp_path):
+    async def scenario():
+        orchestrator = make_orchestrator(tmp_path, instances=1)
+        queue = make_queue(tmp_path, max_attempts=1)
+        queue.enqueue([target("https://hangs.example/"), target("https://fine.example/")])
+        queue.lease("crashed-worker", 1, lease_seconds=-1)  # Its only attempt expires
+
+        results = {result.url: result async for result in orchestrator.scrape_queue(queue, "worker")}
+        assert set(results) == {"https://hangs.example/", "https://fine.example/"}
+        assert not results["https://hangs.example/"].success
+        assert results["https://hangs.example/"].error.startswith("dead_lettered: lease expired")
+        assert results["https://fine.example/"].success
+
+        # Reported (and checkpointed) once
+        assert queue.dead_letters() == []
+        assert queue.stats()['dead'] == 1
+
+    asyncio.run(scenario())
+
+
+def test_scrape_queue_resumes_unacked_targets(tmp_path):
+    async def scenario():
+        orchestrator = make_orchestrator(tmp_path, instances=2, delay=0.05)
+        queue = make_queue(tmp_path)
+        queue.enqueue([target(f"https://host{k}.example/") for k in range(6)])
+
+        stream = orchestrator.scrape_queue(queue, "worker")
+        await stream.__anext__()
+        await stream.aclose()
+
+        # Unfinished leases went back and the pool is whole again
+        assert orchestrator._instance_pool.qsize() == 2
+        assert queue.stats()['leased'] == 0
+
+        # The result taken before closing was never acked, so it is delivered again
+        results = [result async for result in orchestrator.scrape_queue(queue, "worker")]
+        assert len(results) == 6
+        assert queue.stats()['done'] == 6
+
+    asyncio.run(scenario())
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+SHADOW DURABLE WORK QUEUE
+=========================
+File-backed queue of ScrapeTargets with lease/ack semantics
+
+Features:
+- SQLite storage: survives process and runner restarts
+- Leases expire, so targets held by a dead worker are handed out again
+- Targets whose leases keep expiring (crashing or hanging the worker) are
+  dead-lettered after max_attempts like any other failure
+- Each dead-lettered target is handed to consumers once as a failed result
+  (dead_letters / ack_dead_letter), so a job still gets one result per target
+- Acked targets are checkpointed with their result and never re-run
+- Idempotent enqueue: re-submitting a crawl only adds new targets
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from job_store import decode_result, encode_result
+from scraper_orchestrator import ScrapeResult, ScraperMode, ScrapeTarget, SiteType
+
+logger = logging.getLogger('WorkQueue')
+
+
+def target_to_dict(target: ScrapeTarget) -> Dict[str, Any]:
+    """JSON-safe form of a ScrapeTarget"""
+    return {
+        'url': target.url,
+        'site_type': target.site_type.value,
+        'mode': target.mode.value,
+        'selectors': target.selectors,
+        'form_data': target.form_data,
+        'output_format': target.output_format,
+        'wait_selector': target.wait_selector,
+        'row_selector': target.row_selector,
+        'requires_js': target.requires_js
+    }
+
+
+def target_from_dict(data: Dict[str, Any]) -> ScrapeTarget:
+    """Inverse of target_to_dict"""
+    return ScrapeTarget(
+        url=data['url'],
+        site_type=SiteType(data['site_type']),
+        mode=ScraperMode(data['mode']),
+        selectors=data.get('selectors') or {},
+        form_data=data.get('form_data'),
+        output_format=data.get('output_format', 'json'),
+        wait_selector=data.get('wait_selector'),
+        row_selector=data.get('row_selector'),
+        requires_js=data.get('requires_js', False)
+    )
+
+
+@dataclass
+class Lease:
+    """A target checked out to one worker until acked or expired"""
+    task_id: int
+    target: ScrapeTarget
+    attempts: int
+
+
+class WorkQueue:
+    """
+    Durable queue of scrape targets.
+
+    Usage:
+        queue = WorkQueue(".cache/work_queue.sqlite3", "nightly-2026-02-19")
+        queue.enqueue(targets)
+        async for result in orchestrator.scrape_queue(queue):
+            ...
+    """
+
+    def __init__(self, path: str, name: str = "default", max_attempts: int = 5):
+        self.path = path
+        self.name = name
+        self.max_attempts = max_attempts
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                queue TEXT NOT NULL,
+                key TEXT NOT NULL,
+                target TEXT NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',
+                owner TEXT,
+                lease_expires REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                result BLOB,
+                error TEXT,
+                UNIQUE (queue, key)
+            );
+            CREATE INDEX IF NOT EXISTS tasks_by_state ON tasks (queue, state, id);
+        """)
+
+    def enqueue(self, targets: Iterable[ScrapeTarget]) -> int:
+        """Add targets not already in the queue; returns how many were new"""
+        rows = []
+        for target in targets:
+            encoded = json.dumps(target_to_dict(target), sort_keys=True, separators=(',', ':'))
+            rows.append((self.name, hashlib.sha1(encoded.encode()).hexdigest(), encoded))
+
+        before = self._db.total_changes
+        self._db.execute("BEGIN IMMEDIATE")
+        self._db.executemany(
+            "INSERT OR IGNORE INTO tasks (queue, key, target) VALUES (?, ?, ?)", rows
+        )
+        self._db.execute("COMMIT")
+        added = self._db.total_changes - before
+        logger.info(f"Queue {self.name}: enqueued {added} new of {len(rows)} targets")
+        return added
+
+    def lease(self, owner: str, limit: int, lease_seconds: float = 120) -> List[Lease]:
+        """Check out up to `limit` pending (or abandoned) targets"""
+        now = time.time()
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            # An expired lease counts as a failed attempt (it was counted when leased)
+            dead = self._db.execute(
+                """UPDATE tasks SET state = 'dead', owner = NULL, lease_expires = NULL,
+                       error = 'lease expired after ' || attempts || ' attempts'
+                   WHERE queue = ? AND state = 'leased' AND lease_expires < ? AND attempts >= ?""",
+                (self.name, now, self.max_attempts)
+            ).rowcount
+            rows = self._db.execute(
+                """SELECT id, target, attempts FROM tasks
+                   WHERE queue = ? AND (state = 'pending' OR (state = 'leased' AND lease_expires < ?))
+                   ORDER BY id LIMIT ?""",
+                (self.name, now, limit)
+            ).fetchall()
+            if rows:
+                self._db.executemany(
+                    "UPDATE tasks SET state = 'leased', owner = ?, lease_expires = ?, attempts = attempts + 1 "
+                    "WHERE id = ?",
+                    [(owner, now + lease_seconds, task_id) for task_id, _, _ in rows]
+                )
+            self._db.execute("COMMIT")
+        except Exception:
+            self._db.execute("ROLLBACK")
+            raise
+
+        if dead:
+            logger.warning(f"Queue {self.name}: dead-lettered {dead} targets whose leases kept expiring")
+        return [
+            Lease(task_id=task_id, target=target_from_dict(json.loads(target)), attempts=attempts + 1)
+            for task_id, target, attempts in rows
+        ]
+
+    def extend(self, task_ids: List[int], lease_seconds: float = 120):
+        """Heartbeat: push back the expiry of leases still being worked"""
+        if not task_ids:
+            return
+        expires = time.time() + lease_seconds
+        self._db.executemany(
+            "UPDATE tasks SET lease_expires = ? WHERE id = ? AND state = 'leased'",
+            [(expires, task_id) for task_id in task_ids]
+        )
+
+    def ack(self, task_id: int, result: Optional[ScrapeResult] = None):
+        """Checkpoint a finished target (successful or not) with its result"""
+        self._db.execute(
+            "UPDATE tasks SET state = 'done', owner = NULL, lease_expires = NULL, result = ? WHERE id = ?",
+            (encode_result(result) if result is not None else None, task_id)
+        )
+
+    def nack(self, task_id: int, error: str = ""):
+        """Return a target to the queue, dead-lettering it after max_attempts"""
+        self._db.execute(
+            """UPDATE tasks SET owner = NULL, lease_expires = NULL, error = ?,
+                   state = CASE WHEN attempts >= ? THEN 'dead' ELSE 'pending' END
+               WHERE id = ?""",
+            (error, self.max_attempts, task_id)
+        )
+
+    def dead_letters(self) -> List[Tuple[int, ScrapeResult]]:
+        """Dead-lettered targets whose failure hasn't been reported yet, as (task_id, failed result)"""
+        rows = self._db.execute(
+            "SELECT id, target, error FROM tasks WHERE queue = ? AND state = 'dead' AND result IS NULL ORDER BY id",
+            (self.name,)
+        ).fetchall()
+        return [
+            (task_id, ScrapeResult(
+                target_id=f"dead-{task_id}",
+                url=json.loads(target)['url'],
+                success=False,
+                error=f"dead_lettered: {error or 'failed'}"
+            ))
+            for task_id, target, error in rows
+        ]
+
+    def ack_dead_letter(self, task_id: int, result: ScrapeResult):
+        """Checkpoint the failed result reported for a dead-lettered target"""
+        self._db.execute(
+            "UPDATE tasks SET result = ? WHERE id = ? AND state = 'dead'", (encode_result(result), task_id)
+        )
+
+    def release(self, task_ids: List[int]):
+        """Give leases back without counting an attempt (clean shutdown)"""
+        self._db.executemany(
+            "UPDATE tasks SET state = 'pending', owner = NULL, lease_expires = NULL, "
+            "attempts = MAX(attempts - 1, 0) WHERE id = ? AND state = 'leased'",
+            [(task_id,) for task_id in task_ids]
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """Task counts by state"""
+        counts = {'pending': 0, 'leased': 0, 'done': 0, 'dead': 0}
+        for state, count in self._db.execute(
+            "SELECT state, COUNT(*) FROM tasks WHERE queue = ? GROUP BY state", (self.name,)
+        ):
+            counts[state] = count
+        return counts
+
+    def leased(self) -> int:
+        """Targets currently checked out under an unexpired lease"""
+        return self._db.execute(
+            "SELECT COUNT(*) FROM tasks WHERE queue = ? AND state = 'leased' AND lease_expires >= ?",
+            (self.name, time.time())
+        ).fetchone()[0]
+
+    def unfinished(self) -> int:
+        """Targets not yet acked or dead-lettered"""
+        stats = self.stats()
+        return stats['pending'] + stats['leased']
+
+    def results(self) -> Iterator[ScrapeResult]:
+        """Checkpointed results in enqueue order"""
+        cursor = self._db.execute(
+            "SELECT result FROM tasks WHERE queue = ? AND state = 'done' AND result IS NOT NULL ORDER BY id",
+            (self.name,)
+        )
+        for (payload,) in cursor:
+            yield decode_result(payload)
+
+    def purge(self):
+        """Delete every task in this queue"""
+        self._db.execute("DELETE FROM tasks WHERE queue = ?", (self.name,))
+
+    def close(self):
+        self._db.close()
+
+
+__all__ = [
+    'WorkQueue',
+    'Lease',
+    'target_to_dict',
+    'target_from_dict'
+]